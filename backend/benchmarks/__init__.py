@@ -0,0 +1,4 @@
+"""Benchmarks of streaming and retrieval hot paths, kept out of the unit test suite.
+
+Run one from the backend directory, e.g. ``python -m benchmarks.serialization``.
+"""
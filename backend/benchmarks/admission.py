@@ -0,0 +1,45 @@
+"""Load test of the tail latency of other users during a burst of one user."""
+
+import asyncio
+import time
+
+from open_webui.utils.admission import AdmissionController
+
+
+async def simulate(controller: AdmissionController | None) -> list[float]:
+    # Upstream that serves 4 requests at a time, in order of arrival
+    upstream = asyncio.Semaphore(4)
+
+    async def request(user_id):
+        start = time.monotonic()
+        ticket = await controller.acquire(user_id) if controller else None
+        try:
+            async with upstream:
+                await asyncio.sleep(0.02)
+        finally:
+            if ticket:
+                ticket.release()
+        return time.monotonic() - start
+
+    burst = [asyncio.create_task(request("burst")) for _ in range(100)]
+    latencies = []
+    for index in range(10):
+        await asyncio.sleep(0.01)
+        latencies.append(await request(f"user{index}"))
+    await asyncio.gather(*burst)
+    return sorted(latencies)
+
+
+def p99(latencies: list[float]) -> float:
+    return latencies[int(len(latencies) * 0.99)]
+
+
+def tail_latency() -> None:
+    """p99 latency of other users without and with admission control."""
+    before = asyncio.run(simulate(None))
+    after = asyncio.run(simulate(AdmissionController(max_in_flight=4, max_in_flight_per_user=2)))
+    print(f"other users p99 latency: {p99(before) * 1000:.0f}ms -> {p99(after) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    tail_latency()
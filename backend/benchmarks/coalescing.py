@@ -0,0 +1,57 @@
+"""Benchmark of the emits and Redis publish volume of a streamed response, with and without coalescing."""
+
+import asyncio
+import pickle
+
+from open_webui.utils.response_handling.coalescing import EventCoalescer
+from open_webui.utils.response_handling.content_blocks import ContentBlockManager
+from open_webui.utils.response_handling.serialization import IncrementalSerializer
+from open_webui.utils.response_handling.tests.test_coalescing import Recorder
+
+
+def publish_bytes(events: list[dict]) -> int:
+    # Size of the messages the Redis manager publishes for these emits
+    return sum(
+        len(
+            pickle.dumps(
+                {
+                    "method": "emit",
+                    "event": "events",
+                    "data": {"chat_id": "chat", "message_id": "message", "data": event},
+                    "namespace": "/",
+                    "room": "user:1",
+                }
+            )
+        )
+        for event in events
+    )
+
+
+async def stream(window: float, append_deltas: bool) -> list[dict]:
+    """Stream 1000 tokens as the middleware emits them, a snapshot with the content blocks or a delta each."""
+    recorder = Recorder()
+    coalescer = EventCoalescer(recorder, window=window)
+    manager = ContentBlockManager()
+    serializer = IncrementalSerializer(manager)
+    for index in range(1000):
+        manager.append_text(f" token{index}")
+        if append_deltas:
+            await coalescer({"type": "chat:message:delta", "data": {"content": serializer.consume_delta()}})
+        else:
+            data = {"content": serializer.serialize(), "content_blocks": manager.to_list()}
+            await coalescer({"type": "chat:completion", "data": data})
+        if index % 10 == 0:
+            # About 10 deltas per millisecond of a fast model
+            await asyncio.sleep(0.001)
+    await coalescer({"type": "chat:completion", "data": {"done": True}})
+    return recorder.events
+
+
+if __name__ == "__main__":
+    for append_deltas, name in [(False, "snapshots"), (True, "deltas")]:
+        before = asyncio.run(stream(0, append_deltas))
+        after = asyncio.run(stream(0.03, append_deltas))
+        print(
+            f"{name}: {len(before)} -> {len(after)} emits per response, "
+            f"{publish_bytes(before) / 1024:.0f} -> {publish_bytes(after) / 1024:.0f} KiB published"
+        )
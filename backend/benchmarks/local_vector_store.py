@@ -0,0 +1,37 @@
+"""Benchmark of the recall and scanned memory of the local quantized vector store."""
+
+import tempfile
+
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+from open_webui.retrieval.vector.tests.test_local import exact_top_k, make_items, make_vectors
+
+
+def recall_and_memory(quantization: str) -> None:
+    """Compare recall@10 and scanned memory against exact float32 search."""
+    count, dim, k = 5000, 384, 10
+    vectors = make_vectors(count, dim)
+    queries = make_vectors(50, dim, seed=1)
+
+    with tempfile.TemporaryDirectory() as path:
+        client = LocalVectorClient(path=path, quantization=quantization)
+        client.insert("collection", make_items(vectors))
+
+        hits = 0
+        for query in queries:
+            expected = {f"file-{idx}" for idx in exact_top_k(vectors, query, k)}
+            result = client.search("collection", [query.tolist()], limit=k)
+            hits += len(expected & set(result.ids[0]))
+        recall = hits / (len(queries) * k)
+
+        collection = client._load_collection("collection")
+        scanned_bytes = sum(
+            segment.quantized.nbytes + (segment.scales.nbytes if segment.scales is not None else 0)
+            for segment in collection.segments
+        )
+
+    print(f"{quantization}: recall@{k}={recall:.3f} scanned memory={scanned_bytes / vectors.nbytes:.2%} of float32")
+
+
+if __name__ == "__main__":
+    for quantization in ["int8", "float16"]:
+        recall_and_memory(quantization)
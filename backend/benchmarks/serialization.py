@@ -0,0 +1,72 @@
+"""Benchmark of the incremental content serializer against full re-serialization."""
+
+import random
+import time
+
+from open_webui.utils.response_handling.content_blocks import ContentBlockManager
+from open_webui.utils.response_handling.serialization import IncrementalSerializer, serialize_content_blocks
+from open_webui.utils.response_handling.tests.test_serialization import apply_delta, make_handler
+
+
+def streaming() -> None:
+    """Serialize after every token of a 50k-token response.
+
+    Half of the response is reasoning and half is text. The full
+    re-serialization is quadratic, so its cost is only timed over the last
+    tokens of the stream and compared per token.
+    """
+    rng = random.Random(0)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit"]
+    separators = [" ", " ", " ", "\n"]
+    count, tail = 50_000, 1_000
+    tokens = [
+        ("reasoning" if i < count // 2 else "text", f"{rng.choice(words)}{rng.choice(separators)}")
+        for i in range(count)
+    ]
+
+    def run(make_serialize, timed_from: int) -> tuple[float, float]:
+        manager, handler = make_handler()
+        serialize = make_serialize(manager)
+        started = time.perf_counter()
+        for index, (kind, value) in enumerate(tokens):
+            if index == timed_from:
+                tail_started = time.perf_counter()
+            apply_delta(manager, handler, kind, value)
+            if index >= timed_from:
+                content = serialize()
+        finished = time.perf_counter()
+        assert str(content) == serialize_content_blocks(manager.to_list())
+        return finished - started, (finished - tail_started) / (count - timed_from)
+
+    class Client:
+        # Collects what a client would display from snapshots and appended deltas
+        def __init__(self, manager: ContentBlockManager) -> None:
+            self.serializer = IncrementalSerializer(manager)
+            self.parts: list[str] = []
+
+        def __call__(self) -> "Client":
+            delta = self.serializer.consume_delta()
+            if delta is None:
+                self.parts = [self.serializer.serialize()]
+            else:
+                self.parts.append(delta)
+            return self
+
+        def __str__(self) -> str:
+            return "".join(self.parts)
+
+    _, full_per_token = run(lambda manager: lambda: serialize_content_blocks(manager.to_list()), count - tail)
+    incremental, incremental_per_token = run(lambda manager: IncrementalSerializer(manager).serialize, 0)
+    deltas, deltas_per_token = run(Client, 0)
+
+    print(
+        f"{count} tokens, per token at the end of the stream: "
+        f"full {full_per_token * 1e6:.1f}us, incremental {incremental_per_token * 1e6:.1f}us, "
+        f"append-only deltas {deltas_per_token * 1e6:.1f}us; "
+        f"whole stream: full ~{full_per_token * count / 2:.2f}s, "
+        f"incremental {incremental:.2f}s, append-only deltas {deltas:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    streaming()
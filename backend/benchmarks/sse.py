@@ -0,0 +1,44 @@
+"""Benchmark of the CPU cost per chunk between the upstream SSE line and the middleware."""
+
+import json
+import time
+
+from open_webui.utils.response_handling.sse import SSEChunk
+from open_webui.utils.response_handling.tests.test_sse import make_chunk
+from openai.types.chat import ChatCompletionChunk
+
+
+def per_chunk_cpu() -> None:
+    count = 20_000
+    lines = [json.dumps(make_chunk(i)) for i in range(count)]
+
+    def old_path(line: str) -> dict:
+        # SDK parse into a model, model_dump + json.dumps in the router, json.loads in the middleware
+        chunk = ChatCompletionChunk.construct(**json.loads(line))
+        encoded = f"data: {json.dumps(chunk.model_dump(exclude_none=True))}\n\n"
+        return json.loads(encoded[len("data:") :].strip())
+
+    def new_path(line: str) -> dict:
+        return SSEChunk(line).data
+
+    def edge_path(line: str) -> str:
+        return SSEChunk(line).encode()
+
+    assert old_path(lines[0])["choices"][0]["delta"] == new_path(lines[0])["choices"][0]["delta"]
+
+    timings = {}
+    for name, path in [("old", old_path), ("new", new_path), ("edge", edge_path)]:
+        started = time.perf_counter()
+        for line in lines:
+            path(line)
+        timings[name] = (time.perf_counter() - started) / count
+
+    print(
+        f"per chunk: model_dump/dumps/loads {timings['old'] * 1e6:.1f}us, "
+        f"pass-through to middleware {timings['new'] * 1e6:.1f}us, "
+        f"pass-through to client {timings['edge'] * 1e6:.2f}us"
+    )
+
+
+if __name__ == "__main__":
+    per_chunk_cpu()
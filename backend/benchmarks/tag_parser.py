@@ -0,0 +1,44 @@
+"""Benchmark of the throughput and scaling of the streaming tag parser."""
+
+import random
+import time
+
+from open_webui.utils.response_handling.reasoning_handler import DEFAULT_REASONING_TAGS, DEFAULT_SOLUTION_TAGS
+from open_webui.utils.response_handling.tag_parser import StreamingTagParser
+
+
+def measure(text: str, chunk_size: int) -> float:
+    parser = StreamingTagParser(DEFAULT_REASONING_TAGS + DEFAULT_SOLUTION_TAGS)
+    started = time.perf_counter()
+    for start in range(0, len(text), chunk_size):
+        parser.parse(text[start : start + chunk_size])
+    parser.flush()
+    return time.perf_counter() - started
+
+
+def throughput() -> None:
+    """Characters per second for typical and adversarial streams."""
+    rng = random.Random(0)
+    words = ["the", "model", "reasons", "about", "x", "<", "y", "a<b", "<br>", "</p>", "<thi", "<think"]
+    prose = " ".join(rng.choice(words) for _ in range(100_000))
+    reasoning = "<think>" + "Let me think step by step. " * 20_000 + "</think>" + "The answer is 42. " * 20_000
+
+    for name, text in [("angle-bracket heavy prose", prose), ("reasoning then answer", reasoning)]:
+        for chunk_size in (4, 64):
+            elapsed = measure(text, chunk_size)
+            print(f"{name}, {chunk_size}-char chunks: {len(text) / elapsed / 1e6:.2f}M chars/s")
+
+
+def scaling() -> None:
+    """Parsing time for 8 times the input, including long partial tags held back."""
+    # Unterminated attribute sections and partial end tags are the worst case for rescanning
+    unit = '<think a="' + "x" * 100 + "<thinkin" * 10 + "</thin"
+    small, large = unit * 200, unit * 1_600
+
+    ratio = measure(large, 3) / measure(small, 3)
+    print(f"8x the input takes {ratio:.1f}x the time (linear is 8x)")
+
+
+if __name__ == "__main__":
+    throughput()
+    scaling()
@@ -2,6 +2,10 @@ import json
 import logging
 import os
 import shutil
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from typing import Generic, TypeVar
@@ -10,13 +14,14 @@ from urllib.parse import urlparse
 import redis
 from authlib.integrations.starlette_client import OAuth
 from pydantic import BaseModel
-from sqlalchemy import JSON, Column, DateTime, Integer, func
+from sqlalchemy import JSON, Column, DateTime, Integer, Text, func
 
 from open_webui.env import (
     DATA_DIR,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
+    REDIS_CONFIG_POLL_INTERVAL,
     WEBUI_AUTH,
     log,
 )
@@ -68,26 +73,59 @@ class Config(Base):
     updated_at = Column(DateTime, nullable=True, onupdate=func.now())
 
 
+class ConfigItem(Base):
+    """One stored config value, addressed by its dotted config path."""
+
+    __tablename__ = "config_item"
+
+    path = Column(Text, primary_key=True)
+    value = Column(JSON, nullable=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+
 def load_json_config():
     with open(f"{DATA_DIR}/config.json") as file:
         return json.load(file)
 
 
+def set_config_path(data: dict, config_path: str, value):
+    *parents, key = config_path.split(".")
+    for parent in parents:
+        if not isinstance(data.get(parent), dict):
+            data[parent] = {}
+        data = data[parent]
+    data[key] = value
+
+
+def save_config_items(items: dict):
+    """Store the values of the given config paths in one transaction.
+
+    A stored path replaces the values stored below it, so saving a whole
+    section and saving single keys of it can be mixed.
+    """
+    if not items:
+        return
+
+    with get_db() as db:
+        for config_path, value in items.items():
+            db.query(ConfigItem).filter(ConfigItem.path.startswith(f"{config_path}.", autoescape=True)).delete(
+                synchronize_session=False
+            )
+            db.merge(ConfigItem(path=config_path, value=value, updated_at=datetime.now()))
+        db.commit()
+
+
 def save_to_db(data):
+    """Replace the whole stored config with the given document."""
     with get_db() as db:
-        existing_config = db.query(Config).first()
-        if not existing_config:
-            new_config = Config(data=data, version=0)
-            db.add(new_config)
-        else:
-            existing_config.data = data
-            existing_config.updated_at = datetime.now()
-            db.add(existing_config)
+        db.query(ConfigItem).delete()
+        db.add_all(ConfigItem(path=key, value=value) for key, value in data.items())
         db.commit()
 
 
 def reset_config():
     with get_db() as db:
+        db.query(ConfigItem).delete()
         db.query(Config).delete()
         db.commit()
 
@@ -106,8 +144,16 @@ DEFAULT_CONFIG = {
 
 def get_config():
     with get_db() as db:
-        config_entry = db.query(Config).order_by(Config.id.desc()).first()
-        return config_entry.data if config_entry else DEFAULT_CONFIG
+        config_items = db.query(ConfigItem.path, ConfigItem.value).all()
+
+    if not config_items:
+        return DEFAULT_CONFIG
+
+    # Sections are set before the keys stored below them
+    data = {}
+    for config_path, value in sorted(config_items, key=lambda item: item.path.count(".")):
+        set_config_path(data, config_path, value)
+    return data
 
 
 CONFIG_DATA = get_config()
@@ -145,6 +191,9 @@ def save_config(config):
 
 T = TypeVar("T")
 
+# Previous values of the config keys set while a batch is open, see AppConfig.batch()
+_config_batch: ContextVar[dict | None] = ContextVar("config_batch", default=None)
+
 ENABLE_PERSISTENT_CONFIG = os.environ.get("ENABLE_PERSISTENT_CONFIG", "True").lower() == "true"
 
 
@@ -185,22 +234,63 @@ class PersistentConfig(Generic[T]):
 
     def save(self):
         log.info(f"Saving '{self.env_name}' to the database")
-        path_parts = self.config_path.split(".")
-        sub_config = CONFIG_DATA
-        for key in path_parts[:-1]:
-            if key not in sub_config:
-                sub_config[key] = {}
-            sub_config = sub_config[key]
-        sub_config[path_parts[-1]] = self.value
-        save_to_db(CONFIG_DATA)
+        save_config_items({self.config_path: self.value})
+        self.mark_saved()
+
+    def mark_saved(self):
+        """Record the current value as the stored one, once the database has it."""
+        set_config_path(CONFIG_DATA, self.config_path, self.value)
         self.config_value = self.value
 
 
+# Config snapshot taken for the current request, see AppConfig.use_snapshot()
+_config_snapshot: ContextVar["ConfigSnapshot | None"] = ContextVar("config_snapshot", default=None)
+
+
+class ConfigSnapshot:
+    """Read-only values of all config keys at one config version."""
+
+    __slots__ = ("_config", "_values", "version")
+
+    def __init__(self, config: "AppConfig", version: str | None, values: dict):
+        object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Config snapshots are read-only")
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(f"Config key '{key}' not found") from None
+
+
 class AppConfig:
+    """Config values, shared by all workers through Redis when it is configured.
+
+    Values are cached in memory and read as plain dictionary lookups. Every
+    change increments a version key in Redis and is announced on a pub/sub
+    channel, which marks the cache of the other workers stale. A stale cache
+    is validated against the version key and refreshed with one pipelined
+    round trip if it changed. While notifications cannot be received, the
+    version key is checked every ``poll_interval`` seconds instead.
+    """
+
     _redis: redis.Redis | redis.cluster.RedisCluster = None
     _redis_key_prefix: str
+    _poll_interval: float
 
     _state: dict[str, PersistentConfig]
+    _snapshot: ConfigSnapshot | None = None
+
+    # Version of the cached values, and whether a change may have been missed
+    _version: str | None = None
+    _stale: bool = True
+    _checked_at: float = 0.0
+    _listener: threading.Thread | None = None
+    _listening: bool = False
 
     def __init__(
         self,
@@ -208,6 +298,7 @@ class AppConfig:
         redis_sentinels: list | None = [],
         redis_cluster: bool | None = False,
         redis_key_prefix: str = "open-webui",
+        poll_interval: float = REDIS_CONFIG_POLL_INTERVAL,
     ):
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
@@ -221,41 +312,184 @@ class AppConfig:
                 ),
             )
 
+        super().__setattr__("_poll_interval", poll_interval)
         super().__setattr__("_state", {})
 
+    @property
+    def _version_key(self) -> str:
+        # Incremented on every change, snapshots of the same version are reused
+        return f"{self._redis_key_prefix}:config:version"
+
+    @property
+    def _channel(self) -> str:
+        return f"{self._redis_key_prefix}:config:changes"
+
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
         else:
-            self._state[key].value = value
-            self._state[key].save()
+            batch = _config_batch.get()
+            if batch is not None:
+                # Saved and shared when the batch completes, restored if it fails
+                batch.setdefault(key, self._state[key].value)
+                self._state[key].value = value
+            else:
+                self._state[key].value = value
+                self._state[key].save()
+                self._share(key)
 
-            if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+            # Later reads of this request see the new value
+            if _config_snapshot.get() is not None:
+                _config_snapshot.set(None)
+
+    def _share(self, key):
+        if not self._redis:
+            return
+
+        redis_key = f"{self._redis_key_prefix}:config:{key}"
+        self._redis.set(redis_key, json.dumps(self._state[key].value))
+        version = str(self._redis.incr(self._version_key))
+
+        # Our own change is cached already, unless another worker changed the config in between
+        if self._version is not None and int(version) == int(self._version) + 1:
+            super().__setattr__("_version", version)
+        else:
+            super().__setattr__("_stale", True)
+
+        try:
+            self._redis.publish(self._channel, version)
+        except Exception as e:
+            log.warning(f"Failed to announce the config change of {key}: {e}")
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
+        snapshot = _config_snapshot.get()
+        if snapshot is not None and snapshot._config is self:
+            return snapshot._values[key]
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
+            self._validate()
+
+        return self._state[key].value
 
+    def _listen(self):
+        # Change notifications of other workers are received on a background thread
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                pubsub.subscribe(self._channel)
+                for message in pubsub.listen():
+                    # Changes made before a (re)subscription are found by validating the version
+                    if message["type"] == "subscribe":
+                        super().__setattr__("_listening", True)
+                    super().__setattr__("_stale", True)
+            except Exception as e:
+                log.warning(f"Config change notifications interrupted, polling Redis instead: {e}")
+
+            super().__setattr__("_listening", False)
+            super().__setattr__("_stale", True)
+            time.sleep(max(self._poll_interval, 1))
+
+    def _validate(self):
+        if self._listener is None:
+            listener = threading.Thread(target=self._listen, name="config-listener", daemon=True)
+            super().__setattr__("_listener", listener)
+            listener.start()
+
+        now = time.monotonic()
+        if not self._stale and (self._listening or now - self._checked_at < self._poll_interval):
+            return
+
+        super().__setattr__("_stale", False)
+        super().__setattr__("_checked_at", now)
+
+        version = self._redis.get(self._version_key)
+        if version is None and self._redis.set(self._version_key, 0, nx=True):
+            version = "0"
+
+        if version is not None and version == self._version:
+            return
+
+        keys = list(self._state)
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(f"{self._redis_key_prefix}:config:{key}")
+        for key, redis_value in zip(keys, pipe.execute()):
             if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+                self._update_from_redis(key, redis_value)
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+        super().__setattr__("_version", version)
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+    def _update_from_redis(self, key, redis_value):
+        try:
+            decoded_value = json.loads(redis_value)
 
-        return self._state[key].value
+            # Update the in-memory value if different
+            if self._state[key].value != decoded_value:
+                self._state[key].value = decoded_value
+                log.info(f"Updated {key} from Redis: {decoded_value}")
+
+        except json.JSONDecodeError:
+            log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Get the values of all keys, without a Redis round trip while the cache is valid."""
+        if self._redis:
+            self._validate()
+
+            if self._snapshot is not None and self._version is not None and self._snapshot.version == self._version:
+                return self._snapshot
+
+        snapshot = ConfigSnapshot(self, self._version, {key: item.value for key, item in self._state.items()})
+        if self._version is not None:
+            super().__setattr__("_snapshot", snapshot)
+        return snapshot
+
+    @contextmanager
+    def batch(self):
+        """Store the values set in the current context in one transaction on exit.
+
+        Used when a request updates several settings at once. Nested batches
+        are part of the outermost one. If the block raises, nothing is stored
+        and the previous values are restored.
+        """
+        if _config_batch.get() is not None:
+            yield
+            return
+
+        previous_values = {}
+        token = _config_batch.set(previous_values)
+        try:
+            yield
+            save_config_items({self._state[key].config_path: self._state[key].value for key in previous_values})
+        except BaseException:
+            for key, value in previous_values.items():
+                self._state[key].value = value
+            raise
+        finally:
+            _config_batch.reset(token)
+
+        for key in previous_values:
+            self._state[key].mark_saved()
+            self._share(key)
+
+    @contextmanager
+    def use_snapshot(self):
+        """Serve the config reads of the current context from one snapshot.
+
+        Without Redis, reads are local already and no snapshot is taken.
+        """
+        if not self._redis:
+            yield
+            return
+
+        token = _config_snapshot.set(self.snapshot())
+        try:
+            yield
+        finally:
+            _config_snapshot.reset(token)
 
 
 ####################################
@@ -1520,6 +1754,32 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+ENABLE_COMBINED_TASK_GENERATION = PersistentConfig(
+    "ENABLE_COMBINED_TASK_GENERATION",
+    "task.combined.enable",
+    os.environ.get("ENABLE_COMBINED_TASK_GENERATION", "False").lower() == "true",
+)
+
+COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = PersistentConfig(
+    "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE",
+    "task.combined.prompt_template",
+    os.environ.get("COMBINED_TASK_GENERATION_PROMPT_TEMPLATE", ""),
+)
+
+DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = """### Task:
+Based on the chat history, generate all of the following:
+{{TASKS}}
+### Guidelines:
+- Use the chat's primary language; default to English if multilingual.
+- Prioritize accuracy over excessive creativity; keep it clear and simple.
+- Your entire response must consist solely of a single, raw JSON object with all of the requested keys, without any markdown code fences or text before or after it.
+### Output:
+JSON format: {{OUTPUT}}
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
 
 ENABLE_RETRIEVAL_QUERY_GENERATION = PersistentConfig(
     "ENABLE_RETRIEVAL_QUERY_GENERATION",
@@ -1727,10 +1987,33 @@ if VECTOR_DB == "chroma":
     else:
         CHROMA_HTTP_HEADERS = None
     CHROMA_HTTP_SSL = os.environ.get("CHROMA_HTTP_SSL", "false").lower() == "true"
+
+# Local (embedded numpy) vector store
+LOCAL_VECTOR_DB_DATA_PATH = os.environ.get("LOCAL_VECTOR_DB_DATA_PATH", f"{DATA_DIR}/vector_db_local")
+# Precision of the vectors scanned at query time: int8, float16 or none (float32)
+LOCAL_VECTOR_DB_QUANTIZATION = os.environ.get("LOCAL_VECTOR_DB_QUANTIZATION", "int8").lower()
+# Number of candidates per requested result that are rescored against the float32 vectors
+try:
+    LOCAL_VECTOR_DB_RESCORE_FACTOR = int(os.environ.get("LOCAL_VECTOR_DB_RESCORE_FACTOR", "4"))
+except ValueError:
+    LOCAL_VECTOR_DB_RESCORE_FACTOR = 4
 # this uses the model defined in the Dockerfile ENV variable. If you dont use docker or docker based deployments such as k8s, the default embedding model will be used (sentence-transformers/all-MiniLM-L6-v2)
 
 log.info(f"VECTOR_DB: {VECTOR_DB}")
 
+# Preload the most recently updated knowledge collections in the background on startup
+ENABLE_RAG_COLLECTION_WARMUP = os.environ.get("ENABLE_RAG_COLLECTION_WARMUP", "False").lower() == "true"
+
+try:
+    RAG_COLLECTION_WARMUP_COUNT = int(os.environ.get("RAG_COLLECTION_WARMUP_COUNT", "10"))
+except ValueError:
+    RAG_COLLECTION_WARMUP_COUNT = 10
+
+try:
+    RAG_COLLECTION_WARMUP_CONCURRENCY = int(os.environ.get("RAG_COLLECTION_WARMUP_CONCURRENCY", "2"))
+except ValueError:
+    RAG_COLLECTION_WARMUP_CONCURRENCY = 2
+
 ####################################
 # Information Retrieval (RAG)
 ####################################
@@ -1992,6 +2275,18 @@ RAG_FULL_CONTEXT = PersistentConfig(
     os.getenv("RAG_FULL_CONTEXT", "False").lower() == "true",
 )
 
+# Token budget for documents loaded in full context mode, 0 disables the limit
+try:
+    RAG_FULL_CONTEXT_MAX_TOKENS = int(os.environ.get("RAG_FULL_CONTEXT_MAX_TOKENS", "0"))
+except ValueError:
+    RAG_FULL_CONTEXT_MAX_TOKENS = 0
+
+# Number of collections loaded concurrently in full context mode
+try:
+    RAG_FULL_CONTEXT_MAX_WORKERS = int(os.environ.get("RAG_FULL_CONTEXT_MAX_WORKERS", "4"))
+except ValueError:
+    RAG_FULL_CONTEXT_MAX_WORKERS = 4
+
 RAG_FILE_MAX_COUNT = PersistentConfig(
     "RAG_FILE_MAX_COUNT",
     "rag.file.max_count",
@@ -2110,6 +2405,12 @@ RAG_TEXT_SPLITTER = PersistentConfig(
     os.environ.get("RAG_TEXT_SPLITTER", ""),
 )
 
+# Number of worker threads used to split documents (and batch-encode tokens) during ingest
+try:
+    RAG_TEXT_SPLITTER_WORKERS = int(os.environ.get("RAG_TEXT_SPLITTER_WORKERS", min(8, os.cpu_count() or 1)))
+except ValueError:
+    RAG_TEXT_SPLITTER_WORKERS = 1
+
 
 TIKTOKEN_CACHE_DIR = os.environ.get("TIKTOKEN_CACHE_DIR", f"{CACHE_DIR}/tiktoken")
 TIKTOKEN_ENCODING_NAME = PersistentConfig(
@@ -271,6 +271,21 @@ RESET_CONFIG_ON_START = os.environ.get("RESET_CONFIG_ON_START", "False").lower()
 
 ENABLE_REALTIME_CHAT_SAVE = os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 
+# Realtime saves of a streaming message are coalesced and written at most once per interval
+# (seconds) or after max chars of new content. A crash loses at most that much of the message,
+# 0 writes every delta.
+REALTIME_CHAT_SAVE_INTERVAL = os.environ.get("REALTIME_CHAT_SAVE_INTERVAL", "0.5")
+try:
+    REALTIME_CHAT_SAVE_INTERVAL = float(REALTIME_CHAT_SAVE_INTERVAL)
+except Exception:
+    REALTIME_CHAT_SAVE_INTERVAL = 0.5
+
+REALTIME_CHAT_SAVE_MAX_CHARS = os.environ.get("REALTIME_CHAT_SAVE_MAX_CHARS", "1000")
+try:
+    REALTIME_CHAT_SAVE_MAX_CHARS = int(REALTIME_CHAT_SAVE_MAX_CHARS)
+except Exception:
+    REALTIME_CHAT_SAVE_MAX_CHARS = 1000
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 ####################################
@@ -294,6 +309,14 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Seconds between checks of the config version in Redis while change notifications
+# cannot be received, config reads are served from memory in between
+REDIS_CONFIG_POLL_INTERVAL = os.environ.get("REDIS_CONFIG_POLL_INTERVAL", "1")
+try:
+    REDIS_CONFIG_POLL_INTERVAL = float(REDIS_CONFIG_POLL_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_POLL_INTERVAL = 1.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -405,14 +428,20 @@ if LICENSE_PUBLIC_KEY:
 # MODELS
 ####################################
 
-MODELS_CACHE_TTL = os.environ.get("MODELS_CACHE_TTL", "1")
-if MODELS_CACHE_TTL == "":
-    MODELS_CACHE_TTL = None
+# Seconds after which the upstream model lists are refreshed in the background,
+# the last known lists are served meanwhile. Empty disables the periodic refresh.
+MODELS_REFRESH_INTERVAL = os.environ.get(
+    "MODELS_REFRESH_INTERVAL",
+    os.environ.get("MODELS_CACHE_TTL", "10"),
+)
+
+if MODELS_REFRESH_INTERVAL == "":
+    MODELS_REFRESH_INTERVAL = None
 else:
     try:
-        MODELS_CACHE_TTL = int(MODELS_CACHE_TTL)
+        MODELS_REFRESH_INTERVAL = int(MODELS_REFRESH_INTERVAL)
     except Exception:
-        MODELS_CACHE_TTL = 1
+        MODELS_REFRESH_INTERVAL = 10
 
 
 ####################################
@@ -433,6 +462,110 @@ else:
     except Exception:
         CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE = 1
 
+# Stream plain-text tokens to clients as "chat:message:delta" events carrying only the
+# appended text instead of re-sending the full serialized message for every delta.
+# Only enable this for clients that handle "chat:message:delta" by appending its content
+# to the message; the bundled next-app does not, and would drop those tokens
+CHAT_RESPONSE_STREAM_APPEND_DELTAS = os.environ.get("CHAT_RESPONSE_STREAM_APPEND_DELTAS", "False").lower() == "true"
+
+# Consecutive content updates of a streaming response are sent to clients as one event
+# per window of this many seconds, or per this many updates; a window of 0 sends every update
+CHAT_RESPONSE_STREAM_COALESCE_WINDOW = os.environ.get("CHAT_RESPONSE_STREAM_COALESCE_WINDOW", "0.03")
+
+try:
+    CHAT_RESPONSE_STREAM_COALESCE_WINDOW = float(CHAT_RESPONSE_STREAM_COALESCE_WINDOW)
+except Exception:
+    CHAT_RESPONSE_STREAM_COALESCE_WINDOW = 0.03
+
+CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS = os.environ.get("CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS", "50")
+
+try:
+    CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS = int(CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS)
+except Exception:
+    CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS = 50
+
+
+# Admission control of chat completions per worker, see utils/admission
+CHAT_COMPLETION_MAX_IN_FLIGHT = os.environ.get("CHAT_COMPLETION_MAX_IN_FLIGHT", "")
+
+if CHAT_COMPLETION_MAX_IN_FLIGHT == "":
+    CHAT_COMPLETION_MAX_IN_FLIGHT = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_IN_FLIGHT = int(CHAT_COMPLETION_MAX_IN_FLIGHT)
+    except ValueError:
+        CHAT_COMPLETION_MAX_IN_FLIGHT = None
+
+CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER = os.environ.get("CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER", "")
+
+if CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER == "":
+    CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER = int(CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER)
+    except ValueError:
+        CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER = None
+
+CHAT_COMPLETION_MAX_QUEUED = os.environ.get("CHAT_COMPLETION_MAX_QUEUED", "100")
+
+if CHAT_COMPLETION_MAX_QUEUED == "":
+    CHAT_COMPLETION_MAX_QUEUED = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_QUEUED = int(CHAT_COMPLETION_MAX_QUEUED)
+    except ValueError:
+        CHAT_COMPLETION_MAX_QUEUED = 100
+
+CHAT_COMPLETION_MAX_QUEUED_PER_USER = os.environ.get("CHAT_COMPLETION_MAX_QUEUED_PER_USER", "")
+
+if CHAT_COMPLETION_MAX_QUEUED_PER_USER == "":
+    CHAT_COMPLETION_MAX_QUEUED_PER_USER = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_QUEUED_PER_USER = int(CHAT_COMPLETION_MAX_QUEUED_PER_USER)
+    except ValueError:
+        CHAT_COMPLETION_MAX_QUEUED_PER_USER = None
+
+CHAT_COMPLETION_QUEUE_TIMEOUT = os.environ.get("CHAT_COMPLETION_QUEUE_TIMEOUT", "60")
+
+if CHAT_COMPLETION_QUEUE_TIMEOUT == "":
+    CHAT_COMPLETION_QUEUE_TIMEOUT = None
+else:
+    try:
+        CHAT_COMPLETION_QUEUE_TIMEOUT = float(CHAT_COMPLETION_QUEUE_TIMEOUT)
+    except ValueError:
+        CHAT_COMPLETION_QUEUE_TIMEOUT = 60.0
+
+# Comma separated ids of the models whose deterministic completions are cached, "*" for all models
+COMPLETION_CACHE_MODELS = [
+    model_id.strip() for model_id in os.environ.get("COMPLETION_CACHE_MODELS", "").split(",") if model_id.strip()
+]
+
+COMPLETION_CACHE_TTL = os.environ.get("COMPLETION_CACHE_TTL", "3600")
+
+try:
+    COMPLETION_CACHE_TTL = int(COMPLETION_CACHE_TTL)
+except ValueError:
+    COMPLETION_CACHE_TTL = 3600
+
+COMPLETION_CACHE_MAX_ENTRIES = os.environ.get("COMPLETION_CACHE_MAX_ENTRIES", "1000")
+
+try:
+    COMPLETION_CACHE_MAX_ENTRIES = int(COMPLETION_CACHE_MAX_ENTRIES)
+except ValueError:
+    COMPLETION_CACHE_MAX_ENTRIES = 1000
+
+# Completions larger than this many bytes of JSON are not cached
+COMPLETION_CACHE_MAX_ENTRY_SIZE = os.environ.get("COMPLETION_CACHE_MAX_ENTRY_SIZE", "262144")
+
+try:
+    COMPLETION_CACHE_MAX_ENTRY_SIZE = int(COMPLETION_CACHE_MAX_ENTRY_SIZE)
+except ValueError:
+    COMPLETION_CACHE_MAX_ENTRY_SIZE = 262144
+
+# Share the cached completions between workers in Redis, when it is configured
+COMPLETION_CACHE_REDIS = os.environ.get("COMPLETION_CACHE_REDIS", "False").lower() == "true"
+
 
 CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = os.environ.get("CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES", "30")
 
@@ -444,6 +577,52 @@ else:
     except Exception:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 30
 
+# Tool calls of one assistant turn run concurrently, at most this many at once
+CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = os.environ.get("CHAT_RESPONSE_TOOL_CALL_CONCURRENCY", "4")
+
+if CHAT_RESPONSE_TOOL_CALL_CONCURRENCY == "":
+    CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = 4
+else:
+    try:
+        CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = int(CHAT_RESPONSE_TOOL_CALL_CONCURRENCY)
+    except Exception:
+        CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = 4
+
+# Seconds after which a single tool call is abandoned, empty waits for it indefinitely
+CHAT_RESPONSE_TOOL_CALL_TIMEOUT = os.environ.get("CHAT_RESPONSE_TOOL_CALL_TIMEOUT", "")
+
+if CHAT_RESPONSE_TOOL_CALL_TIMEOUT == "":
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = float(CHAT_RESPONSE_TOOL_CALL_TIMEOUT)
+    except Exception:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+
+# Seconds an unused MCP session is kept open for the next chat, 0 closes it after each chat
+MCP_SESSION_IDLE_TIMEOUT = os.environ.get("MCP_SESSION_IDLE_TIMEOUT", "300")
+
+try:
+    MCP_SESSION_IDLE_TIMEOUT = float(MCP_SESSION_IDLE_TIMEOUT)
+except Exception:
+    MCP_SESSION_IDLE_TIMEOUT = 300.0
+
+# Pooled MCP sessions unused for longer than this many seconds are pinged before reuse
+MCP_SESSION_HEALTH_CHECK_INTERVAL = os.environ.get("MCP_SESSION_HEALTH_CHECK_INTERVAL", "30")
+
+try:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = float(MCP_SESSION_HEALTH_CHECK_INTERVAL)
+except Exception:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = 30.0
+
+# Seconds the tool list of an MCP session is reused, 0 lists the tools for every chat
+MCP_TOOL_SPECS_CACHE_TTL = os.environ.get("MCP_TOOL_SPECS_CACHE_TTL", "300")
+
+try:
+    MCP_TOOL_SPECS_CACHE_TTL = float(MCP_TOOL_SPECS_CACHE_TTL)
+except Exception:
+    MCP_TOOL_SPECS_CACHE_TTL = 300.0
+
 
 ####################################
 # WEBSOCKET SUPPORT
@@ -535,6 +714,67 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
 )
 
 
+# Connection pools shared by all requests to the OpenAI-compatible connections
+AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS = os.environ.get("AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS", "100")
+
+try:
+    AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS = int(AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS = 100
+
+AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS = os.environ.get("AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS", "20")
+
+try:
+    AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS = int(AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS = 20
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY = os.environ.get("AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY", "30")
+
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY = 30.0
+
+
+# Health tracking of the OpenAI-compatible connections, see utils/upstreams
+OPENAI_API_CIRCUIT_BREAKER_THRESHOLD = os.environ.get("OPENAI_API_CIRCUIT_BREAKER_THRESHOLD", "5")
+
+try:
+    OPENAI_API_CIRCUIT_BREAKER_THRESHOLD = int(OPENAI_API_CIRCUIT_BREAKER_THRESHOLD)
+except ValueError:
+    OPENAI_API_CIRCUIT_BREAKER_THRESHOLD = 5
+
+OPENAI_API_CIRCUIT_BREAKER_COOLDOWN = os.environ.get("OPENAI_API_CIRCUIT_BREAKER_COOLDOWN", "30")
+
+try:
+    OPENAI_API_CIRCUIT_BREAKER_COOLDOWN = float(OPENAI_API_CIRCUIT_BREAKER_COOLDOWN)
+except ValueError:
+    OPENAI_API_CIRCUIT_BREAKER_COOLDOWN = 30.0
+
+# Seconds to wait for the first token before also asking the next connection serving the model
+OPENAI_API_HEDGE_DELAY = os.environ.get("OPENAI_API_HEDGE_DELAY", "")
+
+if OPENAI_API_HEDGE_DELAY == "":
+    OPENAI_API_HEDGE_DELAY = None
+else:
+    try:
+        OPENAI_API_HEDGE_DELAY = float(OPENAI_API_HEDGE_DELAY)
+    except ValueError:
+        OPENAI_API_HEDGE_DELAY = None
+
+# Seconds to wait for the model lists of all connections, late ones are served from their last known list
+OPENAI_API_MODEL_LIST_DEADLINE = os.environ.get("OPENAI_API_MODEL_LIST_DEADLINE", "5")
+
+if OPENAI_API_MODEL_LIST_DEADLINE == "":
+    OPENAI_API_MODEL_LIST_DEADLINE = None
+else:
+    try:
+        OPENAI_API_MODEL_LIST_DEADLINE = float(OPENAI_API_MODEL_LIST_DEADLINE)
+    except ValueError:
+        OPENAI_API_MODEL_LIST_DEADLINE = 5.0
+
+
 ####################################
 # SENTENCE TRANSFORMERS
 ####################################
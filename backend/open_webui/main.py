@@ -30,7 +30,7 @@ from starlette.datastructures import Headers
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 from starlette_compress import CompressMiddleware
 from starsessions import (
     SessionAutoloadMiddleware,
@@ -80,6 +80,7 @@ from open_webui.config import (
     CACHE_DIR,
     CHUNK_OVERLAP,
     CHUNK_SIZE,
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     COMFYUI_API_KEY,
     COMFYUI_BASE_URL,
     COMFYUI_WORKFLOW,
@@ -119,6 +120,7 @@ from open_webui.config import (
     # Model list
     ENABLE_BASE_MODELS_CACHE,
     ENABLE_CHANNELS,
+    ENABLE_COMBINED_TASK_GENERATION,
     ENABLE_COMMUNITY_SHARING,
     # Direct Connections
     ENABLE_DIRECT_CONNECTIONS,
@@ -142,6 +144,7 @@ from open_webui.config import (
     ENABLE_ONEDRIVE_PERSONAL,
     # OpenAI
     ENABLE_OPENAI_API,
+    ENABLE_RAG_COLLECTION_WARMUP,
     ENABLE_RAG_HYBRID_SEARCH,
     ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
@@ -232,6 +235,8 @@ from open_webui.config import (
     RAG_AZURE_OPENAI_API_KEY,
     RAG_AZURE_OPENAI_API_VERSION,
     RAG_AZURE_OPENAI_BASE_URL,
+    RAG_COLLECTION_WARMUP_CONCURRENCY,
+    RAG_COLLECTION_WARMUP_COUNT,
     RAG_EMBEDDING_BATCH_SIZE,
     RAG_EMBEDDING_ENGINE,
     RAG_EMBEDDING_MODEL,
@@ -292,6 +297,7 @@ from open_webui.env import (
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
     BYPASS_MODEL_ACCESS_CONTROL,
+    COMPLETION_CACHE_REDIS,
     DEPLOYMENT_ID,
     ENABLE_COMPRESSION_MIDDLEWARE,
     ENABLE_OTEL,
@@ -307,7 +313,9 @@ from open_webui.env import (
     INSTANCE_ID,
     LICENSE_KEY,
     MAX_BODY_LOG_SIZE,
+    MODELS_REFRESH_INTERVAL,
     REDIS_CLUSTER,
+    REDIS_CONFIG_POLL_INTERVAL,
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
@@ -329,6 +337,7 @@ from open_webui.internal.db import Session, engine
 from open_webui.models.chats import Chats
 from open_webui.models.models import Models
 from open_webui.models.users import Users
+from open_webui.retrieval.utils import get_warmup_collection_names, warmup_collections
 from open_webui.routers import (
     audio,
     auths,
@@ -374,6 +383,7 @@ from open_webui.tasks import (
     stop_task,
 )  # Import from tasks.py
 from open_webui.utils import logger
+from open_webui.utils.admission import AdmissionError, chat_admission
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.auth import (
     decode_token,
@@ -388,10 +398,14 @@ from open_webui.utils.chat import (
 from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
 )
+from open_webui.utils.completion_cache import completion_cache
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.http_clients import upstream_clients
 from open_webui.utils.logger import start_logger
+from open_webui.utils.mcp.pool import mcp_session_pool
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.models import (
+    ModelRegistry,
     check_model_access,
     get_all_base_models,
     get_all_models,
@@ -464,11 +478,17 @@ async def lifespan(app: FastAPI):
     if app.state.redis is not None:
         app.state.redis_task_command_listener = asyncio.create_task(redis_task_command_listener(app))
 
+        if COMPLETION_CACHE_REDIS:
+            completion_cache.redis = app.state.redis
+
+        app.state.MODEL_REGISTRY.redis = app.state.redis
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    app.state.mcp_session_reaper = asyncio.create_task(mcp_session_pool.expire_idle_periodically())
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -491,11 +511,35 @@ async def lifespan(app: FastAPI):
             None,
         )
 
+    if ENABLE_RAG_COLLECTION_WARMUP:
+        # Runs in the background so that warming up never delays readiness
+        async def warmup_recent_collections():
+            try:
+                collection_names = await asyncio.to_thread(get_warmup_collection_names, RAG_COLLECTION_WARMUP_COUNT)
+                await warmup_collections(
+                    collection_names,
+                    concurrency=RAG_COLLECTION_WARMUP_CONCURRENCY,
+                    progress=app.state.RAG_COLLECTION_WARMUP,
+                )
+            except Exception as e:
+                log.exception(f"Error warming up knowledge collections: {e}")
+                app.state.RAG_COLLECTION_WARMUP["status"] = "failed"
+
+        app.state.rag_collection_warmup_task = asyncio.create_task(warmup_recent_collections())
+
     yield
 
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "rag_collection_warmup_task"):
+        app.state.rag_collection_warmup_task.cancel()
+
+    app.state.MODEL_REGISTRY.close()
+    await upstream_clients.close()
+    app.state.mcp_session_reaper.cancel()
+    await mcp_session_pool.close()
+
 
 app = FastAPI(
     title="BrakeChat",
@@ -585,6 +629,11 @@ app.state.SCIM_TOKEN = SCIM_TOKEN
 
 app.state.config.ENABLE_BASE_MODELS_CACHE = ENABLE_BASE_MODELS_CACHE
 app.state.BASE_MODELS = []
+app.state.MODEL_REGISTRY = ModelRegistry(
+    refresh_interval=MODELS_REFRESH_INTERVAL,
+    redis_key_prefix=REDIS_KEY_PREFIX,
+    poll_interval=REDIS_CONFIG_POLL_INTERVAL,
+)
 
 ########################################
 #
@@ -782,6 +831,8 @@ app.state.rf = None
 
 app.state.YOUTUBE_LOADER_TRANSLATION = None
 
+app.state.RAG_COLLECTION_WARMUP = {"status": "pending" if ENABLE_RAG_COLLECTION_WARMUP else "disabled"}
+
 
 try:
     app.state.ef = get_ef(
@@ -945,12 +996,14 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_COMBINED_TASK_GENERATION = ENABLE_COMBINED_TASK_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
 app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE = TAGS_GENERATION_PROMPT_TEMPLATE
 app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE
 app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
+app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
 
 app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
 app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE = QUERY_GENERATION_PROMPT_TEMPLATE
@@ -1089,6 +1142,13 @@ async def inspect_websocket(request: Request, call_next):
     return await call_next(request)
 
 
+@app.middleware("http")
+async def use_config_snapshot(request: Request, call_next):
+    # Config reads of the request are served from one snapshot instead of a Redis GET each
+    with app.state.config.use_snapshot():
+        return await call_next(request)
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ALLOW_ORIGIN,
@@ -1164,9 +1224,10 @@ async def get_models(request: Request, refresh: bool = False, user=Depends(get_v
 
     models = []
     for model in all_models:
-        # Remove profile image URL to reduce payload size
+        # Remove profile image URL to reduce payload size, the info is shared with the model registry
         if model.get("info", {}).get("meta", {}).get("profile_image_url"):
-            model["info"]["meta"].pop("profile_image_url", None)
+            meta = {key: value for key, value in model["info"]["meta"].items() if key != "profile_image_url"}
+            model["info"] = {**model["info"], "meta": meta}
 
         try:
             model_tags = [tag.get("name") for tag in model.get("info", {}).get("meta", {}).get("tags", [])]
@@ -1332,8 +1393,36 @@ async def chat_completion(
             detail=str(e),
         )
 
+    # Processed in a background task, which reports to the chat through events
+    background = bool(metadata.get("session_id") and metadata.get("chat_id") and metadata.get("message_id"))
+
     async def process_chat(request, form_data, user, metadata, model):
+        ticket = None
         try:
+            event_emitter = get_event_emitter(metadata) if background else None
+
+            async def report_queue_position(position: int):
+                await event_emitter(
+                    {
+                        "type": "status",
+                        "data": {
+                            "action": "queued",
+                            "description": f"Waiting in queue (position {position})",
+                            "position": position,
+                            "done": False,
+                        },
+                    }
+                )
+
+            ticket = await chat_admission.acquire(user.id, on_position=report_queue_position if event_emitter else None)
+            if ticket.wait_time is not None and event_emitter:
+                await event_emitter(
+                    {
+                        "type": "status",
+                        "data": {"action": "queued", "description": "Waiting in queue", "done": True, "hidden": True},
+                    }
+                )
+
             if "messages" in form_data:
                 from open_webui.utils.misc import (
                     get_message_list,
@@ -1378,7 +1467,12 @@ async def chat_completion(
                 except:
                     pass
 
-            return await process_chat_response(request, response, form_data, user, metadata, model, events, tasks)
+            response = await process_chat_response(request, response, form_data, user, metadata, model, events, tasks)
+            if isinstance(response, StreamingResponse):
+                # Streamed to the client after returning, the slot is held until the stream ends
+                response.body_iterator = ticket.hold(response.body_iterator)
+                ticket = None
+            return response
         except asyncio.CancelledError:
             log.info("Chat processing was cancelled")
             try:
@@ -1419,15 +1513,21 @@ async def chat_completion(
 
                 except:
                     pass
+
+            if isinstance(e, AdmissionError) and not background:
+                raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
         finally:
+            if ticket is not None:
+                ticket.release()
+
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                        await mcp_session_pool.release(client)
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
 
-    if metadata.get("session_id") and metadata.get("chat_id") and metadata.get("message_id"):
+    if background:
         # Asynchronous Chat Processing
         task_id, _ = await create_task(
             request.app.state.redis,
@@ -0,0 +1,83 @@
+"""Add config_item table
+
+Revision ID: b3d5e7f9a1c2
+Revises: 37f288994c47, f1a2b3c4d5e6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d5e7f9a1c2"
+down_revision: str | Sequence[str] | None = ("37f288994c47", "f1a2b3c4d5e6")
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade():
+    op.create_table(
+        "config_item",
+        sa.Column("path", sa.Text(), primary_key=True),
+        sa.Column("value", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+    # Move the latest config document into one row per top-level section,
+    # settings saved later are stored in rows of their own
+    connection = op.get_bind()
+    config_table = sa.Table(
+        "config",
+        sa.MetaData(),
+        sa.Column("id", sa.Integer()),
+        sa.Column("data", sa.JSON()),
+    )
+    config_item_table = sa.Table(
+        "config_item",
+        sa.MetaData(),
+        sa.Column("path", sa.Text()),
+        sa.Column("value", sa.JSON()),
+    )
+
+    row = connection.execute(sa.select(config_table.c.data).order_by(config_table.c.id.desc()).limit(1)).fetchone()
+    if row and isinstance(row.data, dict) and row.data:
+        connection.execute(
+            config_item_table.insert(),
+            [{"path": path, "value": value} for path, value in row.data.items()],
+        )
+
+
+def downgrade():
+    connection = op.get_bind()
+    config_item_table = sa.Table(
+        "config_item",
+        sa.MetaData(),
+        sa.Column("path", sa.Text()),
+        sa.Column("value", sa.JSON()),
+    )
+
+    # Fold the rows back into a single config document
+    data = {}
+    rows = connection.execute(sa.select(config_item_table.c.path, config_item_table.c.value)).fetchall()
+    for row in sorted(rows, key=lambda row: row.path.count(".")):
+        *parents, key = row.path.split(".")
+        current = data
+        for parent in parents:
+            if not isinstance(current.get(parent), dict):
+                current[parent] = {}
+            current = current[parent]
+        current[key] = row.value
+
+    if data:
+        config_table = sa.Table(
+            "config",
+            sa.MetaData(),
+            sa.Column("data", sa.JSON()),
+            sa.Column("version", sa.Integer()),
+        )
+        connection.execute(config_table.insert().values(data=data, version=0))
+
+    op.drop_table("config_item")
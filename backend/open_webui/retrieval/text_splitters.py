@@ -0,0 +1,163 @@
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import tiktoken
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from langchain_text_splitters import MarkdownHeaderTextSplitter
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Define headers to split on - covering most common markdown header levels
+MARKDOWN_HEADERS_TO_SPLIT_ON = [
+    ("#", "Header 1"),
+    ("##", "Header 2"),
+    ("###", "Header 3"),
+    ("####", "Header 4"),
+    ("#####", "Header 5"),
+    ("######", "Header 6"),
+]
+
+
+@lru_cache
+def get_tiktoken_encoding(encoding_name: str) -> tiktoken.Encoding:
+    # Encoder construction loads the BPE ranks, only do it once per encoding
+    return tiktoken.get_encoding(encoding_name)
+
+
+def _get_batches(docs: list[Document], workers: int) -> list[list[Document]]:
+    # Contiguous batches so that concatenating the results keeps document order
+    batch_size = max(1, -(-len(docs) // max(1, workers)))
+    return [docs[i : i + batch_size] for i in range(0, len(docs), batch_size)]
+
+
+def _map_in_threads(fn, items: list, workers: int) -> list:
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
+def split_documents_by_character(
+    docs: list[Document],
+    chunk_size: int,
+    chunk_overlap: int,
+    workers: int = 1,
+) -> list[Document]:
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        add_start_index=True,
+    )
+
+    results = _map_in_threads(text_splitter.split_documents, _get_batches(docs, workers), workers)
+    return [doc for batch in results for doc in batch]
+
+
+def split_documents_by_token(
+    docs: list[Document],
+    encoding_name: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    workers: int = 1,
+) -> list[Document]:
+    """Split documents into token windows, matching langchain's TokenTextSplitter output.
+
+    All documents are encoded and all chunks decoded with tiktoken's batch APIs,
+    which run on native threads instead of encoding each text one at a time.
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError(
+            f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size}), should be smaller."
+        )
+
+    encoding = get_tiktoken_encoding(encoding_name)
+    num_threads = max(1, workers)
+
+    texts = [doc.page_content for doc in docs]
+    tokens_per_doc = encoding.encode_batch(
+        texts,
+        num_threads=num_threads,
+        allowed_special=set(),
+        disallowed_special="all",
+    )
+
+    # Collect every window first so that decoding happens in a single batch
+    windows = []
+    for doc_idx, input_ids in enumerate(tokens_per_doc):
+        start_idx = 0
+        while start_idx < len(input_ids):
+            cur_idx = min(start_idx + chunk_size, len(input_ids))
+            windows.append((doc_idx, input_ids[start_idx:cur_idx]))
+            if cur_idx == len(input_ids):
+                break
+            start_idx += chunk_size - chunk_overlap
+
+    chunks = encoding.decode_batch([ids for _, ids in windows], num_threads=num_threads)
+
+    split_docs = []
+    index = 0
+    previous_chunk_len = 0
+    previous_doc_idx = None
+    for (doc_idx, _), chunk in zip(windows, chunks):
+        if doc_idx != previous_doc_idx:
+            index = 0
+            previous_chunk_len = 0
+            previous_doc_idx = doc_idx
+
+        metadata = copy.deepcopy(docs[doc_idx].metadata)
+        offset = index + previous_chunk_len - chunk_overlap
+        index = texts[doc_idx].find(chunk, max(0, offset))
+        metadata["start_index"] = index
+        previous_chunk_len = len(chunk)
+
+        split_docs.append(Document(page_content=chunk, metadata=metadata))
+
+    return split_docs
+
+
+def split_documents_by_markdown_header(
+    docs: list[Document],
+    chunk_size: int,
+    chunk_overlap: int,
+    workers: int = 1,
+) -> list[Document]:
+    markdown_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=MARKDOWN_HEADERS_TO_SPLIT_ON,
+        strip_headers=False,  # Keep headers in content for context
+    )
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        add_start_index=True,
+    )
+
+    def split_doc(doc: Document) -> list[Document]:
+        md_header_splits = markdown_splitter.split_text(doc.page_content)
+        md_header_splits = text_splitter.split_documents(md_header_splits)
+
+        # Convert back to Document objects, preserving original metadata
+        md_split_docs = []
+        for split_chunk in md_header_splits:
+            headings_list = []
+            # Extract header values in order based on headers_to_split_on
+            for _, header_meta_key_name in MARKDOWN_HEADERS_TO_SPLIT_ON:
+                if header_meta_key_name in split_chunk.metadata:
+                    headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+            md_split_docs.append(
+                Document(
+                    page_content=split_chunk.page_content,
+                    metadata={**doc.metadata, "headings": headings_list},
+                )
+            )
+        return md_split_docs
+
+    results = _map_in_threads(split_doc, docs, workers)
+    return [doc for batch in results for doc in batch]
@@ -3,6 +3,7 @@ import hashlib
 import logging
 import os
 import re
+import threading
 import time
 from collections.abc import Awaitable
 from concurrent.futures import ThreadPoolExecutor
@@ -18,6 +19,8 @@ from open_webui.config import (
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_FULL_CONTEXT_MAX_TOKENS,
+    RAG_FULL_CONTEXT_MAX_WORKERS,
 )
 from open_webui.env import (
     ENABLE_FORWARD_USER_INFO_HEADERS,
@@ -29,6 +32,7 @@ from open_webui.models.files import Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.users import UserModel
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
+from open_webui.retrieval.text_splitters import get_tiktoken_encoding
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.main import GetResult
 from open_webui.retrieval.web.utils import get_web_loader
@@ -39,6 +43,9 @@ from open_webui.utils.misc import get_message_list
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Items read per request when a collection is loaded for full context under a token budget
+FULL_CONTEXT_PAGE_SIZE = 500
+
 
 from typing import Any
 
@@ -351,23 +358,143 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     }
 
 
-def get_all_items_from_collections(collection_names: list[str]) -> dict:
+def get_all_items_from_collections(
+    collection_names: list[str],
+    max_tokens: int | None = None,
+    encoding_name: str = "cl100k_base",
+) -> dict:
+    """Load every item of the given collections for full context mode.
+
+    Collections are fetched concurrently, at most RAG_FULL_CONTEXT_MAX_WORKERS at a time, and
+    consumed in order. When max_tokens is set, collections are read FULL_CONTEXT_PAGE_SIZE items
+    at a time and counted page by page, so no pages or collections past the point where the
+    budget is used up are read.
+    """
+    collection_names = [collection_name for collection_name in collection_names if collection_name]
+    encoding = get_tiktoken_encoding(encoding_name) if max_tokens else None
+
+    # Index of the collection that used up the budget, the ones after it are not read
+    stop_after = len(collection_names)
+    stop_lock = threading.Lock()
+
+    def stop_reading_after(index: int):
+        nonlocal stop_after
+        with stop_lock:
+            stop_after = min(stop_after, index)
+
+    def load_collection(index: int, collection_name: str) -> tuple[GetResult | None, list[int]]:
+        if encoding is None:
+            return get_doc(collection_name=collection_name), []
+
+        ids, documents, metadatas, token_counts = [], [], [], []
+        found, collection_tokens = False, 0
+        while index <= stop_after:
+            page = VECTOR_DB_CLIENT.get(
+                collection_name=collection_name,
+                limit=FULL_CONTEXT_PAGE_SIZE,
+                offset=len(ids),
+            )
+            if page is None:
+                break
+            found = True
+            if not page.ids or not page.ids[0]:
+                break
+
+            ids.extend(page.ids[0])
+            documents.extend(page.documents[0])
+            metadatas.extend(page.metadatas[0])
+            for document in page.documents[0]:
+                token_counts.append(len(encoding.encode_ordinary(document or "")))
+                collection_tokens += token_counts[-1]
+
+            if collection_tokens > max_tokens:
+                # This collection alone uses up the budget
+                stop_reading_after(index)
+                break
+            if len(page.ids[0]) < FULL_CONTEXT_PAGE_SIZE:
+                break
+
+        if not found:
+            return None, []
+        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas]), token_counts
+
     results = []
+    total_tokens = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, RAG_FULL_CONTEXT_MAX_WORKERS))
+    try:
+        futures = [
+            executor.submit(load_collection, index, collection_name)
+            for index, collection_name in enumerate(collection_names)
+        ]
 
-    for collection_name in collection_names:
-        if collection_name:
+        for index, future in enumerate(futures):
             try:
-                result = get_doc(collection_name=collection_name)
-                if result is not None:
-                    results.append(result.model_dump())
+                result, token_counts = future.result()
             except Exception as e:
                 log.exception(f"Error when querying the collection: {e}")
-        else:
-            pass
+                continue
+
+            if result is None:
+                continue
+
+            result = result.model_dump()
+            if encoding is None:
+                results.append(result)
+                continue
+
+            budget_exceeded = False
+            for idx, document_tokens in enumerate(token_counts):
+                if total_tokens + document_tokens > max_tokens:
+                    budget_exceeded = True
+                    result = {key: [result[key][0][:idx]] for key in ["ids", "documents", "metadatas"]}
+                    break
+                total_tokens += document_tokens
+
+            results.append(result)
+
+            if budget_exceeded:
+                log.info(f"get_all_items_from_collections: token budget of {max_tokens} reached, skipping the rest")
+                stop_reading_after(index)
+                break
+    finally:
+        # Loads still running stop at their next page instead of being waited for
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return merge_get_results(results)
 
 
+def get_warmup_collection_names(limit: int) -> list[str]:
+    # Knowledge bases are returned most recently updated first
+    return [knowledge.id for knowledge in Knowledges.get_knowledge_bases()[:limit]]
+
+
+async def warmup_collections(collection_names: list[str], concurrency: int, progress: dict) -> None:
+    """Preload collections in the background, updating progress in place as they complete."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    progress.update(
+        {
+            "status": "running",
+            "total": len(collection_names),
+            "completed": 0,
+            "failed": 0,
+        }
+    )
+
+    async def warmup_collection(collection_name: str):
+        async with semaphore:
+            try:
+                await asyncio.to_thread(VECTOR_DB_CLIENT.warmup, collection_name=collection_name)
+                progress["completed"] += 1
+            except Exception as e:
+                log.warning(f"warmup_collections: failed to warm up {collection_name}: {e}")
+                progress["failed"] += 1
+
+    start = time.time()
+    await asyncio.gather(*[warmup_collection(collection_name) for collection_name in collection_names])
+    progress["status"] = "done"
+    log.info(f"warmup_collections: warmed up {progress['completed']} collections in {time.time() - start:.2f}s")
+
+
 async def query_collection(
     collection_names: list[str],
     queries: list[str],
@@ -947,7 +1074,12 @@ async def get_sources_from_items(
 
             try:
                 if full_context:
-                    query_result = get_all_items_from_collections(collection_names)
+                    query_result = await asyncio.to_thread(
+                        get_all_items_from_collections,
+                        collection_names,
+                        max_tokens=RAG_FULL_CONTEXT_MAX_TOKENS,
+                        encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+                    )
                 else:
                     query_result = None  # Initialize to None
                     if hybrid_search:
@@ -110,11 +110,11 @@ class ChromaClient(VectorDBBase):
         except:
             return None
 
-    def get(self, collection_name: str) -> GetResult | None:
-        # Get all the items in the collection.
+    def get(self, collection_name: str, limit: int | None = None, offset: int = 0) -> GetResult | None:
+        # Get all the items in the collection, or a page of them.
         collection = self.client.get_collection(name=collection_name)
         if collection:
-            result = collection.get()
+            result = collection.get(limit=limit, offset=offset)
             return GetResult(
                 ids=[result["ids"]] if result["ids"] is not None else None,
                 documents=[result["documents"]] if result["documents"] is not None else None,
@@ -122,6 +122,45 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def get_vectors(
+        self,
+        collection_name: str,
+        filter: dict | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorItem] | None:
+        # Get a page of items from the collection, including their embeddings.
+        try:
+            collection = self.client.get_collection(name=collection_name)
+        except Exception:
+            return None
+
+        result = collection.get(
+            where=filter,
+            limit=limit,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"],
+        )
+
+        embeddings = result["embeddings"] if result["embeddings"] is not None else []
+        return [
+            VectorItem(
+                id=id,
+                text=result["documents"][idx],
+                # chromadb returns numpy arrays for embeddings
+                vector=embeddings[idx].tolist() if hasattr(embeddings[idx], "tolist") else list(embeddings[idx]),
+                metadata=result["metadatas"][idx],
+            )
+            for idx, id in enumerate(result["ids"])
+        ]
+
+    def warmup(self, collection_name: str):
+        # Run a single nearest neighbor query so chromadb loads the segments and the HNSW index from disk.
+        collection = self.client.get_collection(name=collection_name)
+        result = collection.peek(limit=1)
+        if result["embeddings"] is not None and len(result["embeddings"]) > 0:
+            collection.query(query_embeddings=[result["embeddings"][0]], n_results=1)
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(name=collection_name, metadata={"hnsw:space": "cosine"})
@@ -0,0 +1,563 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+from open_webui.config import (
+    LOCAL_VECTOR_DB_DATA_PATH,
+    LOCAL_VECTOR_DB_QUANTIZATION,
+    LOCAL_VECTOR_DB_RESCORE_FACTOR,
+)
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+from open_webui.retrieval.vector.utils import process_metadata
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, writers are only serialized within the process
+    fcntl = None
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Rows scored per matrix product, bounds the float32 temporaries created while searching
+SEARCH_BLOCK_SIZE = 16384
+
+QUANTIZATIONS = ["int8", "float16", "none"]
+
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class LocalSegment:
+    """Immutable batch of items, written once and only replaced as a whole when merged."""
+
+    name: str
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict]
+    # Full precision vectors, memory mapped from disk and only read to rescore candidates
+    vectors: np.ndarray
+    norms: np.ndarray
+    # Normalized vectors in the storage precision, scanned for every query
+    quantized: np.ndarray
+    scales: np.ndarray | None
+    # Row of each id, built on first use
+    _rows: dict[str, int] | None = field(default=None, repr=False)
+
+    @property
+    def rows(self) -> dict[str, int]:
+        if self._rows is None:
+            self._rows = {id: row for row, id in enumerate(self.ids)}
+        return self._rows
+
+
+@dataclass
+class LocalCollection:
+    """Snapshot of a collection as listed by one version of its manifest."""
+
+    # Inode, modification time and size of the manifest the snapshot was read from
+    version: tuple[int, int, int]
+    segments: list[LocalSegment]
+    # Deleted rows of each segment, by segment name
+    deleted: dict[str, set[int]]
+    next_segment: int
+    _live_rows: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def live_rows(self, segment: LocalSegment) -> np.ndarray:
+        rows = self._live_rows.get(segment.name)
+        if rows is None:
+            rows = self._live_rows[segment.name] = live_rows(segment, self.deleted.get(segment.name))
+        return rows
+
+    def items(self):
+        """Yield the segment and row of every live item, in insertion order."""
+        for segment in self.segments:
+            for row in self.live_rows(segment):
+                yield segment, int(row)
+
+
+def live_rows(segment: LocalSegment, deleted: set[int] | None) -> np.ndarray:
+    if not deleted:
+        return np.arange(len(segment.ids))
+    mask = np.ones(len(segment.ids), dtype=bool)
+    mask[list(deleted)] = False
+    return np.flatnonzero(mask)
+
+
+def quantize(vectors: np.ndarray, quantization: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """Quantize normalized vectors; int8 uses a symmetric scale per vector."""
+    if quantization == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    if quantization == "float16":
+        return vectors.astype(np.float16), None
+    return vectors.astype(np.float32), None
+
+
+def match_filter(metadata: dict, filter: dict) -> bool:
+    for key, value in filter.items():
+        if key == "$and":
+            if not all(match_filter(metadata, condition) for condition in value):
+                return False
+        elif key == "$or":
+            if not any(match_filter(metadata, condition) for condition in value):
+                return False
+        elif isinstance(value, dict):
+            for operator, operand in value.items():
+                if operator == "$eq" and metadata.get(key) != operand:
+                    return False
+                if operator == "$ne" and metadata.get(key) == operand:
+                    return False
+                if operator == "$in" and metadata.get(key) not in operand:
+                    return False
+                if operator == "$nin" and metadata.get(key) in operand:
+                    return False
+        elif metadata.get(key) != value:
+            return False
+    return True
+
+
+class LocalVectorClient(VectorDBBase):
+    """Embedded vector store keeping each collection as numpy arrays on disk.
+
+    Queries scan a scalar-quantized copy of the normalized vectors (int8 by default) and
+    rescore the best `limit * rescore_factor` candidates against the float32 originals,
+    which stay memory mapped and are only paged in for those candidates.
+
+    A collection is a list of immutable segments named by its manifest. Writes add a
+    segment for the new items and record replaced or deleted items in the manifest,
+    which is swapped in with one rename, so readers in any process see either the old
+    or the new version. Segments are merged while the newest one is at least half the
+    size of the one before it, which keeps their number logarithmic in the collection
+    size and rewrites each item a logarithmic number of times. Writers of a collection
+    are serialized across processes with a lock file.
+    """
+
+    def __init__(
+        self,
+        path: str = LOCAL_VECTOR_DB_DATA_PATH,
+        quantization: str = LOCAL_VECTOR_DB_QUANTIZATION,
+        rescore_factor: int = LOCAL_VECTOR_DB_RESCORE_FACTOR,
+    ):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}. Use one of {', '.join(QUANTIZATIONS)}.")
+
+        self.path = path
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+
+        self._collections: dict[str, LocalCollection] = {}
+        self._lock = threading.RLock()
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def _get_collection_path(self, collection_name: str) -> str:
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", collection_name) or collection_name in [".", ".."]:
+            collection_name = hashlib.sha256(collection_name.encode()).hexdigest()
+        return os.path.join(self.path, collection_name)
+
+    @contextmanager
+    def _write_lock(self, collection_name: str):
+        collection_path = self._get_collection_path(collection_name)
+        with self._lock:
+            os.makedirs(collection_path, exist_ok=True)
+            with open(os.path.join(collection_path, ".lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield collection_path
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_segment(self, collection_path: str, name: str) -> LocalSegment:
+        segment_path = os.path.join(collection_path, name)
+        with open(os.path.join(segment_path, "items.json")) as f:
+            items = json.load(f)
+
+        vectors = np.load(os.path.join(segment_path, "vectors.npy"), mmap_mode="r")
+        norms = np.load(os.path.join(segment_path, "norms.npy"))
+
+        quantized_path = os.path.join(segment_path, f"quantized.{self.quantization}.npy")
+        if os.path.exists(quantized_path):
+            quantized = np.load(quantized_path)
+            scales = np.load(os.path.join(segment_path, "scales.npy")) if self.quantization == "int8" else None
+        else:
+            # Written with another quantization setting, rebuild from the originals
+            quantized, scales = quantize(np.asarray(vectors) / norms[:, None], self.quantization)
+
+        return LocalSegment(
+            name=name,
+            ids=items["ids"],
+            documents=items["documents"],
+            metadatas=items["metadatas"],
+            vectors=vectors,
+            norms=norms,
+            quantized=quantized,
+            scales=scales,
+        )
+
+    def _load_collection(self, collection_name: str) -> LocalCollection | None:
+        collection_path = self._get_collection_path(collection_name)
+        manifest_path = os.path.join(collection_path, MANIFEST)
+
+        # A writer may merge segments away between reading the manifest and loading them
+        for _ in range(3):
+            try:
+                stat = os.stat(manifest_path)
+            except FileNotFoundError:
+                with self._lock:
+                    self._collections.pop(collection_name, None)
+                return None
+            version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+            with self._lock:
+                cached = self._collections.get(collection_name)
+                if cached is not None and cached.version == version:
+                    return cached
+
+                try:
+                    with open(manifest_path) as f:
+                        manifest = json.load(f)
+
+                    # Segments never change, so the ones already loaded are reused
+                    loaded = {segment.name: segment for segment in cached.segments} if cached else {}
+                    segments = [
+                        loaded.get(entry["name"]) or self._load_segment(collection_path, entry["name"])
+                        for entry in manifest["segments"]
+                    ]
+                except FileNotFoundError:
+                    continue
+
+                collection = LocalCollection(
+                    version=version,
+                    segments=segments,
+                    deleted={entry["name"]: set(entry["deleted"]) for entry in manifest["segments"]},
+                    next_segment=manifest["next_segment"],
+                )
+                self._collections[collection_name] = collection
+                return collection
+
+        raise RuntimeError(f"Collection {collection_name} changed while it was being loaded")
+
+    def _write_segment(
+        self,
+        collection_path: str,
+        name: str,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        vectors: np.ndarray,
+    ) -> None:
+        norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        norms[norms == 0] = 1.0
+        quantized, scales = quantize(vectors / norms[:, None], self.quantization)
+
+        # Written under a temporary name and renamed into place once complete
+        tmp_path = os.path.join(collection_path, f".{name}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        np.save(os.path.join(tmp_path, "vectors.npy"), vectors)
+        np.save(os.path.join(tmp_path, "norms.npy"), norms)
+        np.save(os.path.join(tmp_path, f"quantized.{self.quantization}.npy"), quantized)
+        if scales is not None:
+            np.save(os.path.join(tmp_path, "scales.npy"), scales)
+        with open(os.path.join(tmp_path, "items.json"), "w") as f:
+            json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f)
+
+        os.rename(tmp_path, os.path.join(collection_path, name))
+
+    def _commit(
+        self,
+        collection_name: str,
+        collection_path: str,
+        collection: LocalCollection | None,
+        deleted: dict[str, set[int]],
+        new_rows: tuple[list[str], list[str], list[dict], np.ndarray] | None = None,
+    ) -> None:
+        """Write the new items as a segment, merging and compacting segments, and swap in the manifest."""
+        segments = list(collection.segments) if collection else []
+        next_segment = collection.next_segment if collection else 1
+
+        def take(segment: LocalSegment, rows: np.ndarray):
+            return (
+                [segment.ids[row] for row in rows],
+                [segment.documents[row] for row in rows],
+                [segment.metadatas[row] for row in rows],
+                np.asarray(segment.vectors[rows], dtype=np.float32),
+            )
+
+        def concat(first, second):
+            if not len(first[3]):
+                return second
+            if not len(second[3]):
+                return first
+            return (
+                first[0] + second[0],
+                first[1] + second[1],
+                first[2] + second[2],
+                np.concatenate([first[3], second[3]]),
+            )
+
+        # Segments written by this commit, by their position in the list
+        written: dict[int, tuple] = {}
+
+        # Rewrite segments that are mostly deleted items
+        for idx, segment in enumerate(segments):
+            rows = live_rows(segment, deleted.get(segment.name))
+            if len(rows) * 2 < len(segment.ids):
+                written[idx] = take(segment, rows)
+
+        if new_rows is not None and len(new_rows[0]):
+            # Merge the newest segments while the new one is at least half the size of the one before
+            while segments:
+                previous = written.get(len(segments) - 1) or take(
+                    segments[-1], live_rows(segments[-1], deleted.get(segments[-1].name))
+                )
+                if len(previous[0]) > 2 * len(new_rows[0]):
+                    break
+                new_rows = concat(previous, new_rows)
+                segments.pop()
+                written.pop(len(segments), None)
+            segments.append(None)
+            written[len(segments) - 1] = new_rows
+
+        manifest_segments = []
+        for idx, segment in enumerate(segments):
+            if idx in written:
+                ids, documents, metadatas, vectors = written[idx]
+                if not ids:
+                    continue
+                name = f"{next_segment:08d}"
+                next_segment += 1
+                self._write_segment(collection_path, name, ids, documents, metadatas, vectors)
+                manifest_segments.append({"name": name, "deleted": []})
+            else:
+                manifest_segments.append({"name": segment.name, "deleted": sorted(deleted.get(segment.name, ()))})
+
+        tmp_path = os.path.join(collection_path, f".{MANIFEST}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"segments": manifest_segments, "next_segment": next_segment}, f)
+        os.replace(tmp_path, os.path.join(collection_path, MANIFEST))
+
+        # Segments that are no longer listed, readers that still map them keep their files open
+        referenced = {entry["name"] for entry in manifest_segments}
+        for entry in os.listdir(collection_path):
+            if entry not in referenced and entry not in (MANIFEST, ".lock"):
+                shutil.rmtree(os.path.join(collection_path, entry), ignore_errors=True)
+
+        with self._lock:
+            self._collections.pop(collection_name, None)
+
+    def has_collection(self, collection_name: str) -> bool:
+        return os.path.exists(os.path.join(self._get_collection_path(collection_name), MANIFEST))
+
+    def delete_collection(self, collection_name: str):
+        with self._write_lock(collection_name) as collection_path:
+            self._collections.pop(collection_name, None)
+            shutil.rmtree(collection_path, ignore_errors=True)
+
+    def search(self, collection_name: str, vectors: list[list[float | int]], limit: int) -> SearchResult | None:
+        collection = self._load_collection(collection_name)
+        if collection is None:
+            return None
+
+        segments = [(segment, collection.live_rows(segment)) for segment in collection.segments]
+        total = sum(len(rows) for _, rows in segments)
+        if not total:
+            return None
+
+        limit = min(limit, total)
+
+        result_ids, result_documents, result_metadatas, result_distances = [], [], [], []
+        for vector in vectors:
+            query = np.asarray(vector, dtype=np.float32)
+            query = query / (np.linalg.norm(query) or 1.0)
+
+            candidates = []
+            for segment, rows in segments:
+                if not len(rows):
+                    continue
+
+                # Approximate scores over the quantized matrix, block by block
+                scores = np.empty(len(segment.ids), dtype=np.float32)
+                for start in range(0, len(segment.ids), SEARCH_BLOCK_SIZE):
+                    block = segment.quantized[start : start + SEARCH_BLOCK_SIZE].astype(np.float32)
+                    scores[start : start + len(block)] = block @ query
+                if segment.scales is not None:
+                    scores *= segment.scales
+
+                scores = scores[rows]
+                num_candidates = min(len(rows), limit * self.rescore_factor)
+                top = rows[np.argpartition(-scores, num_candidates - 1)[:num_candidates]]
+                top.sort()
+
+                # Exact cosine similarity for the candidates only
+                originals = np.asarray(segment.vectors[top], dtype=np.float32)
+                exact = (originals @ query) / segment.norms[top]
+                candidates.extend(zip(exact.tolist(), [segment] * len(top), top.tolist()))
+
+            candidates.sort(key=lambda candidate: -candidate[0])
+            best = candidates[:limit]
+
+            result_ids.append([segment.ids[row] for _, segment, row in best])
+            result_documents.append([segment.documents[row] for _, segment, row in best])
+            result_metadatas.append([segment.metadatas[row] for _, segment, row in best])
+            # Same 0 (worst) -> 1 (best) range as the chroma client
+            result_distances.append([float((1 + score) / 2) for score, _, _ in best])
+
+        return SearchResult(
+            ids=result_ids,
+            documents=result_documents,
+            metadatas=result_metadatas,
+            distances=result_distances,
+        )
+
+    def query(self, collection_name: str, filter: dict, limit: int | None = None) -> GetResult | None:
+        collection = self._load_collection(collection_name)
+        if collection is None:
+            return None
+
+        items = [(segment, row) for segment, row in collection.items() if match_filter(segment.metadatas[row], filter)]
+        if limit is not None:
+            items = items[:limit]
+
+        return GetResult(
+            ids=[[segment.ids[row] for segment, row in items]],
+            documents=[[segment.documents[row] for segment, row in items]],
+            metadatas=[[segment.metadatas[row] for segment, row in items]],
+        )
+
+    def get(self, collection_name: str, limit: int | None = None, offset: int = 0) -> GetResult | None:
+        collection = self._load_collection(collection_name)
+        if collection is None:
+            return None
+
+        # Skip whole segments before the offset
+        items = []
+        for segment in collection.segments:
+            if limit is not None and len(items) >= limit:
+                break
+            rows = collection.live_rows(segment)
+            if offset >= len(rows):
+                offset -= len(rows)
+                continue
+            rows = rows[offset : offset + limit - len(items) if limit is not None else None]
+            offset = 0
+            items.extend((segment, int(row)) for row in rows)
+
+        return GetResult(
+            ids=[[segment.ids[row] for segment, row in items]],
+            documents=[[segment.documents[row] for segment, row in items]],
+            metadatas=[[segment.metadatas[row] for segment, row in items]],
+        )
+
+    def get_vectors(
+        self,
+        collection_name: str,
+        filter: dict | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorItem] | None:
+        collection = self._load_collection(collection_name)
+        if collection is None:
+            return None
+
+        items = [
+            (segment, row)
+            for segment, row in collection.items()
+            if filter is None or match_filter(segment.metadatas[row], filter)
+        ]
+        items = items[offset : offset + limit if limit is not None else None]
+
+        return [
+            VectorItem(
+                id=segment.ids[row],
+                text=segment.documents[row],
+                vector=np.asarray(segment.vectors[row], dtype=np.float32).tolist(),
+                metadata=segment.metadatas[row],
+            )
+            for segment, row in items
+        ]
+
+    def warmup(self, collection_name: str):
+        self._load_collection(collection_name)
+
+    def insert(self, collection_name: str, items: list[VectorItem]):
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name: str, items: list[VectorItem]):
+        # The last item wins when an id is given more than once
+        items = list({item["id"]: item for item in items}.values())
+        if not items:
+            return
+
+        with self._write_lock(collection_name) as collection_path:
+            collection = self._load_collection(collection_name)
+
+            # Replaced items are deleted from the segments that hold them
+            deleted = {name: set(rows) for name, rows in collection.deleted.items()} if collection else {}
+            for segment in collection.segments if collection else []:
+                for item in items:
+                    row = segment.rows.get(item["id"])
+                    if row is not None:
+                        deleted.setdefault(segment.name, set()).add(row)
+
+            new_rows = (
+                [item["id"] for item in items],
+                [item["text"] for item in items],
+                [process_metadata(item["metadata"]) for item in items],
+                np.asarray([item["vector"] for item in items], dtype=np.float32),
+            )
+            self._commit(collection_name, collection_path, collection, deleted, new_rows)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: list[str] | None = None,
+        filter: dict | None = None,
+    ):
+        if not ids and not filter:
+            return
+
+        with self._write_lock(collection_name) as collection_path:
+            collection = self._load_collection(collection_name)
+            if collection is None:
+                log.debug(f"Attempted to delete from non-existent collection {collection_name}. Ignoring.")
+                return
+
+            deleted = {name: set(rows) for name, rows in collection.deleted.items()}
+            if ids:
+                for segment in collection.segments:
+                    for id in ids:
+                        row = segment.rows.get(id)
+                        if row is not None:
+                            deleted.setdefault(segment.name, set()).add(row)
+            else:
+                for segment, row in collection.items():
+                    if match_filter(segment.metadatas[row], filter):
+                        deleted.setdefault(segment.name, set()).add(row)
+
+            self._commit(collection_name, collection_path, collection, deleted)
+
+    def reset(self):
+        with self._lock:
+            self._collections.clear()
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
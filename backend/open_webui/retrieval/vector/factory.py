@@ -11,7 +11,11 @@ class Vector:
             from open_webui.retrieval.vector.dbs.chroma import ChromaClient
 
             return ChromaClient()
-        raise ValueError(f"Unsupported vector type: {vector_type}. Only 'chroma' is supported.")
+        if vector_type == VectorType.LOCAL:
+            from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+            return LocalVectorClient()
+        raise ValueError(f"Unsupported vector type: {vector_type}. Supported types are 'chroma' and 'local'.")
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
@@ -56,8 +56,28 @@ class VectorDBBase(ABC):
         """Query vectors from a collection using metadata filter."""
 
     @abstractmethod
-    def get(self, collection_name: str) -> GetResult | None:
-        """Retrieve all vectors from a collection."""
+    def get(self, collection_name: str, limit: int | None = None, offset: int = 0) -> GetResult | None:
+        """Retrieve all vectors from a collection, or one page of them when a limit is given."""
+
+    def get_vectors(
+        self,
+        collection_name: str,
+        filter: dict | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorItem] | None:
+        """Retrieve stored items together with their vectors, one page at a time.
+
+        Backends that cannot return stored vectors keep this default and return None,
+        in which case callers fall back to re-embedding the documents.
+        """
+        return None
+
+    def warmup(self, collection_name: str) -> None:  # noqa: B027
+        """Load a collection's data and indexes ahead of its first query.
+
+        The default is a no-op for backends that have no cold-start cost.
+        """
 
     @abstractmethod
     def delete(
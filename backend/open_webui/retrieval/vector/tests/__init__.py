@@ -0,0 +1 @@
+"""Tests for the vector database backends."""
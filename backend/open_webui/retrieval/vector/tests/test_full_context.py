@@ -0,0 +1,92 @@
+"""Tests for loading collections in full context mode under a token budget."""
+
+import threading
+
+import open_webui.retrieval.utils as retrieval_utils
+from open_webui.retrieval.utils import get_all_items_from_collections
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+
+class RecordingClient(LocalVectorClient):
+    """Local vector store that records the pages that are read."""
+
+    def __init__(self, path: str):
+        super().__init__(path=path)
+        self.reads = []
+        self._reads_lock = threading.Lock()
+
+    def get(self, collection_name, limit=None, offset=0):
+        with self._reads_lock:
+            self.reads.append((collection_name, offset))
+        return super().get(collection_name, limit=limit, offset=offset)
+
+
+class WordEncoding:
+    """Counts words as tokens, so the tests do not download a tiktoken encoding."""
+
+    def encode_ordinary(self, text: str) -> list[str]:
+        return text.split()
+
+
+def make_client(path: str, collections: int, items: int) -> RecordingClient:
+    client = RecordingClient(path)
+    for collection in range(collections):
+        client.insert(
+            f"collection-{collection}",
+            [
+                {
+                    "id": f"{collection}-{idx}",
+                    "text": "word " * 10,
+                    "vector": [1.0, float(idx)],
+                    "metadata": {"index": idx},
+                }
+                for idx in range(items)
+            ],
+        )
+    return client
+
+
+class TestGetAllItemsFromCollections:
+    """Test suite for get_all_items_from_collections."""
+
+    def test_without_budget_loads_everything_in_order(self, tmp_path, monkeypatch):
+        """Test that every item of every collection is returned, in collection order."""
+        client = make_client(str(tmp_path), collections=3, items=20)
+        monkeypatch.setattr(retrieval_utils, "VECTOR_DB_CLIENT", client)
+
+        result = get_all_items_from_collections([f"collection-{idx}" for idx in range(3)] + ["missing"])
+
+        assert result["ids"][0] == [f"{collection}-{idx}" for collection in range(3) for idx in range(20)]
+
+    def test_budget_spans_collections(self, tmp_path, monkeypatch):
+        """Test that the budget of 25 documents is filled in collection order and cuts the last collection short."""
+        client = make_client(str(tmp_path), collections=3, items=20)
+        monkeypatch.setattr(retrieval_utils, "VECTOR_DB_CLIENT", client)
+        monkeypatch.setattr(retrieval_utils, "get_tiktoken_encoding", lambda name: WordEncoding())
+        monkeypatch.setattr(retrieval_utils, "FULL_CONTEXT_PAGE_SIZE", 8)
+
+        result = get_all_items_from_collections(
+            [f"collection-{idx}" for idx in range(3)],
+            max_tokens=250,
+        )
+
+        assert result["ids"][0] == [f"0-{idx}" for idx in range(20)] + [f"1-{idx}" for idx in range(5)]
+
+    def test_budget_smaller_than_first_collection_stops_reading(self, tmp_path, monkeypatch):
+        """Test that pages past the budget and the collections after the first one are not read."""
+        client = make_client(str(tmp_path), collections=6, items=200)
+        monkeypatch.setattr(retrieval_utils, "VECTOR_DB_CLIENT", client)
+        monkeypatch.setattr(retrieval_utils, "get_tiktoken_encoding", lambda name: WordEncoding())
+        monkeypatch.setattr(retrieval_utils, "FULL_CONTEXT_PAGE_SIZE", 10)
+        monkeypatch.setattr(retrieval_utils, "RAG_FULL_CONTEXT_MAX_WORKERS", 2)
+
+        result = get_all_items_from_collections(
+            [f"collection-{idx}" for idx in range(6)],
+            max_tokens=250,
+        )
+
+        assert result["ids"][0] == [f"0-{idx}" for idx in range(25)]
+        assert [offset for name, offset in client.reads if name == "collection-0"] == [0, 10, 20]
+        # Only the collection loaded next to the first one may have started reading
+        assert {name for name, _ in client.reads} <= {"collection-0", "collection-1"}
+        assert len([name for name, _ in client.reads if name == "collection-1"]) < 20
@@ -0,0 +1,165 @@
+"""Tests for the local quantized vector store."""
+
+import threading
+
+import numpy as np
+import pytest
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+
+def make_items(vectors: np.ndarray, file_id: str = "file", start: int = 0) -> list[dict]:
+    return [
+        {
+            "id": f"{file_id}-{idx}",
+            "text": f"document {idx}",
+            "vector": vector.tolist(),
+            "metadata": {"file_id": file_id, "index": idx},
+        }
+        for idx, vector in enumerate(vectors, start)
+    ]
+
+
+def make_vectors(count: int, dim: int, seed: int = 0) -> np.ndarray:
+    # Clustered data is closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(32, dim))
+    labels = rng.integers(0, len(centers), size=count)
+    return (centers[labels] + 0.5 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+class TestLocalVectorClient:
+    """Test suite for LocalVectorClient."""
+
+    def test_insert_search_and_query(self, tmp_path):
+        """Test the basic collection lifecycle."""
+        client = LocalVectorClient(path=str(tmp_path))
+        vectors = make_vectors(100, 16)
+        client.insert("collection", make_items(vectors))
+
+        assert client.has_collection("collection")
+
+        result = client.search("collection", [vectors[7].tolist()], limit=3)
+        assert result.ids[0][0] == "file-7"
+        assert result.distances[0][0] == pytest.approx(1.0, abs=1e-5)
+
+        result = client.query("collection", filter={"index": 42})
+        assert result.ids == [["file-42"]]
+
+        client.delete("collection", filter={"index": 42})
+        assert client.query("collection", filter={"index": 42}).ids == [[]]
+        assert len(client.get("collection").ids[0]) == 99
+
+        client.delete_collection("collection")
+        assert not client.has_collection("collection")
+
+    def test_get_vectors_returns_originals(self, tmp_path):
+        """Test that stored vectors are returned at full precision, page by page."""
+        client = LocalVectorClient(path=str(tmp_path))
+        vectors = make_vectors(10, 8)
+        client.insert("collection", make_items(vectors))
+
+        first_page = client.get_vectors("collection", filter={"file_id": "file"}, limit=4)
+        second_page = client.get_vectors("collection", filter={"file_id": "file"}, limit=4, offset=4)
+
+        assert [item.id for item in first_page] == ["file-0", "file-1", "file-2", "file-3"]
+        assert [item.id for item in second_page] == ["file-4", "file-5", "file-6", "file-7"]
+        assert np.allclose(first_page[0].vector, vectors[0])
+
+    def test_upsert_replaces_items(self, tmp_path):
+        """Test that upserting an existing id replaces it instead of duplicating it."""
+        client = LocalVectorClient(path=str(tmp_path))
+        vectors = make_vectors(5, 8)
+        client.insert("collection", make_items(vectors))
+        client.upsert("collection", make_items(vectors[:1] * -1))
+
+        result = client.get("collection")
+        assert len(result.ids[0]) == 5
+        assert result.ids[0][-1] == "file-0"
+
+    @pytest.mark.parametrize("quantization", ["int8", "float16"])
+    def test_quantized_search_matches_exact_search(self, tmp_path, quantization):
+        """Test that the quantized search returns the exact float32 nearest neighbours."""
+        count, dim, k = 1000, 64, 10
+        vectors = make_vectors(count, dim)
+        queries = make_vectors(20, dim, seed=1)
+
+        client = LocalVectorClient(path=str(tmp_path), quantization=quantization)
+        client.insert("collection", make_items(vectors))
+
+        for query in queries:
+            result = client.search("collection", [query.tolist()], limit=k)
+            assert set(result.ids[0]) == {f"file-{idx}" for idx in exact_top_k(vectors, query, k)}
+
+    def test_batched_inserts_rewrite_each_item_a_logarithmic_number_of_times(self, tmp_path):
+        """Test that inserting in batches merges segments geometrically instead of rewriting the collection."""
+        client = LocalVectorClient(path=str(tmp_path))
+        written_rows = []
+        write_segment = client._write_segment
+
+        def record_write(path, name, ids, *args):
+            written_rows.append(len(ids))
+            return write_segment(path, name, ids, *args)
+
+        client._write_segment = record_write
+
+        batches, batch_size = 256, 8
+        vectors = make_vectors(batches * batch_size, 8)
+        for start in range(0, len(vectors), batch_size):
+            client.insert("collection", make_items(vectors[start : start + batch_size], start=start))
+
+        collection = client._load_collection("collection")
+        assert len(client.get("collection").ids[0]) == len(vectors)
+        assert len(collection.segments) <= 10
+        # Rewriting the whole collection on every insert writes about batches / 2 times the collection
+        assert sum(written_rows) <= len(vectors) * 10
+        assert client.search("collection", [vectors[1234].tolist()], limit=1).ids[0] == ["file-1234"]
+
+    def test_deletes_are_tombstoned_and_compacted(self, tmp_path):
+        """Test that deleted items disappear everywhere and mostly deleted segments are rewritten."""
+        client = LocalVectorClient(path=str(tmp_path))
+        vectors = make_vectors(100, 8)
+        client.insert("collection", make_items(vectors[:60], "a"))
+        client.insert("collection", make_items(vectors[60:], "b"))
+
+        client.delete("collection", ids=["a-0", "a-1"])
+        collection = client._load_collection("collection")
+        assert sum(len(rows) for rows in collection.deleted.values()) == 2
+
+        client.delete("collection", filter={"file_id": "a"})
+        collection = client._load_collection("collection")
+        assert not any(collection.deleted.values())
+        assert client.get("collection").ids[0] == [f"b-{idx}" for idx in range(40)]
+        assert client.search("collection", [vectors[0].tolist()], limit=100).ids[0][0].startswith("b-")
+        assert len(client.get("collection", limit=10, offset=35).ids[0]) == 5
+
+    def test_writers_in_other_processes_are_seen_and_not_lost(self, tmp_path):
+        """Test that clients sharing a directory see each other's writes and do not lose concurrent ones."""
+        # Each client has its own lock and cache, like uvicorn workers in separate processes
+        first = LocalVectorClient(path=str(tmp_path))
+        second = LocalVectorClient(path=str(tmp_path))
+        vectors = make_vectors(200, 8)
+
+        first.insert("collection", make_items(vectors[:10], "first"))
+        assert len(second.get("collection").ids[0]) == 10
+
+        def write(client: LocalVectorClient, file_id: str, offset: int):
+            for start in range(offset, offset + 90, 3):
+                client.insert("collection", make_items(vectors[start : start + 3], file_id, start))
+
+        threads = [
+            threading.Thread(target=write, args=(first, "first", 10)),
+            threading.Thread(target=write, args=(second, "second", 100)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ids = LocalVectorClient(path=str(tmp_path)).get("collection").ids[0]
+        assert len(ids) == len(set(ids)) == 190
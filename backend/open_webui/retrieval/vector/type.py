@@ -3,3 +3,4 @@ from enum import StrEnum
 
 class VectorType(StrEnum):
     CHROMA = "chroma"
+    LOCAL = "local"
@@ -143,6 +143,7 @@ async def create_new_model(
 
     model = Models.insert_new_model(form_data, user.id)
     if model:
+        await request.app.state.MODEL_REGISTRY.invalidate()
         return model
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -214,6 +215,7 @@ async def import_models(
                         model_data["params"] = model_data.get("params", {})
                         new_model = ModelForm(**model_data)
                         Models.insert_new_model(user_id=user.id, form_data=new_model)
+            await request.app.state.MODEL_REGISTRY.invalidate()
             return True
         raise HTTPException(status_code=400, detail="Invalid JSON format")
     except Exception as e:
@@ -232,7 +234,9 @@ class SyncModelsForm(BaseModel):
 
 @router.post("/sync", response_model=list[ModelModel])
 async def sync_models(request: Request, form_data: SyncModelsForm, user=Depends(get_admin_user)):
-    return Models.sync_models(user.id, form_data.models)
+    models = Models.sync_models(user.id, form_data.models)
+    await request.app.state.MODEL_REGISTRY.invalidate()
+    return models
 
 
 ###########################
@@ -301,13 +305,14 @@ async def get_model_profile_image(id: str, user=Depends(get_verified_user)):
 
 
 @router.post("/model/toggle", response_model=Optional[ModelResponse])
-async def toggle_model_by_id(id: str, user=Depends(get_verified_user)):
+async def toggle_model_by_id(request: Request, id: str, user=Depends(get_verified_user)):
     model = Models.get_model_by_id(id)
     if model:
         if user.role == "admin" or model.user_id == user.id or has_access(user.id, "write", model.access_control):
             model = Models.toggle_model_by_id(id)
 
             if model:
+                await request.app.state.MODEL_REGISTRY.invalidate()
                 return model
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -330,6 +335,7 @@ async def toggle_model_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/model/update", response_model=Optional[ModelModel])
 async def update_model_by_id(
+    request: Request,
     form_data: ModelForm,
     user=Depends(get_verified_user),
 ):
@@ -347,6 +353,7 @@ async def update_model_by_id(
         )
 
     model = Models.update_model_by_id(form_data.id, ModelForm(**form_data.model_dump()))
+    await request.app.state.MODEL_REGISTRY.invalidate()
     return model
 
 
@@ -356,7 +363,7 @@ async def update_model_by_id(
 
 
 @router.post("/model/delete", response_model=bool)
-async def delete_model_by_id(form_data: ModelIdForm, user=Depends(get_verified_user)):
+async def delete_model_by_id(request: Request, form_data: ModelIdForm, user=Depends(get_verified_user)):
     model = Models.get_model_by_id(form_data.id)
     if not model:
         raise HTTPException(
@@ -371,10 +378,12 @@ async def delete_model_by_id(form_data: ModelIdForm, user=Depends(get_verified_u
         )
 
     result = Models.delete_model_by_id(form_data.id)
+    await request.app.state.MODEL_REGISTRY.invalidate()
     return result
 
 
 @router.delete("/delete/all", response_model=bool)
-async def delete_all_models(user=Depends(get_admin_user)):
+async def delete_all_models(request: Request, user=Depends(get_admin_user)):
     result = Models.delete_all_models()
+    await request.app.state.MODEL_REGISTRY.invalidate()
     return result
@@ -1,12 +1,13 @@
 import asyncio
+import copy
 import hashlib
 import json
 import logging
+import time
+from contextlib import asynccontextmanager
 
 import aiohttp
-import httpx
 import requests
-from aiocache import cached
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import (
     FileResponse,
@@ -20,18 +21,25 @@ from open_webui.config import (
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_FORWARD_USER_INFO_HEADERS,
-    MODELS_CACHE_TTL,
+    OPENAI_API_HEDGE_DELAY,
+    OPENAI_API_MODEL_LIST_DEADLINE,
     SRC_LOG_LEVELS,
 )
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel
 from open_webui.utils.access_control import has_access
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.completion_cache import (
+    StreamedCompletion,
+    completion_cache,
+    completion_cache_key,
+    completion_chunks,
+)
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.http_clients import cookie_header, upstream_clients
 from open_webui.utils.misc import (
     convert_logit_bias_input_to_json,
 )
@@ -40,7 +48,9 @@ from open_webui.utils.payload import (
     apply_system_prompt_to_body,
     remove_open_webui_params,
 )
-from openai import AsyncOpenAI, OpenAIError
+from open_webui.utils.response_handling import ChunkStreamingResponse, SSEChunk, iter_sse_chunks
+from open_webui.utils.upstreams import call_with_failover, stream_with_failover, upstream_health
+from openai import OpenAIError
 from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
@@ -58,20 +68,20 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        headers = {
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with upstream_clients.session().get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
@@ -220,6 +230,10 @@ async def update_config(request: Request, form_data: OpenAIConfigForm, user=Depe
         key: value for key, value in request.app.state.config.OPENAI_API_CONFIGS.items() if key in keys
     }
 
+    # Rebuild the pooled clients and the model lists for the new connections
+    await upstream_clients.reset()
+    await request.app.state.MODEL_REGISTRY.invalidate(connections=True)
+
     return {
         "ENABLE_OPENAI_API": request.app.state.config.ENABLE_OPENAI_API,
         "OPENAI_API_BASE_URLS": request.app.state.config.OPENAI_API_BASE_URLS,
@@ -298,6 +312,66 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         raise HTTPException(status_code=401, detail=ERROR_MESSAGES.OPENAI_NOT_FOUND)
 
 
+# Model list requests that outlived the fan-out they were started by
+_model_list_fetches: set[asyncio.Task] = set()
+
+
+def is_error_response(response) -> bool:
+    return isinstance(response, dict) and "error" in response
+
+
+async def fetch_model_list(request: Request, url: str, key: str | None = None, user: UserModel = None):
+    start = time.monotonic()
+    response = await send_get_request(f"{url}/models", key, user=user)
+    if response is None or is_error_response(response):
+        upstream_health.record_failure(url)
+        return response
+
+    upstream_health.record_success(url, latency=time.monotonic() - start)
+    # Lists fetched with the info of one user are not served to others
+    if not (ENABLE_FORWARD_USER_INFO_HEADERS and user):
+        request.app.state.MODEL_REGISTRY.model_lists[url] = copy.deepcopy(response)
+    return response
+
+
+async def get_model_list(
+    request: Request,
+    url: str,
+    key: str | None = None,
+    user: UserModel = None,
+    deadline: float | None = None,
+):
+    """Get the model list of a connection, or its last known list.
+
+    The last known list is used while the circuit breaker of the connection
+    is open, when the request fails or answers with an error, or when it did
+    not finish by the ``deadline`` of the event loop clock. A late request
+    keeps running and updates the last known list once it finishes.
+    """
+    response = None
+    if upstream_health.is_available(url):
+        fetch = asyncio.ensure_future(fetch_model_list(request, url, key, user=user))
+        _model_list_fetches.add(fetch)
+        fetch.add_done_callback(_model_list_fetches.discard)
+
+        timeout = None if deadline is None else max(deadline - asyncio.get_running_loop().time(), 0)
+        done, _ = await asyncio.wait({fetch}, timeout=timeout)
+        if not done:
+            log.warning(f"Model list of {url} not received in time, using the last known list")
+        else:
+            response = fetch.result()
+            if response is not None and not is_error_response(response):
+                return response
+    else:
+        log.debug(f"Circuit breaker of {url} is open, using the last known model list")
+
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        return response
+
+    model_list = request.app.state.MODEL_REGISTRY.model_lists.get(url)
+    return copy.deepcopy(model_list) if model_list is not None else response
+
+
 async def get_all_models_responses(request: Request, user: UserModel) -> list:
     if not request.app.state.config.ENABLE_OPENAI_API:
         return []
@@ -315,16 +389,23 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
         else:
             request.app.state.config.OPENAI_API_KEYS += [""] * (num_urls - num_keys)
 
+    # Connections that do not answer in time are served from their last known list
+    deadline = None
+    if OPENAI_API_MODEL_LIST_DEADLINE is not None:
+        deadline = asyncio.get_running_loop().time() + OPENAI_API_MODEL_LIST_DEADLINE
+
     request_tasks = []
     for idx, url in enumerate(request.app.state.config.OPENAI_API_BASE_URLS):
         if (str(idx) not in request.app.state.config.OPENAI_API_CONFIGS) and (
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
-                    f"{url}/models",
+                get_model_list(
+                    request,
+                    url,
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
+                    deadline=deadline,
                 )
             )
         else:
@@ -339,10 +420,12 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
-                            f"{url}/models",
+                        get_model_list(
+                            request,
+                            url,
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
+                            deadline=deadline,
                         )
                     )
                 else:
@@ -415,16 +498,28 @@ async def get_filtered_models(models, user):
     return filtered_models
 
 
-@cached(
-    ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"openai_all_models_{user.id}" if user else "openai_all_models",
-)
-async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
-    log.info("get_all_models()")
-
+async def get_all_models(request: Request, user: UserModel, refresh: bool = False) -> dict[str, list]:
     if not request.app.state.config.ENABLE_OPENAI_API:
         return {"data": []}
 
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        # The upstream lists may depend on the forwarded user info, so they are fetched for each user
+        models = await fetch_all_models(request, user=user)
+    else:
+        # Served from the model registry, which refreshes the upstream lists in the background
+        models = await request.app.state.MODEL_REGISTRY.get_openai_models(
+            lambda: fetch_all_models(request, user=user),
+            refresh=refresh,
+            revalidate=not request.app.state.config.ENABLE_BASE_MODELS_CACHE,
+        )
+
+    request.app.state.OPENAI_MODELS = models
+    return {"data": list(models.values())}
+
+
+async def fetch_all_models(request: Request, user: UserModel) -> dict[str, dict]:
+    log.info("get_all_models()")
+
     responses = await get_all_models_responses(request, user=user)
 
     def extract_data(response):
@@ -464,7 +559,10 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
                         # Skip unwanted OpenAI models
                         continue
 
-                    if model_id and model_id not in models:
+                    if model_id in models:
+                        # Served by several connections
+                        models[model_id]["urlIdxs"].append(idx)
+                    elif model_id:
                         models[model_id] = {
                             **model,
                             "name": model.get("name", model_id),
@@ -472,6 +570,7 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
                             "openai": model,
                             "connection_type": model.get("connection_type", "external"),
                             "urlIdx": idx,
+                            "urlIdxs": [idx],
                         }
 
         return models
@@ -479,8 +578,7 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
     models = get_merged_models(map(extract_data, responses))
     log.debug(f"models: {models}")
 
-    request.app.state.OPENAI_MODELS = models
-    return {"data": list(models.values())}
+    return models
 
 
 @router.get("/models")
@@ -502,57 +600,54 @@ async def get_models(request: Request, url_idx: int | None = None, user=Depends(
         )
 
         r = None
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-        ) as session:
-            try:
-                headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
-
-                async with session.get(
-                    f"{url}/models",
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    if r.status != 200:
-                        # Extract response error details if available
-                        error_detail = f"HTTP Error: {r.status}"
-                        res = await r.json()
-                        if "error" in res:
-                            error_detail = f"External Error: {res['error']}"
-                        raise Exception(error_detail)
-
-                    response_data = await r.json()
-
-                    # Check if we're calling OpenAI API based on the URL
-                    if "api.openai.com" in url:
-                        # Filter models according to the specified conditions
-                        response_data["data"] = [
-                            model
-                            for model in response_data.get("data", [])
-                            if not any(
-                                name in model["id"]
-                                for name in [
-                                    "babbage",
-                                    "dall-e",
-                                    "davinci",
-                                    "embedding",
-                                    "tts",
-                                    "whisper",
-                                ]
-                            )
-                        ]
-
-                    models = response_data
-            except aiohttp.ClientError as e:
-                # ClientError covers all aiohttp requests issues
-                log.exception(f"Client error: {e!s}")
-                raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
-            except Exception as e:
-                log.exception(f"Unexpected error: {e}")
-                error_detail = f"Unexpected error: {e!s}"
-                raise HTTPException(status_code=500, detail=error_detail)
+        try:
+            headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
+
+            async with upstream_clients.session().get(
+                f"{url}/models",
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
+            ) as r:
+                if r.status != 200:
+                    # Extract response error details if available
+                    error_detail = f"HTTP Error: {r.status}"
+                    res = await r.json()
+                    if "error" in res:
+                        error_detail = f"External Error: {res['error']}"
+                    raise Exception(error_detail)
+
+                response_data = await r.json()
+
+                # Check if we're calling OpenAI API based on the URL
+                if "api.openai.com" in url:
+                    # Filter models according to the specified conditions
+                    response_data["data"] = [
+                        model
+                        for model in response_data.get("data", [])
+                        if not any(
+                            name in model["id"]
+                            for name in [
+                                "babbage",
+                                "dall-e",
+                                "davinci",
+                                "embedding",
+                                "tts",
+                                "whisper",
+                            ]
+                        )
+                    ]
+
+                models = response_data
+        except aiohttp.ClientError as e:
+            # ClientError covers all aiohttp requests issues
+            log.exception(f"Client error: {e!s}")
+            raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
+        except Exception as e:
+            log.exception(f"Unexpected error: {e}")
+            error_detail = f"Unexpected error: {e!s}"
+            raise HTTPException(status_code=500, detail=error_detail)
 
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
         models["data"] = await get_filtered_models(models, user)
@@ -578,38 +673,35 @@ async def verify_connection(
 
     api_config = form_data.config or {}
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
-        try:
-            headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
+    try:
+        headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
 
-            async with session.get(
-                f"{url}/models",
-                headers=headers,
-                cookies=cookies,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                try:
-                    response_data = await r.json()
-                except Exception:
-                    response_data = await r.text()
+        async with upstream_clients.session().get(
+            f"{url}/models",
+            headers=headers,
+            cookies=cookies,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
+        ) as r:
+            try:
+                response_data = await r.json()
+            except Exception:
+                response_data = await r.text()
 
-                if r.status != 200:
-                    if isinstance(response_data, (dict, list)):
-                        return JSONResponse(status_code=r.status, content=response_data)
-                    return PlainTextResponse(status_code=r.status, content=response_data)
+            if r.status != 200:
+                if isinstance(response_data, (dict, list)):
+                    return JSONResponse(status_code=r.status, content=response_data)
+                return PlainTextResponse(status_code=r.status, content=response_data)
 
-                return response_data
+            return response_data
 
-        except aiohttp.ClientError as e:
-            # ClientError covers all aiohttp requests issues
-            log.exception(f"Client error: {e!s}")
-            raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
-        except Exception as e:
-            log.exception(f"Unexpected error: {e}")
-            raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
+    except aiohttp.ClientError as e:
+        # ClientError covers all aiohttp requests issues
+        log.exception(f"Client error: {e!s}")
+        raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
+    except Exception as e:
+        log.exception(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail="Open WebUI: Server Connection Error")
 
 
 def is_openai_reasoning_model(model: str) -> bool:
@@ -626,8 +718,6 @@ async def generate_chat_completion(
     if BYPASS_MODEL_ACCESS_CONTROL:
         bypass_filter = True
 
-    idx = 0
-
     payload = {**form_data}
     metadata = payload.pop("metadata", None)
 
@@ -667,91 +757,129 @@ async def generate_chat_completion(
 
     await get_all_models(request, user=user)
     model = request.app.state.OPENAI_MODELS.get(model_id)
-    if model:
-        idx = model["urlIdx"]
-    else:
+    if not model:
         raise HTTPException(
             status_code=404,
             detail="Model not found",
         )
 
-    # Get the API config for the model
-    api_config = request.app.state.config.OPENAI_API_CONFIGS.get(
-        str(idx),
-        request.app.state.config.OPENAI_API_CONFIGS.get(
-            request.app.state.config.OPENAI_API_BASE_URLS[idx], {}
-        ),  # Legacy support
-    )
-
-    prefix_id = api_config.get("prefix_id", None)
-    if prefix_id:
-        payload["model"] = payload["model"].replace(f"{prefix_id}.", "")
-
-    url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
-    key = request.app.state.config.OPENAI_API_KEYS[idx]
-
-    # Check if model is a reasoning model that needs special handling
-    if is_openai_reasoning_model(payload["model"]):
-        payload = openai_reasoning_model_handler(payload)
-    elif "api.openai.com" not in url:
-        # Remove "max_completion_tokens" from the payload for backward compatibility
-        if "max_completion_tokens" in payload:
-            payload["max_tokens"] = payload["max_completion_tokens"]
-            del payload["max_completion_tokens"]
-
-    if "max_tokens" in payload and "max_completion_tokens" in payload:
-        del payload["max_tokens"]
+    # Connections serving the model by base URL, requests go to the healthiest one
+    connections = {}
+    for idx in model.get("urlIdxs", [model["urlIdx"]]):
+        connections.setdefault(request.app.state.config.OPENAI_API_BASE_URLS[idx], idx)
 
     # Convert the modified body back to JSON
     if "logit_bias" in payload:
         payload["logit_bias"] = json.loads(convert_logit_bias_input_to_json(payload["logit_bias"]))
 
-    headers, cookies = await get_headers_and_cookies(request, url, key, api_config, metadata, user=user)
-
     payload = remove_open_webui_params(payload)
     stream = bool(payload.pop("stream", False))
 
-    timeout = AIOHTTP_CLIENT_TIMEOUT
+    cache_key = None
+    if completion_cache.is_cacheable((form_data.get("model"), model_id), payload, metadata):
+        cache_key = completion_cache_key(payload)
+        completion = await completion_cache.get(cache_key)
+        if completion is not None:
+            if stream:
 
-    http_client = httpx.AsyncClient(
-        timeout=timeout,
-        follow_redirects=True,
-        headers=headers,
-        cookies=cookies if cookies else None,
-        trust_env=True,
-    )
-    client = AsyncOpenAI(
-        api_key=key,
-        base_url=url,
-        default_headers=headers,
-        http_client=http_client,
-    )
+                async def replay_completion():
+                    for chunk in completion_chunks(completion):
+                        yield SSEChunk(data=chunk)
+                    yield SSEChunk.done()
+
+                return ChunkStreamingResponse(replay_completion())
+            return completion
+
+    async def get_connection(url: str) -> tuple[str, dict, dict, dict]:
+        idx = connections[url]
+        key = request.app.state.config.OPENAI_API_KEYS[idx]
+
+        # Get the API config for the model
+        api_config = request.app.state.config.OPENAI_API_CONFIGS.get(
+            str(idx),
+            request.app.state.config.OPENAI_API_CONFIGS.get(url, {}),  # Legacy support
+        )
+
+        connection_payload = {**payload}
+        prefix_id = api_config.get("prefix_id", None)
+        if prefix_id:
+            connection_payload["model"] = connection_payload["model"].replace(f"{prefix_id}.", "")
+
+        # Check if model is a reasoning model that needs special handling
+        if is_openai_reasoning_model(connection_payload["model"]):
+            connection_payload = openai_reasoning_model_handler(connection_payload)
+        elif "api.openai.com" not in url:
+            # Remove "max_completion_tokens" from the payload for backward compatibility
+            if "max_completion_tokens" in connection_payload:
+                connection_payload["max_tokens"] = connection_payload["max_completion_tokens"]
+                del connection_payload["max_completion_tokens"]
+
+        if "max_tokens" in connection_payload and "max_completion_tokens" in connection_payload:
+            del connection_payload["max_tokens"]
+
+        headers, cookies = await get_headers_and_cookies(request, url, key, api_config, metadata, user=user)
+        # The client is shared between requests, so headers and cookies are sent per request
+        return key, api_config, connection_payload, {**headers, **cookie_header(cookies)}
+
+    @asynccontextmanager
+    async def connection_client(url: str, key: str, api_config: dict):
+        async with upstream_clients.openai(url, key, api_config) as client:
+            # Fail over to the next connection instead of retrying the same one
+            yield client.with_options(max_retries=0) if len(connections) > 1 else client
 
     if stream:
 
+        async def stream_connection(url: str):
+            key, api_config, connection_payload, headers = await get_connection(url)
+            async with connection_client(url, key, api_config) as client:
+                async with client.chat.completions.with_streaming_response.create(
+                    stream=True, extra_headers=headers, **connection_payload
+                ) as stream_resp:
+                    async for chunk in iter_sse_chunks(stream_resp.iter_lines()):
+                        if chunk.is_done:
+                            break
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug("Streaming chunk: %s", chunk.raw)
+                        yield chunk
+
         async def stream_completion():
-            stream_resp = None
+            # Upstream chunks are passed on as raw payloads, the middleware parses them once
+            # and they are only encoded again if the response goes straight to the client
+            streamed = StreamedCompletion() if cache_key else None
             try:
-                stream_resp = await client.chat.completions.create(stream=True, **payload)
-                async for chunk in stream_resp:
-                    if log.isEnabledFor(logging.DEBUG):
-                        log.debug("Streaming chunk: %s", chunk.model_dump(exclude_none=True))
-                    yield f"data: {json.dumps(chunk.model_dump(exclude_none=True))}\n\n"
-                yield "data: [DONE]\n\n"
+                async for chunk in stream_with_failover(
+                    list(connections), stream_connection, hedge_delay=OPENAI_API_HEDGE_DELAY
+                ):
+                    if streamed is not None:
+                        try:
+                            streamed.add(chunk.data)
+                        except json.JSONDecodeError:
+                            streamed.failed = True
+                    yield chunk
+                if streamed is not None and (completion := streamed.completion()):
+                    await completion_cache.set(cache_key, completion)
+                yield SSEChunk.done()
             except OpenAIError as e:
                 log.exception(e)
-                yield f"data: {json.dumps({'error': {'message': str(e)}})}\n\n"
+                yield SSEChunk(data={"error": {"message": str(e)}})
             except Exception as e:
                 log.exception(e)
-                yield f"data: {json.dumps({'error': {'message': str(e)}})}\n\n"
-            finally:
-                await client.close()
+                yield SSEChunk(data={"error": {"message": str(e)}})
+
+        return ChunkStreamingResponse(stream_completion())
 
-        return StreamingResponse(stream_completion(), media_type="text/event-stream")
+    async def call_connection(url: str):
+        key, api_config, connection_payload, headers = await get_connection(url)
+        async with connection_client(url, key, api_config) as client:
+            return await client.chat.completions.create(extra_headers=headers, **connection_payload)
 
     try:
-        response = await client.chat.completions.create(**payload)
-        return response.model_dump(exclude_none=True)
+        response = await call_with_failover(list(connections), call_connection)
+        completion = response.model_dump(exclude_none=True)
+        choices = completion.get("choices")
+        if cache_key and choices and all(choice.get("finish_reason") for choice in choices):
+            await completion_cache.set(cache_key, completion)
+        return completion
     except OpenAIError as e:
         log.exception(e)
         status_code = getattr(e, "status_code", 500) or 500
@@ -765,8 +893,6 @@ async def generate_chat_completion(
             status_code=500,
             detail="Open WebUI: Server Connection Error",
         )
-    finally:
-        await client.close()
 
 
 async def embeddings(request: Request, form_data: dict, user):
@@ -800,13 +926,11 @@ async def embeddings(request: Request, form_data: dict, user):
     )
 
     r = None
-    session = None
     streaming = False
 
     headers, cookies = await get_headers_and_cookies(request, url, key, api_config, user=user)
     try:
-        session = aiohttp.ClientSession(trust_env=True)
-        r = await session.request(
+        r = await upstream_clients.session().request(
             method="POST",
             url=f"{url}/embeddings",
             data=body,
@@ -820,7 +944,7 @@ async def embeddings(request: Request, form_data: dict, user):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(cleanup_response, response=r, session=session),
+                background=BackgroundTask(cleanup_response, response=r, session=None),
             )
         try:
             response_data = await r.json()
@@ -841,7 +965,7 @@ async def embeddings(request: Request, form_data: dict, user):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r, None)
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -860,7 +984,6 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     )
 
     r = None
-    session = None
     streaming = False
 
     try:
@@ -872,8 +995,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             payload = remove_open_webui_params(payload)
             body = json.dumps(payload).encode()
 
-        session = aiohttp.ClientSession(trust_env=True)
-        r = await session.request(
+        r = await upstream_clients.session().request(
             method=request.method,
             url=request_url,
             data=body,
@@ -889,7 +1011,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(cleanup_response, response=r, session=session),
+                background=BackgroundTask(cleanup_response, response=r, session=None),
             )
         try:
             response_data = await r.json()
@@ -911,4 +1033,4 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r, None)
@@ -4,7 +4,6 @@ import os
 import shutil
 import uuid
 
-import tiktoken
 from fastapi import (
     APIRouter,
     Depends,
@@ -13,14 +12,13 @@ from fastapi import (
     status,
 )
 from fastapi.concurrency import run_in_threadpool
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
 from langchain_core.documents import Document
-from langchain_text_splitters import MarkdownHeaderTextSplitter
 from open_webui.config import (
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+    RAG_TEXT_SPLITTER_WORKERS,
     UPLOAD_DIR,
 )
 from open_webui.constants import ERROR_MESSAGES
@@ -38,6 +36,11 @@ from open_webui.models.knowledge import Knowledges
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
+from open_webui.retrieval.text_splitters import (
+    split_documents_by_character,
+    split_documents_by_markdown_header,
+    split_documents_by_token,
+)
 from open_webui.retrieval.utils import (
     get_content_from_url,
     get_embedding_function,
@@ -49,6 +52,7 @@ from open_webui.retrieval.utils import (
     query_doc_with_hybrid_search,
 )
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import VectorItem
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -190,6 +194,11 @@ async def get_status(request: Request):
     }
 
 
+@router.get("/warmup")
+async def get_warmup_status(request: Request, user=Depends(get_admin_user)):
+    return request.app.state.RAG_COLLECTION_WARMUP
+
+
 @router.get("/embedding")
 async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     return {
@@ -247,23 +256,24 @@ async def update_embedding_config(request: Request, form_data: EmbeddingModelUpd
     )
     unload_embedding_model(request)
     try:
-        request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.RAG_EMBEDDING_ENGINE
-        request.app.state.config.RAG_EMBEDDING_MODEL = form_data.RAG_EMBEDDING_MODEL
-        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = form_data.RAG_EMBEDDING_BATCH_SIZE
-        request.app.state.config.ENABLE_ASYNC_EMBEDDING = form_data.ENABLE_ASYNC_EMBEDDING
-
-        if request.app.state.config.RAG_EMBEDDING_ENGINE in [
-            "openai",
-            "azure_openai",
-        ]:
-            if form_data.openai_config is not None:
-                request.app.state.config.RAG_OPENAI_API_BASE_URL = form_data.openai_config.url
-                request.app.state.config.RAG_OPENAI_API_KEY = form_data.openai_config.key
-
-            if form_data.azure_openai_config is not None:
-                request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = form_data.azure_openai_config.url
-                request.app.state.config.RAG_AZURE_OPENAI_API_KEY = form_data.azure_openai_config.key
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = form_data.azure_openai_config.version
+        with request.app.state.config.batch():
+            request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.RAG_EMBEDDING_ENGINE
+            request.app.state.config.RAG_EMBEDDING_MODEL = form_data.RAG_EMBEDDING_MODEL
+            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = form_data.RAG_EMBEDDING_BATCH_SIZE
+            request.app.state.config.ENABLE_ASYNC_EMBEDDING = form_data.ENABLE_ASYNC_EMBEDDING
+
+            if request.app.state.config.RAG_EMBEDDING_ENGINE in [
+                "openai",
+                "azure_openai",
+            ]:
+                if form_data.openai_config is not None:
+                    request.app.state.config.RAG_OPENAI_API_BASE_URL = form_data.openai_config.url
+                    request.app.state.config.RAG_OPENAI_API_KEY = form_data.openai_config.key
+
+                if form_data.azure_openai_config is not None:
+                    request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = form_data.azure_openai_config.url
+                    request.app.state.config.RAG_AZURE_OPENAI_API_KEY = form_data.azure_openai_config.key
+                    request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = form_data.azure_openai_config.version
 
         request.app.state.ef = get_ef(
             request.app.state.config.RAG_EMBEDDING_ENGINE,
@@ -492,292 +502,312 @@ class ConfigForm(BaseModel):
 
 @router.post("/config/update")
 async def update_rag_config(request: Request, form_data: ConfigForm, user=Depends(get_admin_user)):
-    # RAG settings
-    request.app.state.config.RAG_TEMPLATE = (
-        form_data.RAG_TEMPLATE if form_data.RAG_TEMPLATE is not None else request.app.state.config.RAG_TEMPLATE
-    )
-    request.app.state.config.TOP_K = form_data.TOP_K if form_data.TOP_K is not None else request.app.state.config.TOP_K
-    request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL = (
-        form_data.BYPASS_EMBEDDING_AND_RETRIEVAL
-        if form_data.BYPASS_EMBEDDING_AND_RETRIEVAL is not None
-        else request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-    )
-    request.app.state.config.RAG_FULL_CONTEXT = (
-        form_data.RAG_FULL_CONTEXT
-        if form_data.RAG_FULL_CONTEXT is not None
-        else request.app.state.config.RAG_FULL_CONTEXT
-    )
-
-    # Hybrid search settings
-    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = (
-        form_data.ENABLE_RAG_HYBRID_SEARCH
-        if form_data.ENABLE_RAG_HYBRID_SEARCH is not None
-        else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
-    )
-    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = (
-        form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
-        if form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS is not None
-        else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
-    )
-
-    request.app.state.config.TOP_K_RERANKER = (
-        form_data.TOP_K_RERANKER if form_data.TOP_K_RERANKER is not None else request.app.state.config.TOP_K_RERANKER
-    )
-    request.app.state.config.RELEVANCE_THRESHOLD = (
-        form_data.RELEVANCE_THRESHOLD
-        if form_data.RELEVANCE_THRESHOLD is not None
-        else request.app.state.config.RELEVANCE_THRESHOLD
-    )
-    request.app.state.config.HYBRID_BM25_WEIGHT = (
-        form_data.HYBRID_BM25_WEIGHT
-        if form_data.HYBRID_BM25_WEIGHT is not None
-        else request.app.state.config.HYBRID_BM25_WEIGHT
-    )
+    with request.app.state.config.batch():
+        # RAG settings
+        request.app.state.config.RAG_TEMPLATE = (
+            form_data.RAG_TEMPLATE if form_data.RAG_TEMPLATE is not None else request.app.state.config.RAG_TEMPLATE
+        )
+        request.app.state.config.TOP_K = (
+            form_data.TOP_K if form_data.TOP_K is not None else request.app.state.config.TOP_K
+        )
+        request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL = (
+            form_data.BYPASS_EMBEDDING_AND_RETRIEVAL
+            if form_data.BYPASS_EMBEDDING_AND_RETRIEVAL is not None
+            else request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+        )
+        request.app.state.config.RAG_FULL_CONTEXT = (
+            form_data.RAG_FULL_CONTEXT
+            if form_data.RAG_FULL_CONTEXT is not None
+            else request.app.state.config.RAG_FULL_CONTEXT
+        )
 
-    # Content extraction settings
-    request.app.state.config.CONTENT_EXTRACTION_ENGINE = (
-        form_data.CONTENT_EXTRACTION_ENGINE
-        if form_data.CONTENT_EXTRACTION_ENGINE is not None
-        else request.app.state.config.CONTENT_EXTRACTION_ENGINE
-    )
-    request.app.state.config.PDF_EXTRACT_IMAGES = (
-        form_data.PDF_EXTRACT_IMAGES
-        if form_data.PDF_EXTRACT_IMAGES is not None
-        else request.app.state.config.PDF_EXTRACT_IMAGES
-    )
-    request.app.state.config.DATALAB_MARKER_API_KEY = (
-        form_data.DATALAB_MARKER_API_KEY
-        if form_data.DATALAB_MARKER_API_KEY is not None
-        else request.app.state.config.DATALAB_MARKER_API_KEY
-    )
-    request.app.state.config.DATALAB_MARKER_API_BASE_URL = (
-        form_data.DATALAB_MARKER_API_BASE_URL
-        if form_data.DATALAB_MARKER_API_BASE_URL is not None
-        else request.app.state.config.DATALAB_MARKER_API_BASE_URL
-    )
-    request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG = (
-        form_data.DATALAB_MARKER_ADDITIONAL_CONFIG
-        if form_data.DATALAB_MARKER_ADDITIONAL_CONFIG is not None
-        else request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG
-    )
-    request.app.state.config.DATALAB_MARKER_SKIP_CACHE = (
-        form_data.DATALAB_MARKER_SKIP_CACHE
-        if form_data.DATALAB_MARKER_SKIP_CACHE is not None
-        else request.app.state.config.DATALAB_MARKER_SKIP_CACHE
-    )
-    request.app.state.config.DATALAB_MARKER_FORCE_OCR = (
-        form_data.DATALAB_MARKER_FORCE_OCR
-        if form_data.DATALAB_MARKER_FORCE_OCR is not None
-        else request.app.state.config.DATALAB_MARKER_FORCE_OCR
-    )
-    request.app.state.config.DATALAB_MARKER_PAGINATE = (
-        form_data.DATALAB_MARKER_PAGINATE
-        if form_data.DATALAB_MARKER_PAGINATE is not None
-        else request.app.state.config.DATALAB_MARKER_PAGINATE
-    )
-    request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR = (
-        form_data.DATALAB_MARKER_STRIP_EXISTING_OCR
-        if form_data.DATALAB_MARKER_STRIP_EXISTING_OCR is not None
-        else request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR
-    )
-    request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION = (
-        form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
-        if form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION is not None
-        else request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
-    )
-    request.app.state.config.DATALAB_MARKER_FORMAT_LINES = (
-        form_data.DATALAB_MARKER_FORMAT_LINES
-        if form_data.DATALAB_MARKER_FORMAT_LINES is not None
-        else request.app.state.config.DATALAB_MARKER_FORMAT_LINES
-    )
-    request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT = (
-        form_data.DATALAB_MARKER_OUTPUT_FORMAT
-        if form_data.DATALAB_MARKER_OUTPUT_FORMAT is not None
-        else request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT
-    )
-    request.app.state.config.DATALAB_MARKER_USE_LLM = (
-        form_data.DATALAB_MARKER_USE_LLM
-        if form_data.DATALAB_MARKER_USE_LLM is not None
-        else request.app.state.config.DATALAB_MARKER_USE_LLM
-    )
-    request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL = (
-        form_data.EXTERNAL_DOCUMENT_LOADER_URL
-        if form_data.EXTERNAL_DOCUMENT_LOADER_URL is not None
-        else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL
-    )
-    request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY = (
-        form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY
-        if form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY is not None
-        else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY
-    )
-    request.app.state.config.TIKA_SERVER_URL = (
-        form_data.TIKA_SERVER_URL if form_data.TIKA_SERVER_URL is not None else request.app.state.config.TIKA_SERVER_URL
-    )
-    request.app.state.config.DOCLING_SERVER_URL = (
-        form_data.DOCLING_SERVER_URL
-        if form_data.DOCLING_SERVER_URL is not None
-        else request.app.state.config.DOCLING_SERVER_URL
-    )
-    request.app.state.config.DOCLING_API_KEY = (
-        form_data.DOCLING_API_KEY if form_data.DOCLING_API_KEY is not None else request.app.state.config.DOCLING_API_KEY
-    )
-    request.app.state.config.DOCLING_PARAMS = (
-        form_data.DOCLING_PARAMS if form_data.DOCLING_PARAMS is not None else request.app.state.config.DOCLING_PARAMS
-    )
-    request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT = (
-        form_data.DOCUMENT_INTELLIGENCE_ENDPOINT
-        if form_data.DOCUMENT_INTELLIGENCE_ENDPOINT is not None
-        else request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT
-    )
-    request.app.state.config.DOCUMENT_INTELLIGENCE_KEY = (
-        form_data.DOCUMENT_INTELLIGENCE_KEY
-        if form_data.DOCUMENT_INTELLIGENCE_KEY is not None
-        else request.app.state.config.DOCUMENT_INTELLIGENCE_KEY
-    )
+        # Hybrid search settings
+        request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = (
+            form_data.ENABLE_RAG_HYBRID_SEARCH
+            if form_data.ENABLE_RAG_HYBRID_SEARCH is not None
+            else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
+        )
+        request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = (
+            form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+            if form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS is not None
+            else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+        )
 
-    request.app.state.config.MISTRAL_OCR_API_BASE_URL = (
-        form_data.MISTRAL_OCR_API_BASE_URL
-        if form_data.MISTRAL_OCR_API_BASE_URL is not None
-        else request.app.state.config.MISTRAL_OCR_API_BASE_URL
-    )
-    request.app.state.config.MISTRAL_OCR_API_KEY = (
-        form_data.MISTRAL_OCR_API_KEY
-        if form_data.MISTRAL_OCR_API_KEY is not None
-        else request.app.state.config.MISTRAL_OCR_API_KEY
-    )
+        request.app.state.config.TOP_K_RERANKER = (
+            form_data.TOP_K_RERANKER
+            if form_data.TOP_K_RERANKER is not None
+            else request.app.state.config.TOP_K_RERANKER
+        )
+        request.app.state.config.RELEVANCE_THRESHOLD = (
+            form_data.RELEVANCE_THRESHOLD
+            if form_data.RELEVANCE_THRESHOLD is not None
+            else request.app.state.config.RELEVANCE_THRESHOLD
+        )
+        request.app.state.config.HYBRID_BM25_WEIGHT = (
+            form_data.HYBRID_BM25_WEIGHT
+            if form_data.HYBRID_BM25_WEIGHT is not None
+            else request.app.state.config.HYBRID_BM25_WEIGHT
+        )
 
-    # MinerU settings
-    request.app.state.config.MINERU_API_MODE = (
-        form_data.MINERU_API_MODE if form_data.MINERU_API_MODE is not None else request.app.state.config.MINERU_API_MODE
-    )
-    request.app.state.config.MINERU_API_URL = (
-        form_data.MINERU_API_URL if form_data.MINERU_API_URL is not None else request.app.state.config.MINERU_API_URL
-    )
-    request.app.state.config.MINERU_API_KEY = (
-        form_data.MINERU_API_KEY if form_data.MINERU_API_KEY is not None else request.app.state.config.MINERU_API_KEY
-    )
-    request.app.state.config.MINERU_PARAMS = (
-        form_data.MINERU_PARAMS if form_data.MINERU_PARAMS is not None else request.app.state.config.MINERU_PARAMS
-    )
+        # Content extraction settings
+        request.app.state.config.CONTENT_EXTRACTION_ENGINE = (
+            form_data.CONTENT_EXTRACTION_ENGINE
+            if form_data.CONTENT_EXTRACTION_ENGINE is not None
+            else request.app.state.config.CONTENT_EXTRACTION_ENGINE
+        )
+        request.app.state.config.PDF_EXTRACT_IMAGES = (
+            form_data.PDF_EXTRACT_IMAGES
+            if form_data.PDF_EXTRACT_IMAGES is not None
+            else request.app.state.config.PDF_EXTRACT_IMAGES
+        )
+        request.app.state.config.DATALAB_MARKER_API_KEY = (
+            form_data.DATALAB_MARKER_API_KEY
+            if form_data.DATALAB_MARKER_API_KEY is not None
+            else request.app.state.config.DATALAB_MARKER_API_KEY
+        )
+        request.app.state.config.DATALAB_MARKER_API_BASE_URL = (
+            form_data.DATALAB_MARKER_API_BASE_URL
+            if form_data.DATALAB_MARKER_API_BASE_URL is not None
+            else request.app.state.config.DATALAB_MARKER_API_BASE_URL
+        )
+        request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG = (
+            form_data.DATALAB_MARKER_ADDITIONAL_CONFIG
+            if form_data.DATALAB_MARKER_ADDITIONAL_CONFIG is not None
+            else request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG
+        )
+        request.app.state.config.DATALAB_MARKER_SKIP_CACHE = (
+            form_data.DATALAB_MARKER_SKIP_CACHE
+            if form_data.DATALAB_MARKER_SKIP_CACHE is not None
+            else request.app.state.config.DATALAB_MARKER_SKIP_CACHE
+        )
+        request.app.state.config.DATALAB_MARKER_FORCE_OCR = (
+            form_data.DATALAB_MARKER_FORCE_OCR
+            if form_data.DATALAB_MARKER_FORCE_OCR is not None
+            else request.app.state.config.DATALAB_MARKER_FORCE_OCR
+        )
+        request.app.state.config.DATALAB_MARKER_PAGINATE = (
+            form_data.DATALAB_MARKER_PAGINATE
+            if form_data.DATALAB_MARKER_PAGINATE is not None
+            else request.app.state.config.DATALAB_MARKER_PAGINATE
+        )
+        request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR = (
+            form_data.DATALAB_MARKER_STRIP_EXISTING_OCR
+            if form_data.DATALAB_MARKER_STRIP_EXISTING_OCR is not None
+            else request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR
+        )
+        request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION = (
+            form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
+            if form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION is not None
+            else request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
+        )
+        request.app.state.config.DATALAB_MARKER_FORMAT_LINES = (
+            form_data.DATALAB_MARKER_FORMAT_LINES
+            if form_data.DATALAB_MARKER_FORMAT_LINES is not None
+            else request.app.state.config.DATALAB_MARKER_FORMAT_LINES
+        )
+        request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT = (
+            form_data.DATALAB_MARKER_OUTPUT_FORMAT
+            if form_data.DATALAB_MARKER_OUTPUT_FORMAT is not None
+            else request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT
+        )
+        request.app.state.config.DATALAB_MARKER_USE_LLM = (
+            form_data.DATALAB_MARKER_USE_LLM
+            if form_data.DATALAB_MARKER_USE_LLM is not None
+            else request.app.state.config.DATALAB_MARKER_USE_LLM
+        )
+        request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL = (
+            form_data.EXTERNAL_DOCUMENT_LOADER_URL
+            if form_data.EXTERNAL_DOCUMENT_LOADER_URL is not None
+            else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL
+        )
+        request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY = (
+            form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY
+            if form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY is not None
+            else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY
+        )
+        request.app.state.config.TIKA_SERVER_URL = (
+            form_data.TIKA_SERVER_URL
+            if form_data.TIKA_SERVER_URL is not None
+            else request.app.state.config.TIKA_SERVER_URL
+        )
+        request.app.state.config.DOCLING_SERVER_URL = (
+            form_data.DOCLING_SERVER_URL
+            if form_data.DOCLING_SERVER_URL is not None
+            else request.app.state.config.DOCLING_SERVER_URL
+        )
+        request.app.state.config.DOCLING_API_KEY = (
+            form_data.DOCLING_API_KEY
+            if form_data.DOCLING_API_KEY is not None
+            else request.app.state.config.DOCLING_API_KEY
+        )
+        request.app.state.config.DOCLING_PARAMS = (
+            form_data.DOCLING_PARAMS
+            if form_data.DOCLING_PARAMS is not None
+            else request.app.state.config.DOCLING_PARAMS
+        )
+        request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT = (
+            form_data.DOCUMENT_INTELLIGENCE_ENDPOINT
+            if form_data.DOCUMENT_INTELLIGENCE_ENDPOINT is not None
+            else request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT
+        )
+        request.app.state.config.DOCUMENT_INTELLIGENCE_KEY = (
+            form_data.DOCUMENT_INTELLIGENCE_KEY
+            if form_data.DOCUMENT_INTELLIGENCE_KEY is not None
+            else request.app.state.config.DOCUMENT_INTELLIGENCE_KEY
+        )
 
-    # Reranking settings
-    if request.app.state.config.RAG_RERANKING_ENGINE == "":
-        # Unloading the internal reranker and clear VRAM memory
-        request.app.state.rf = None
-        request.app.state.RERANKING_FUNCTION = None
-        import gc
+        request.app.state.config.MISTRAL_OCR_API_BASE_URL = (
+            form_data.MISTRAL_OCR_API_BASE_URL
+            if form_data.MISTRAL_OCR_API_BASE_URL is not None
+            else request.app.state.config.MISTRAL_OCR_API_BASE_URL
+        )
+        request.app.state.config.MISTRAL_OCR_API_KEY = (
+            form_data.MISTRAL_OCR_API_KEY
+            if form_data.MISTRAL_OCR_API_KEY is not None
+            else request.app.state.config.MISTRAL_OCR_API_KEY
+        )
 
-        gc.collect()
-    request.app.state.config.RAG_RERANKING_ENGINE = (
-        form_data.RAG_RERANKING_ENGINE
-        if form_data.RAG_RERANKING_ENGINE is not None
-        else request.app.state.config.RAG_RERANKING_ENGINE
-    )
+        # MinerU settings
+        request.app.state.config.MINERU_API_MODE = (
+            form_data.MINERU_API_MODE
+            if form_data.MINERU_API_MODE is not None
+            else request.app.state.config.MINERU_API_MODE
+        )
+        request.app.state.config.MINERU_API_URL = (
+            form_data.MINERU_API_URL
+            if form_data.MINERU_API_URL is not None
+            else request.app.state.config.MINERU_API_URL
+        )
+        request.app.state.config.MINERU_API_KEY = (
+            form_data.MINERU_API_KEY
+            if form_data.MINERU_API_KEY is not None
+            else request.app.state.config.MINERU_API_KEY
+        )
+        request.app.state.config.MINERU_PARAMS = (
+            form_data.MINERU_PARAMS if form_data.MINERU_PARAMS is not None else request.app.state.config.MINERU_PARAMS
+        )
 
-    request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
-        form_data.RAG_EXTERNAL_RERANKER_URL
-        if form_data.RAG_EXTERNAL_RERANKER_URL is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
-    )
+        # Reranking settings
+        if request.app.state.config.RAG_RERANKING_ENGINE == "":
+            # Unloading the internal reranker and clear VRAM memory
+            request.app.state.rf = None
+            request.app.state.RERANKING_FUNCTION = None
+            import gc
+
+            gc.collect()
+        request.app.state.config.RAG_RERANKING_ENGINE = (
+            form_data.RAG_RERANKING_ENGINE
+            if form_data.RAG_RERANKING_ENGINE is not None
+            else request.app.state.config.RAG_RERANKING_ENGINE
+        )
 
-    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
-        form_data.RAG_EXTERNAL_RERANKER_API_KEY
-        if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
-    )
+        request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
+            form_data.RAG_EXTERNAL_RERANKER_URL
+            if form_data.RAG_EXTERNAL_RERANKER_URL is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
+        )
 
-    log.info(
-        f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} to {form_data.RAG_RERANKING_MODEL}"
-    )
-    try:
-        request.app.state.config.RAG_RERANKING_MODEL = (
-            form_data.RAG_RERANKING_MODEL
-            if form_data.RAG_RERANKING_MODEL is not None
-            else request.app.state.config.RAG_RERANKING_MODEL
+        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
+            form_data.RAG_EXTERNAL_RERANKER_API_KEY
+            if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
         )
 
+        log.info(
+            f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} "
+            f"to {form_data.RAG_RERANKING_MODEL}"
+        )
         try:
-            if (
-                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
-                and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-            ):
-                request.app.state.rf = get_rf(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-                    True,
-                )
+            request.app.state.config.RAG_RERANKING_MODEL = (
+                form_data.RAG_RERANKING_MODEL
+                if form_data.RAG_RERANKING_MODEL is not None
+                else request.app.state.config.RAG_RERANKING_MODEL
+            )
 
-                request.app.state.RERANKING_FUNCTION = get_reranking_function(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.rf,
-                )
+            try:
+                if (
+                    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
+                    and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                ):
+                    request.app.state.rf = get_rf(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+                        True,
+                    )
+
+                    request.app.state.RERANKING_FUNCTION = get_reranking_function(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.rf,
+                    )
+            except Exception as e:
+                log.error(f"Error loading reranking model: {e}")
+                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
         except Exception as e:
-            log.error(f"Error loading reranking model: {e}")
-            request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
-    except Exception as e:
-        log.exception(f"Problem updating reranking model: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ERROR_MESSAGES.DEFAULT(e),
+            log.exception(f"Problem updating reranking model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+
+        # Chunking settings
+        request.app.state.config.TEXT_SPLITTER = (
+            form_data.TEXT_SPLITTER if form_data.TEXT_SPLITTER is not None else request.app.state.config.TEXT_SPLITTER
+        )
+        request.app.state.config.CHUNK_SIZE = (
+            form_data.CHUNK_SIZE if form_data.CHUNK_SIZE is not None else request.app.state.config.CHUNK_SIZE
+        )
+        request.app.state.config.CHUNK_OVERLAP = (
+            form_data.CHUNK_OVERLAP if form_data.CHUNK_OVERLAP is not None else request.app.state.config.CHUNK_OVERLAP
         )
 
-    # Chunking settings
-    request.app.state.config.TEXT_SPLITTER = (
-        form_data.TEXT_SPLITTER if form_data.TEXT_SPLITTER is not None else request.app.state.config.TEXT_SPLITTER
-    )
-    request.app.state.config.CHUNK_SIZE = (
-        form_data.CHUNK_SIZE if form_data.CHUNK_SIZE is not None else request.app.state.config.CHUNK_SIZE
-    )
-    request.app.state.config.CHUNK_OVERLAP = (
-        form_data.CHUNK_OVERLAP if form_data.CHUNK_OVERLAP is not None else request.app.state.config.CHUNK_OVERLAP
-    )
+        # File upload settings
+        request.app.state.config.FILE_MAX_SIZE = form_data.FILE_MAX_SIZE
+        request.app.state.config.FILE_MAX_COUNT = form_data.FILE_MAX_COUNT
+        request.app.state.config.FILE_IMAGE_COMPRESSION_WIDTH = form_data.FILE_IMAGE_COMPRESSION_WIDTH
+        request.app.state.config.FILE_IMAGE_COMPRESSION_HEIGHT = form_data.FILE_IMAGE_COMPRESSION_HEIGHT
+        request.app.state.config.ALLOWED_FILE_EXTENSIONS = (
+            form_data.ALLOWED_FILE_EXTENSIONS
+            if form_data.ALLOWED_FILE_EXTENSIONS is not None
+            else request.app.state.config.ALLOWED_FILE_EXTENSIONS
+        )
 
-    # File upload settings
-    request.app.state.config.FILE_MAX_SIZE = form_data.FILE_MAX_SIZE
-    request.app.state.config.FILE_MAX_COUNT = form_data.FILE_MAX_COUNT
-    request.app.state.config.FILE_IMAGE_COMPRESSION_WIDTH = form_data.FILE_IMAGE_COMPRESSION_WIDTH
-    request.app.state.config.FILE_IMAGE_COMPRESSION_HEIGHT = form_data.FILE_IMAGE_COMPRESSION_HEIGHT
-    request.app.state.config.ALLOWED_FILE_EXTENSIONS = (
-        form_data.ALLOWED_FILE_EXTENSIONS
-        if form_data.ALLOWED_FILE_EXTENSIONS is not None
-        else request.app.state.config.ALLOWED_FILE_EXTENSIONS
-    )
+        # Integration settings
+        request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = (
+            form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION
+            if form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION is not None
+            else request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION
+        )
+        request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION = (
+            form_data.ENABLE_ONEDRIVE_INTEGRATION
+            if form_data.ENABLE_ONEDRIVE_INTEGRATION is not None
+            else request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION
+        )
 
-    # Integration settings
-    request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = (
-        form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION
-        if form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION is not None
-        else request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION
-    )
-    request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION = (
-        form_data.ENABLE_ONEDRIVE_INTEGRATION
-        if form_data.ENABLE_ONEDRIVE_INTEGRATION is not None
-        else request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION
-    )
+        if form_data.web is not None:
+            # Web search settings
+            request.app.state.config.WEB_SEARCH_TRUST_ENV = form_data.web.WEB_SEARCH_TRUST_ENV
+            request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = form_data.web.WEB_LOADER_CONCURRENT_REQUESTS
+            request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
+                form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
+            )
+            request.app.state.config.TAVILY_API_KEY = form_data.web.TAVILY_API_KEY
 
-    if form_data.web is not None:
-        # Web search settings
-        request.app.state.config.WEB_SEARCH_TRUST_ENV = form_data.web.WEB_SEARCH_TRUST_ENV
-        request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = form_data.web.WEB_LOADER_CONCURRENT_REQUESTS
-        request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
-            form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
-        )
-        request.app.state.config.TAVILY_API_KEY = form_data.web.TAVILY_API_KEY
-
-        # Web loader settings
-        request.app.state.config.WEB_LOADER_ENGINE = form_data.web.WEB_LOADER_ENGINE
-        request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION = form_data.web.ENABLE_WEB_LOADER_SSL_VERIFICATION
-        request.app.state.config.PLAYWRIGHT_WS_URL = form_data.web.PLAYWRIGHT_WS_URL
-        request.app.state.config.PLAYWRIGHT_TIMEOUT = form_data.web.PLAYWRIGHT_TIMEOUT
-        request.app.state.config.EXTERNAL_WEB_LOADER_URL = form_data.web.EXTERNAL_WEB_LOADER_URL
-        request.app.state.config.EXTERNAL_WEB_LOADER_API_KEY = form_data.web.EXTERNAL_WEB_LOADER_API_KEY
-        request.app.state.config.TAVILY_EXTRACT_DEPTH = form_data.web.TAVILY_EXTRACT_DEPTH
-        request.app.state.config.YOUTUBE_LOADER_LANGUAGE = form_data.web.YOUTUBE_LOADER_LANGUAGE
-        request.app.state.config.YOUTUBE_LOADER_PROXY_URL = form_data.web.YOUTUBE_LOADER_PROXY_URL
-        request.app.state.YOUTUBE_LOADER_TRANSLATION = form_data.web.YOUTUBE_LOADER_TRANSLATION
+            # Web loader settings
+            request.app.state.config.WEB_LOADER_ENGINE = form_data.web.WEB_LOADER_ENGINE
+            request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION = (
+                form_data.web.ENABLE_WEB_LOADER_SSL_VERIFICATION
+            )
+            request.app.state.config.PLAYWRIGHT_WS_URL = form_data.web.PLAYWRIGHT_WS_URL
+            request.app.state.config.PLAYWRIGHT_TIMEOUT = form_data.web.PLAYWRIGHT_TIMEOUT
+            request.app.state.config.EXTERNAL_WEB_LOADER_URL = form_data.web.EXTERNAL_WEB_LOADER_URL
+            request.app.state.config.EXTERNAL_WEB_LOADER_API_KEY = form_data.web.EXTERNAL_WEB_LOADER_API_KEY
+            request.app.state.config.TAVILY_EXTRACT_DEPTH = form_data.web.TAVILY_EXTRACT_DEPTH
+            request.app.state.config.YOUTUBE_LOADER_LANGUAGE = form_data.web.YOUTUBE_LOADER_LANGUAGE
+            request.app.state.config.YOUTUBE_LOADER_PROXY_URL = form_data.web.YOUTUBE_LOADER_PROXY_URL
+            request.app.state.YOUTUBE_LOADER_TRANSLATION = form_data.web.YOUTUBE_LOADER_TRANSLATION
 
     return {
         "status": True,
@@ -864,6 +894,115 @@ async def update_rag_config(request: Request, form_data: ConfigForm, user=Depend
 ####################################
 
 
+def get_document_embedding_config(request: Request) -> dict:
+    return {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+
+def get_document_splitter_config(request: Request) -> dict:
+    splitter_config = {
+        "splitter": request.app.state.config.TEXT_SPLITTER or "character",
+        "chunk_size": request.app.state.config.CHUNK_SIZE,
+        "chunk_overlap": request.app.state.config.CHUNK_OVERLAP,
+    }
+    if splitter_config["splitter"] == "token":
+        splitter_config["encoding"] = str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
+    return splitter_config
+
+
+def is_same_config(stored_config, embedding_config: dict) -> bool:
+    # Some backends (e.g. chroma) flatten nested metadata into its string representation
+    if isinstance(stored_config, str):
+        return stored_config == str(embedding_config)
+    return stored_config == embedding_config
+
+
+def copy_file_vectors_to_collection(
+    request: Request,
+    file: FileModel,
+    collection_name: str,
+    metadata: dict,
+    batch_size: int = 1000,
+    check_duplicate: bool = True,
+) -> bool:
+    """Copy the already embedded chunks of a file from its own collection into another one.
+
+    Returns False without writing anything when the file collection is missing, cannot return
+    its vectors, or was built from different content, with a different embedding model or with
+    different chunking settings, so that the caller can fall back to re-embedding the file.
+    With check_duplicate, raises DUPLICATE_CONTENT like save_docs_to_vector_db when the target
+    collection already holds chunks with the same hash.
+    """
+    source_collection_name = f"file-{file.id}"
+    if collection_name == source_collection_name:
+        return False
+
+    embedding_config = get_document_embedding_config(request)
+    splitter_config = get_document_splitter_config(request)
+
+    def is_reusable(item: VectorItem) -> bool:
+        return (
+            item.metadata.get("hash") == metadata.get("hash")
+            and is_same_config(item.metadata.get("embedding_config"), embedding_config)
+            # Chunks stored before the splitter config was recorded are never reused
+            and is_same_config(item.metadata.get("splitter_config"), splitter_config)
+        )
+
+    items = VECTOR_DB_CLIENT.get_vectors(
+        collection_name=source_collection_name,
+        filter={"file_id": file.id},
+        limit=batch_size,
+    )
+    if not items or not all(is_reusable(item) for item in items):
+        return False
+
+    if check_duplicate:
+        # Keep the same duplicate detection as save_docs_to_vector_db
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name,
+            filter={"hash": metadata["hash"]},
+        )
+        if result is not None and result.ids[0]:
+            log.info(f"Document with hash {metadata['hash']} already exists")
+            raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+    inserted_ids = []
+    offset = 0
+    while items:
+        if not all(is_reusable(item) for item in items):
+            # The source collection changed while copying, undo the partial copy
+            VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=inserted_ids)
+            return False
+
+        page = [
+            {
+                "id": str(uuid.uuid4()),
+                "text": item.text,
+                "vector": item.vector,
+                "metadata": {**item.metadata, **metadata},
+            }
+            for item in items
+        ]
+        VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=page)
+        inserted_ids.extend(item["id"] for item in page)
+
+        if len(items) < batch_size:
+            break
+
+        offset += batch_size
+        items = VECTOR_DB_CLIENT.get_vectors(
+            collection_name=source_collection_name,
+            filter={"file_id": file.id},
+            limit=batch_size,
+            offset=offset,
+        )
+
+    log.info(f"copied {len(inserted_ids)} items from {source_collection_name} to collection {collection_name}")
+    return True
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -907,67 +1046,31 @@ def save_docs_to_vector_db(
 
     if split:
         if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
+            docs = split_documents_by_character(
+                docs,
                 chunk_size=request.app.state.config.CHUNK_SIZE,
                 chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
+                workers=RAG_TEXT_SPLITTER_WORKERS,
             )
-            docs = text_splitter.split_documents(docs)
         elif request.app.state.config.TEXT_SPLITTER == "token":
             log.info(f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}")
 
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
+            docs = split_documents_by_token(
+                docs,
                 encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
                 chunk_size=request.app.state.config.CHUNK_SIZE,
                 chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
+                workers=RAG_TEXT_SPLITTER_WORKERS,
             )
-            docs = text_splitter.split_documents(docs)
         elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
             log.info("Using markdown header text splitter")
 
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
+            docs = split_documents_by_markdown_header(
+                docs,
+                chunk_size=request.app.state.config.CHUNK_SIZE,
+                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                workers=RAG_TEXT_SPLITTER_WORKERS,
             )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(split_chunk.metadata[header_meta_key_name])
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
         else:
             raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
 
@@ -979,10 +1082,8 @@ def save_docs_to_vector_db(
         {
             **doc.metadata,
             **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
+            "embedding_config": get_document_embedding_config(request),
+            **({"splitter_config": get_document_splitter_config(request)} if split else {}),
         }
         for doc in docs
     ]
@@ -1216,19 +1317,27 @@ def process_file(
                     "content": text_content,
                 }
             try:
-                result = save_docs_to_vector_db(
-                    request,
-                    docs=docs,
-                    collection_name=collection_name,
-                    metadata={
-                        "file_id": file.id,
-                        "name": file.filename,
-                        "hash": hash,
-                    },
-                    add=(True if form_data.collection_name else False),
-                    user=user,
-                )
-                log.info(f"added {len(docs)} items to collection {collection_name}")
+                metadata = {
+                    "file_id": file.id,
+                    "name": file.filename,
+                    "hash": hash,
+                }
+
+                result = False
+                if form_data.collection_name and not form_data.content:
+                    # The file was already embedded into its own collection, reuse those vectors
+                    result = copy_file_vectors_to_collection(request, file, collection_name, metadata)
+
+                if not result:
+                    result = save_docs_to_vector_db(
+                        request,
+                        docs=docs,
+                        collection_name=collection_name,
+                        metadata=metadata,
+                        add=(True if form_data.collection_name else False),
+                        user=user,
+                    )
+                    log.info(f"added {len(docs)} items to collection {collection_name}")
 
                 if result:
                     Files.update_file_metadata_by_id(
@@ -1566,6 +1675,7 @@ async def process_files_batch(
     file_results: list[BatchProcessFilesResult] = []
     file_errors: list[BatchProcessFilesResult] = []
     file_updates: list[FileUpdateForm] = []
+    copied_results: list[BatchProcessFilesResult] = []
 
     # Prepare all documents first
     all_docs: list[Document] = []
@@ -1573,6 +1683,25 @@ async def process_files_batch(
     for file in form_data.files:
         try:
             text_content = file.data.get("content", "")
+            hash = calculate_sha256_string(text_content)
+
+            # Files that were already embedded into their own collection are copied as-is
+            if await run_in_threadpool(
+                copy_file_vectors_to_collection,
+                request,
+                file,
+                collection_name,
+                {"file_id": file.id, "name": file.filename, "hash": hash},
+                # The batch flow saves without duplicate detection, so does its copy
+                check_duplicate=False,
+            ):
+                Files.update_file_by_id(
+                    id=file.id,
+                    form_data=FileUpdateForm(hash=hash, data={"content": text_content}),
+                )
+                copied_results.append(BatchProcessFilesResult(file_id=file.id, status="completed"))
+                continue
+
             docs: list[Document] = [
                 Document(
                     page_content=text_content.replace("<br/>", "\n"),
@@ -1590,7 +1719,7 @@ async def process_files_batch(
 
             file_updates.append(
                 FileUpdateForm(
-                    hash=calculate_sha256_string(text_content),
+                    hash=hash,
                     data={"content": text_content},
                 )
             )
@@ -1603,7 +1732,14 @@ async def process_files_batch(
     # Save all documents in one batch
     if all_docs:
         try:
-            await run_in_threadpool(save_docs_to_vector_db, request, all_docs, collection_name, True, user)
+            await run_in_threadpool(
+                save_docs_to_vector_db,
+                request,
+                all_docs,
+                collection_name,
+                add=True,
+                user=user,
+            )
 
             # Update all files with collection name
             for file_update, file_result in zip(file_updates, file_results):
@@ -1616,4 +1752,4 @@ async def process_files_batch(
                 file_result.status = "failed"
                 file_errors.append(BatchProcessFilesResult(file_id=file_result.file_id, error=str(e)))
 
-    return BatchProcessFilesResponse(results=file_results, errors=file_errors)
+    return BatchProcessFilesResponse(results=copied_results + file_results, errors=file_errors)
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from open_webui.config import (
     DEFAULT_AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE,
+    DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_EMOJI_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
@@ -18,6 +19,7 @@ from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.task import (
     autocomplete_generation_template,
+    combined_task_generation_template,
     emoji_generation_template,
     follow_up_generation_template,
     get_task_model_id,
@@ -56,6 +58,8 @@ async def get_task_config(request: Request, user=Depends(get_verified_user)):
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_TITLE_GENERATION": request.app.state.config.ENABLE_TITLE_GENERATION,
+        "ENABLE_COMBINED_TASK_GENERATION": request.app.state.config.ENABLE_COMBINED_TASK_GENERATION,
+        "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE": request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
         "TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE": request.app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
@@ -75,6 +79,8 @@ class TaskConfigForm(BaseModel):
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE: str
     ENABLE_FOLLOW_UP_GENERATION: bool
     ENABLE_TAGS_GENERATION: bool
+    ENABLE_COMBINED_TASK_GENERATION: bool | None = None
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE: str | None = None
     ENABLE_RETRIEVAL_QUERY_GENERATION: bool
     QUERY_GENERATION_PROMPT_TEMPLATE: str
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE: str
@@ -100,6 +106,15 @@ async def update_task_config(request: Request, form_data: TaskConfigForm, user=D
 
     request.app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE = form_data.TAGS_GENERATION_PROMPT_TEMPLATE
     request.app.state.config.ENABLE_TAGS_GENERATION = form_data.ENABLE_TAGS_GENERATION
+
+    # Only updated when sent, older clients do not know these settings
+    if form_data.ENABLE_COMBINED_TASK_GENERATION is not None:
+        request.app.state.config.ENABLE_COMBINED_TASK_GENERATION = form_data.ENABLE_COMBINED_TASK_GENERATION
+    if form_data.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE is not None:
+        request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = (
+            form_data.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+        )
+
     request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION = form_data.ENABLE_RETRIEVAL_QUERY_GENERATION
 
     request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE = form_data.QUERY_GENERATION_PROMPT_TEMPLATE
@@ -119,6 +134,8 @@ async def update_task_config(request: Request, form_data: TaskConfigForm, user=D
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE": request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+        "ENABLE_COMBINED_TASK_GENERATION": request.app.state.config.ENABLE_COMBINED_TASK_GENERATION,
+        "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE": request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
         "TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE": request.app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
@@ -319,6 +336,69 @@ async def generate_chat_tags(request: Request, form_data: dict, user=Depends(get
         )
 
 
+@router.post("/combined/completions")
+async def generate_combined_tasks(request: Request, form_data: dict, user=Depends(get_verified_user)):
+    if not request.app.state.config.ENABLE_COMBINED_TASK_GENERATION:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"detail": "Combined task generation is disabled"},
+        )
+
+    if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
+        models = {
+            request.state.model["id"]: request.state.model,
+        }
+    else:
+        models = request.app.state.MODELS
+
+    model_id = form_data["model"]
+    if model_id not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    # Check if the user has a custom task model
+    # If the user has a custom task model, use that model
+    task_model_id = get_task_model_id(
+        model_id,
+        request.app.state.config.TASK_MODEL,
+        request.app.state.config.TASK_MODEL_EXTERNAL,
+        models,
+    )
+
+    log.debug(f"generating {form_data['tasks']} using model {task_model_id} for user {user.email} ")
+
+    if request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE != "":
+        template = request.app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+    else:
+        template = DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+
+    content = combined_task_generation_template(template, form_data["messages"], form_data["tasks"], user)
+
+    payload = {
+        "model": task_model_id,
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "response_format": {"type": "json_object"},
+        "metadata": {
+            **(request.state.metadata if hasattr(request.state, "metadata") else {}),
+            "task": str(TASKS.COMBINED_GENERATION),
+            "task_body": form_data,
+            "chat_id": form_data.get("chat_id", None),
+        },
+    }
+
+    try:
+        return await generate_chat_completion(request, form_data=payload, user=user)
+    except Exception as e:
+        log.error(f"Error generating chat completion: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An internal error has occurred."},
+        )
+
+
 @router.post("/image_prompt/completions")
 async def generate_image_prompt(request: Request, form_data: dict, user=Depends(get_verified_user)):
     if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
@@ -3,6 +3,7 @@ import logging
 import random
 import sys
 import time
+import weakref
 
 import pycrdt as Y
 import socketio
@@ -10,6 +11,8 @@ from open_webui.config import (
     CORS_ALLOW_ORIGIN,
 )
 from open_webui.env import (
+    CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS,
+    CHAT_RESPONSE_STREAM_COALESCE_WINDOW,
     ENABLE_WEBSOCKET_SUPPORT,
     GLOBAL_LOG_LEVEL,
     REDIS_KEY_PREFIX,
@@ -37,6 +40,7 @@ from open_webui.utils.redis import (
     get_sentinel_url_from_env,
     get_sentinels_from_env,
 )
+from open_webui.utils.response_handling.coalescing import EventCoalescer
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -556,21 +560,37 @@ async def disconnect(sid):
         # print(f"Unknown session ID {sid} disconnected")
 
 
-def get_event_emitter(request_info, update_db=True):
-    async def __event_emitter__(event_data):
-        user_id = request_info["user_id"]
-        chat_id = request_info["chat_id"]
-        message_id = request_info["message_id"]
+# Coalescer of each message, shared by all of its emitters, so that an event sent through another
+# emitter, such as a cancel or an error, still flushes the pending content update first
+_event_coalescers: weakref.WeakValueDictionary[tuple, EventCoalescer] = weakref.WeakValueDictionary()
 
+
+def get_event_emitter(request_info, update_db=True):
+    async def emit(event_data):
         await sio.emit(
             "events",
             {
-                "chat_id": chat_id,
-                "message_id": message_id,
+                "chat_id": request_info["chat_id"],
+                "message_id": request_info["message_id"],
                 "data": event_data,
             },
-            room=f"user:{user_id}",
+            room=f"user:{request_info['user_id']}",
         )
+
+    # Streaming content updates are merged into one emit, and Redis publish, per time window
+    key = (request_info.get("user_id"), request_info.get("chat_id"), request_info.get("message_id"))
+    coalescer = _event_coalescers.get(key)
+    if coalescer is None:
+        coalescer = _event_coalescers[key] = EventCoalescer(
+            emit,
+            window=CHAT_RESPONSE_STREAM_COALESCE_WINDOW,
+            max_events=CHAT_RESPONSE_STREAM_COALESCE_MAX_EVENTS,
+        )
+
+    async def __event_emitter__(event_data):
+        message_id = request_info["message_id"]
+
+        await coalescer(event_data)
         if update_db and message_id and not request_info.get("chat_id", "").startswith("local:"):
             if "type" in event_data and event_data["type"] == "status":
                 Chats.add_message_status_to_chat_by_id_and_message_id(
@@ -0,0 +1 @@
+"""Tests for open_webui modules without a package of their own."""
@@ -0,0 +1,213 @@
+"""Tests for the invalidation of cached config values across workers."""
+
+import queue
+import threading
+import time
+
+import pytest
+
+import open_webui.config as config_module
+from open_webui.config import AppConfig
+
+
+class FakeRedis:
+    """The Redis commands used by AppConfig, shared by the workers of a test."""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.pipelines = 0
+        self.subscribers = []
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False):
+        with self._lock:
+            if nx and key in self.values:
+                return None
+            self.values[key] = str(value)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self.values.get(key, 0)) + 1
+            self.values[key] = str(value)
+            return value
+
+    def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.put({"type": "message", "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        self.redis.subscribers.append(self.messages)
+        self.messages.put({"type": "subscribe"})
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        self.redis.pipelines += 1
+        return [self.redis.get(key) for key in self.keys]
+
+
+class FakeConfigItem:
+    """Stands in for a PersistentConfig, without the database."""
+
+    def __init__(self, config_path: str, value) -> None:
+        self.config_path = config_path
+        self.value = value
+        self.saved_value = value
+
+    def save(self) -> None:
+        self.mark_saved()
+
+    def mark_saved(self) -> None:
+        self.saved_value = self.value
+
+
+def make_worker(redis: FakeRedis, listen: bool = True, poll_interval: float = 60) -> AppConfig:
+    config = AppConfig(poll_interval=poll_interval)
+    object.__setattr__(config, "_redis", redis)
+    object.__setattr__(config, "_redis_key_prefix", "test")
+    config._state.update({"MODEL": FakeConfigItem("task.model", "a"), "TOP_K": FakeConfigItem("rag.top_k", 3)})
+    if not listen:
+        # A listener that is never started, the worker only learns about changes by polling
+        object.__setattr__(config, "_listener", threading.Thread(target=lambda: None))
+    return config
+
+
+def wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.005)
+
+
+class TestAppConfigInvalidation:
+    """Test suite for the cross-worker invalidation of AppConfig."""
+
+    def test_change_of_another_worker_is_picked_up(self):
+        """Test that a change announced by another worker is read on the next access."""
+        redis = FakeRedis()
+        first, second = make_worker(redis), make_worker(redis, listen=False)
+        assert first.MODEL == "a"
+        wait_until(lambda: first._listening)
+        assert not first._stale
+
+        second.MODEL = "b"
+        wait_until(lambda: first._stale)
+
+        assert first.MODEL == "b"
+        assert first.snapshot().MODEL == "b"
+
+    def test_own_change_does_not_reload(self):
+        """Test that a worker does not reload the config after its own change."""
+        redis = FakeRedis()
+        worker = make_worker(redis)
+        assert worker.MODEL == "a"
+        wait_until(lambda: worker._listening)
+        pipelines = redis.pipelines
+
+        worker.MODEL = "b"
+        # Its own announcement marks the cache stale, the version shows nothing else changed
+        wait_until(lambda: worker._stale)
+
+        assert worker.MODEL == "b"
+        assert worker.TOP_K == 3
+        assert redis.pipelines == pipelines
+        assert worker._version == redis.values["test:config:version"]
+
+    def test_version_gap_forces_a_reload(self):
+        """Test that a change of another worker in between is read after the worker's own change."""
+        redis = FakeRedis()
+        first, second = make_worker(redis, listen=False), make_worker(redis, listen=False)
+        assert first.MODEL == "a"
+        assert second.MODEL == "a"
+
+        second.TOP_K = 5
+        # Without notifications, only the skipped version tells the first worker to reload
+        first.MODEL = "b"
+
+        assert first._stale
+        assert first.TOP_K == 5
+        assert first.MODEL == "b"
+
+    def test_polling_while_unsubscribed(self):
+        """Test that the version key is polled every poll interval while notifications are not received."""
+        redis = FakeRedis()
+        first, second = make_worker(redis, listen=False, poll_interval=0.05), make_worker(redis, listen=False)
+        assert first.TOP_K == 3
+
+        second.TOP_K = 5
+        # Within the poll interval the cached value is served
+        assert first.TOP_K == 3
+
+        time.sleep(0.06)
+        assert first.TOP_K == 5
+
+
+class TestAppConfigBatch:
+    """Test suite for AppConfig.batch."""
+
+    def test_batch_is_saved_and_shared_on_success(self, monkeypatch):
+        """Test that the values of a batch are saved in one transaction and shared once the batch completes."""
+        saved = []
+        monkeypatch.setattr(config_module, "save_config_items", saved.append)
+        redis = FakeRedis()
+        config, other = make_worker(redis, listen=False), make_worker(redis, listen=False)
+        assert other.MODEL == "a"
+
+        with config.batch():
+            config.MODEL = "b"
+            with config.batch():
+                config.TOP_K = 5
+            assert saved == []
+            assert redis.values.get("test:config:MODEL") is None
+
+        assert saved == [{"task.model": "b", "rag.top_k": 5}]
+        assert config._state["MODEL"].saved_value == "b"
+        assert redis.values["test:config:version"] == "2"
+        object.__setattr__(other, "_stale", True)
+        assert (other.MODEL, other.TOP_K) == ("b", 5)
+
+    def test_failed_batch_is_discarded(self, monkeypatch):
+        """Test that nothing of a batch that raised is saved or shared, and the previous values are restored."""
+        saved = []
+        monkeypatch.setattr(config_module, "save_config_items", saved.append)
+        redis = FakeRedis()
+        config = make_worker(redis, listen=False)
+        assert config.MODEL == "a"
+
+        with pytest.raises(ValueError), config.batch():
+            config.MODEL = "b"
+            config.TOP_K = 5
+            config.MODEL = "c"
+            raise ValueError("Invalid settings")
+
+        assert saved == []
+        assert (config.MODEL, config.TOP_K) == ("a", 3)
+        assert config._state["MODEL"].saved_value == "a"
+        assert "test:config:MODEL" not in redis.values
@@ -0,0 +1,98 @@
+"""Tests for reusing the vectors of a file collection when adding the file to a knowledge base."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import open_webui.routers.retrieval as retrieval_router
+from open_webui.models.files import FileModel
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+
+def make_request(**config) -> SimpleNamespace:
+    config = {
+        "RAG_EMBEDDING_ENGINE": "",
+        "RAG_EMBEDDING_MODEL": "sentence-transformers/all-MiniLM-L6-v2",
+        "TEXT_SPLITTER": "",
+        "CHUNK_SIZE": 1000,
+        "CHUNK_OVERLAP": 100,
+        "TIKTOKEN_ENCODING_NAME": "cl100k_base",
+        **config,
+    }
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=SimpleNamespace(**config))))
+
+
+def make_file() -> FileModel:
+    return FileModel(id="1", user_id="user", filename="notes.txt", created_at=0, updated_at=0)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch) -> LocalVectorClient:
+    client = LocalVectorClient(path=str(tmp_path))
+    monkeypatch.setattr(retrieval_router, "VECTOR_DB_CLIENT", client)
+
+    # The chunks as save_docs_to_vector_db stores them into the file collection
+    request = make_request()
+    metadata = {
+        "file_id": "1",
+        "name": "notes.txt",
+        "hash": "abc",
+        "embedding_config": retrieval_router.get_document_embedding_config(request),
+        "splitter_config": retrieval_router.get_document_splitter_config(request),
+    }
+    client.insert(
+        "file-1",
+        [
+            {"id": f"chunk-{idx}", "text": f"chunk {idx}", "vector": [1.0, float(idx)], "metadata": metadata}
+            for idx in range(3)
+        ],
+    )
+    return client
+
+
+def copied_texts(client: LocalVectorClient, collection_name: str) -> list[str] | None:
+    result = client.get(collection_name)
+    return None if result is None else sorted(result.documents[0])
+
+
+class TestCopyFileVectorsToCollection:
+    """Test suite for copy_file_vectors_to_collection."""
+
+    def test_copies_chunks_with_the_same_config(self, client):
+        """Test that the chunks are copied when the content, embedding and chunking settings match."""
+        metadata = {"file_id": "1", "name": "notes.txt", "hash": "abc"}
+
+        assert retrieval_router.copy_file_vectors_to_collection(make_request(), make_file(), "kb", metadata)
+        assert copied_texts(client, "kb") == ["chunk 0", "chunk 1", "chunk 2"]
+
+    @pytest.mark.parametrize(
+        "config",
+        [{"CHUNK_SIZE": 500}, {"CHUNK_OVERLAP": 0}, {"TEXT_SPLITTER": "token"}, {"RAG_EMBEDDING_MODEL": "other"}],
+    )
+    def test_changed_config_falls_back_to_embedding(self, client, config):
+        """Test that nothing is copied after a change of the chunking or embedding settings, e.g. on reindex."""
+        metadata = {"file_id": "1", "name": "notes.txt", "hash": "abc"}
+
+        assert not retrieval_router.copy_file_vectors_to_collection(make_request(**config), make_file(), "kb", metadata)
+        assert copied_texts(client, "kb") is None
+
+    def test_chunks_without_splitter_config_are_not_reused(self, client):
+        """Test that chunks stored before the splitter config was recorded are embedded again."""
+        item = client.get_vectors("file-1")[0]
+        metadata = {key: value for key, value in item.metadata.items() if key != "splitter_config"}
+        client.upsert("file-1", [{**item.model_dump(), "metadata": metadata}])
+        metadata = {"file_id": "1", "name": "notes.txt", "hash": "abc"}
+
+        assert not retrieval_router.copy_file_vectors_to_collection(make_request(), make_file(), "kb", metadata)
+
+    def test_duplicate_detection(self, client):
+        """Test that a second copy raises DUPLICATE_CONTENT, unless duplicate detection is off as in the batch flow."""
+        metadata = {"file_id": "1", "name": "notes.txt", "hash": "abc"}
+        request, file = make_request(), make_file()
+        assert retrieval_router.copy_file_vectors_to_collection(request, file, "kb", metadata)
+
+        with pytest.raises(ValueError, match="Duplicate content"):
+            retrieval_router.copy_file_vectors_to_collection(request, file, "kb", metadata)
+
+        assert retrieval_router.copy_file_vectors_to_collection(request, file, "kb", metadata, check_duplicate=False)
+        assert len(copied_texts(client, "kb")) == 6
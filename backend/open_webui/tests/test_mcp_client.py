@@ -0,0 +1,51 @@
+"""Tests for the MCP client."""
+
+import asyncio
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCMessage, JSONRPCRequest, JSONRPCResponse
+
+from open_webui.utils.mcp.client import MCPClient, RequestIdRecorder
+
+
+class TestMCPClient:
+    """Test suite for MCPClient."""
+
+    def test_stopped_tool_call_is_cancelled_with_the_id_it_was_sent_with(self):
+        """Test that cancelling a tool call tells the server the id of that request."""
+
+        async def run():
+            to_server, server_read = anyio.create_memory_object_stream(10)
+            server_write, from_server = anyio.create_memory_object_stream(10)
+            received: asyncio.Queue = asyncio.Queue()
+
+            async def serve():
+                async for message in server_read:
+                    received.put_nowait(message.message.root)
+                    if isinstance(message.message.root, JSONRPCRequest) and message.message.root.method == "ping":
+                        response = JSONRPCResponse(jsonrpc="2.0", id=message.message.root.id, result={})
+                        await server_write.send(SessionMessage(message=JSONRPCMessage(response)))
+
+            client = MCPClient()
+            async with ClientSession(from_server, RequestIdRecorder(to_server)) as session:
+                client.session = session
+                server = asyncio.create_task(serve())
+                await session.send_ping()
+                ping = await received.get()
+
+                # The server never answers the tool call
+                task = asyncio.create_task(client.call_tool("slow", {}))
+                call = await received.get()
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                cancelled = await received.get()
+                server.cancel()
+            return ping, call, cancelled
+
+        ping, call, cancelled = asyncio.run(run())
+        assert call.method == "tools/call"
+        assert call.id != ping.id
+        assert cancelled.method == "notifications/cancelled"
+        assert cancelled.params["requestId"] == call.id
@@ -0,0 +1,129 @@
+"""Tests for the pool of MCP client sessions."""
+
+import asyncio
+from typing import cast
+
+from open_webui.utils.mcp.pool import MCPSessionPool
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeClient:
+    """Stands in for MCPClient, the client doubles as its session to answer pings."""
+
+    def __init__(self, clients: list) -> None:
+        self.session = self
+        self.healthy = True
+        self.pings = 0
+        self.disconnected = False
+        clients.append(self)
+
+    async def connect(self, url: str, headers: dict | None = None) -> None:
+        # The handshake takes a moment, so that concurrent chats overlap
+        await asyncio.sleep(0.01)
+
+    async def disconnect(self) -> None:
+        self.disconnected = True
+
+    async def send_ping(self) -> None:
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("Session expired")
+
+
+def make_pool(**kwargs) -> tuple[MCPSessionPool, FakeClock, list[FakeClient]]:
+    clock, clients = FakeClock(), []
+    pool = MCPSessionPool(clock=clock, client_factory=lambda: FakeClient(clients), **kwargs)
+    return pool, clock, clients
+
+
+async def acquire(pool: MCPSessionPool, url: str) -> FakeClient:
+    # The pool hands out the fake clients of its factory
+    return cast("FakeClient", await pool.acquire(url))
+
+
+class TestMCPSessionPool:
+    """Test suite for MCPSessionPool."""
+
+    def test_concurrent_chats_share_one_handshake(self):
+        """Test that concurrent acquires share one session per server and identity."""
+
+        async def run():
+            pool, _, clients = make_pool(idle_timeout=60)
+            acquired = await asyncio.gather(
+                *(pool.acquire("http://mcp", {"Authorization": "Bearer a"}) for _ in range(5))
+            )
+            other = await pool.acquire("http://mcp", {"Authorization": "Bearer b"})
+            for client in [*acquired, other]:
+                await pool.release(client)
+            await pool.close()
+            return acquired, other, clients
+
+        acquired, other, clients = asyncio.run(run())
+        assert len(clients) == 2
+        assert all(client is acquired[0] for client in acquired)
+        assert other is not acquired[0]
+
+    def test_unhealthy_session_is_replaced(self):
+        """Test that a session idle past the health check interval is pinged and replaced if the ping fails."""
+
+        async def run():
+            pool, clock, clients = make_pool(idle_timeout=600, health_check_interval=30)
+            first = await acquire(pool, "http://mcp")
+            await pool.release(first)
+
+            # Used recently, reused without a ping
+            clock.now = 10
+            assert await acquire(pool, "http://mcp") is first
+            await pool.release(first)
+            assert first.pings == 0
+
+            clock.now = 100
+            assert await acquire(pool, "http://mcp") is first
+            await pool.release(first)
+            assert first.pings == 1
+
+            clock.now = 200
+            first.healthy = False
+            second = await acquire(pool, "http://mcp")
+            await pool.release(second)
+            await asyncio.sleep(0)
+            await pool.close()
+            return first, second, clients
+
+        first, second, clients = asyncio.run(run())
+        assert second is not first
+        assert first.disconnected
+        assert len(clients) == 2
+
+    def test_idle_sessions_are_closed_without_further_chats(self):
+        """Test that the periodic reaper closes idle sessions while nothing acquires one."""
+
+        async def run():
+            pool, clock, clients = make_pool(idle_timeout=60)
+            reaper = asyncio.create_task(pool.expire_idle_periodically(interval=0.01))
+
+            client = await acquire(pool, "http://mcp")
+            await asyncio.sleep(0.05)
+            in_use = client.disconnected
+
+            await pool.release(client)
+            await asyncio.sleep(0.05)
+            recently_used = client.disconnected
+
+            clock.now = 61
+            await asyncio.sleep(0.05)
+            reaper.cancel()
+            return client, in_use, recently_used, pool
+
+        client, in_use, recently_used, pool = asyncio.run(run())
+        assert not in_use
+        assert not recently_used
+        assert client.disconnected
+        assert pool._sessions == {}
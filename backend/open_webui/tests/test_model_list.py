@@ -0,0 +1,88 @@
+"""Tests for the model list fan-out, against the stand-in upstreams of the failover tests."""
+
+import asyncio
+from types import SimpleNamespace
+
+import open_webui.routers.openai as openai_router
+from open_webui.utils.http_clients import upstream_clients
+from open_webui.utils.upstreams import UpstreamHealth
+from open_webui.utils.upstreams.tests.test_routing import StandInUpstream
+
+
+def model_list_request() -> SimpleNamespace:
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(MODEL_REGISTRY=SimpleNamespace(model_lists={}))))
+
+
+async def closing_clients(coroutine):
+    # The shared session is bound to the event loop of the test, it must not outlive it
+    try:
+        return await coroutine
+    finally:
+        await upstream_clients.close()
+
+
+def model_ids(model_list: dict | None) -> list[str] | None:
+    return None if model_list is None else [model["id"] for model in model_list["data"]]
+
+
+class TestModelList:
+    """Test suite for get_model_list, against local stand-in upstreams."""
+
+    def test_deadline_serves_the_last_known_list(self, monkeypatch):
+        """Test that a slow connection is answered from its last known list, which the late request updates."""
+        monkeypatch.setattr(openai_router, "upstream_health", UpstreamHealth())
+
+        async def run():
+            request = model_list_request()
+            async with StandInUpstream("first") as upstream:
+                fresh = await openai_router.get_model_list(request, upstream.url)
+
+                upstream.name, upstream.delay = "second", 0.3
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                late = await openai_router.get_model_list(request, upstream.url, deadline=start + 0.05)
+                elapsed = loop.time() - start
+
+                await asyncio.sleep(0.5)
+                updated = request.app.state.MODEL_REGISTRY.model_lists[upstream.url]
+                return fresh, late, elapsed, updated
+
+        fresh, late, elapsed, updated = asyncio.run(closing_clients(run()))
+        assert model_ids(fresh) == ["first"]
+        assert model_ids(late) == ["first"]
+        assert elapsed < 0.2
+        assert model_ids(updated) == ["second"]
+
+    def test_error_responses_open_the_circuit_breaker(self, monkeypatch):
+        """Test that error payloads count as failures and an open breaker skips the connection."""
+        health = UpstreamHealth(failure_threshold=2, cooldown=60)
+        monkeypatch.setattr(openai_router, "upstream_health", health)
+
+        async def run():
+            request = model_list_request()
+            async with StandInUpstream("a") as upstream:
+                await openai_router.get_model_list(request, upstream.url)
+
+                upstream.status = 503
+                failed = [await openai_router.get_model_list(request, upstream.url) for _ in range(2)]
+                requests = upstream.requests
+
+                skipped = await openai_router.get_model_list(request, upstream.url)
+                return failed, requests, skipped, upstream.requests, health.state(upstream.url)
+
+        failed, requests, skipped, requests_after, state = asyncio.run(closing_clients(run()))
+        # Served from the last known list while failing
+        assert [model_ids(model_list) for model_list in failed] == [["a"], ["a"]]
+        assert state == "open"
+        assert model_ids(skipped) == ["a"]
+        assert requests_after == requests == 3
+
+    def test_error_response_without_a_last_known_list(self, monkeypatch):
+        """Test that the error payload is returned when there is no list to fall back to."""
+        monkeypatch.setattr(openai_router, "upstream_health", UpstreamHealth())
+
+        async def run():
+            async with StandInUpstream("a", status=500) as upstream:
+                return await openai_router.get_model_list(model_list_request(), upstream.url)
+
+        assert asyncio.run(closing_clients(run())) == {"error": {"message": "a failed"}}
@@ -0,0 +1,107 @@
+"""Tests for sharing model registry invalidations between workers."""
+
+import asyncio
+
+from open_webui.utils.models import ModelRegistry
+
+
+class FakeRedis:
+    """The Redis hash commands used by ModelRegistry, shared by the workers of a test."""
+
+    def __init__(self) -> None:
+        self.hashes = {}
+
+    async def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+        return int(values[field])
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class Upstream:
+    """Counts the fetches of the upstream model lists."""
+
+    def __init__(self) -> None:
+        self.fetches = 0
+
+    async def __call__(self) -> dict[str, dict]:
+        self.fetches += 1
+        return {"gpt-4o": {"id": "gpt-4o", "urlIdx": 0}}
+
+
+def make_worker(redis: FakeRedis, poll_interval: float = 0) -> ModelRegistry:
+    registry = ModelRegistry(poll_interval=poll_interval)
+    registry.redis = redis
+    return registry
+
+
+class TestModelRegistryInvalidation:
+    """Test suite for the cross-worker invalidation of ModelRegistry."""
+
+    def test_models_invalidation_reaches_other_workers(self):
+        """Test that the merged models of every worker are dropped, without fetching the upstream lists again."""
+
+        async def run():
+            redis, upstream = FakeRedis(), Upstream()
+            first, second = make_worker(redis), make_worker(redis)
+            for registry in (first, second):
+                await registry.get_openai_models(upstream)
+                registry.models = {"custom": {"id": "custom"}}
+
+            await first.invalidate()
+            await second.get_openai_models(upstream)
+            return first.models, second.models, upstream.fetches
+
+        assert asyncio.run(run()) == (None, None, 2)
+
+    def test_connections_invalidation_fetches_again_in_other_workers(self):
+        """Test that another worker fetches the upstream lists again instead of using outdated connection indexes."""
+
+        async def run():
+            redis, first_upstream, second_upstream = FakeRedis(), Upstream(), Upstream()
+            first, second = make_worker(redis), make_worker(redis)
+            await first.get_openai_models(first_upstream)
+            await second.get_openai_models(second_upstream)
+
+            await first.invalidate(connections=True)
+            await second.get_openai_models(second_upstream)
+            await second.get_openai_models(second_upstream)
+            return second_upstream.fetches
+
+        assert asyncio.run(run()) == 2
+
+    def test_own_invalidation_is_applied_once(self):
+        """Test that a worker does not invalidate again when it sees its own invalidation."""
+
+        async def run():
+            redis, upstream = FakeRedis(), Upstream()
+            registry = make_worker(redis)
+            await registry.get_openai_models(upstream)
+
+            await registry.invalidate(connections=True)
+            await registry.get_openai_models(upstream)
+            await registry.get_openai_models(upstream)
+            return upstream.fetches
+
+        assert asyncio.run(run()) == 2
+
+    def test_version_is_read_once_per_poll_interval(self):
+        """Test that invalidations of other workers are picked up after the poll interval."""
+
+        async def run():
+            redis, upstream = FakeRedis(), Upstream()
+            first, second = make_worker(redis), make_worker(redis, poll_interval=0.05)
+            await first.get_openai_models(upstream)
+            await second.get_openai_models(upstream)
+            second.models = {"custom": {"id": "custom"}}
+
+            await first.invalidate()
+            await second.sync()
+            within_interval = second.models
+            await asyncio.sleep(0.06)
+            await second.sync()
+            return within_interval, second.models
+
+        assert asyncio.run(run()) == ({"custom": {"id": "custom"}}, None)
@@ -0,0 +1,43 @@
+"""Tests for the ordering of coalesced socket events across emitters."""
+
+import asyncio
+
+import open_webui.socket.main as socket_main
+from open_webui.socket.main import get_event_emitter
+
+
+class TestEventEmitter:
+    """Test suite for get_event_emitter."""
+
+    def test_terminal_event_from_another_emitter_keeps_order(self, monkeypatch):
+        """Test that an error sent through a new emitter is emitted after the pending content update."""
+        emitted = []
+
+        async def emit(event, data, room=None):
+            emitted.append(data["data"])
+
+        monkeypatch.setattr(socket_main.sio, "emit", emit)
+        monkeypatch.setattr(socket_main, "CHAT_RESPONSE_STREAM_COALESCE_WINDOW", 10)
+
+        async def run():
+            request_info = {"user_id": "user", "chat_id": "chat", "message_id": "message"}
+            processing = get_event_emitter(request_info, update_db=False)
+            for token in ["Hel", "lo"]:
+                await processing({"type": "chat:message:delta", "data": {"content": token}})
+
+            # The cancel and error paths build an emitter of their own
+            await get_event_emitter(dict(request_info), update_db=False)(
+                {"type": "chat:message:error", "data": {"error": {"content": "Stopped"}}}
+            )
+
+            other = get_event_emitter({**request_info, "message_id": "other"}, update_db=False)
+            await other({"type": "chat:message:delta", "data": {"content": "x"}})
+            await other({"type": "chat:message:error", "data": {}})
+
+        asyncio.run(run())
+        assert emitted == [
+            {"type": "chat:message:delta", "data": {"content": "Hello"}},
+            {"type": "chat:message:error", "data": {"error": {"content": "Stopped"}}},
+            {"type": "chat:message:delta", "data": {"content": "x"}},
+            {"type": "chat:message:error", "data": {}},
+        ]
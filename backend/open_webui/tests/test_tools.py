@@ -0,0 +1,90 @@
+"""Tests for the concurrent execution of the tool calls of one assistant turn."""
+
+import asyncio
+import threading
+
+from open_webui.utils.tools import (
+    execute_tool_calls,
+    get_async_tool_function_and_apply_extra_params,
+    wait_for_tool_result,
+)
+
+
+class SlowTools:
+    """Fake tools that sleep for the given delay and track how many run at once."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+        self.finished = []
+
+    async def call(self, name: str, delay: float) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.running -= 1
+        self.finished.append(name)
+        return f"{name} result"
+
+
+class TestExecuteToolCalls:
+    """Test suite for execute_tool_calls and wait_for_tool_result."""
+
+    def test_results_are_in_call_order(self):
+        """Test that the results follow the tool calls even when the calls finish in reverse order."""
+        tools = SlowTools()
+        tool_calls = [("first", 0.06), ("second", 0.04), ("third", 0.02), ("fourth", 0.0)]
+
+        results = asyncio.run(execute_tool_calls(tool_calls, lambda tool_call: tools.call(*tool_call)))
+
+        assert tools.finished == ["fourth", "third", "second", "first"]
+        assert results == ["first result", "second result", "third result", "fourth result"]
+
+    def test_concurrency_limit(self):
+        """Test that no more than ``concurrency`` calls run at once, and all of them without a limit."""
+        limited = SlowTools()
+        tool_calls = [(f"tool {idx}", 0.01) for idx in range(10)]
+
+        results = asyncio.run(execute_tool_calls(tool_calls, lambda tool_call: limited.call(*tool_call), concurrency=3))
+        assert limited.max_running == 3
+        assert len(results) == 10
+
+        unlimited = SlowTools()
+        asyncio.run(execute_tool_calls(tool_calls, lambda tool_call: unlimited.call(*tool_call)))
+        assert unlimited.max_running == 10
+
+    def test_timeout_does_not_stop_the_other_calls(self):
+        """Test that a call that times out returns the timeout message while the others finish."""
+        tools = SlowTools()
+        tool_calls = [("fast", 0.01), ("stuck", 10), ("slow", 0.05)]
+
+        def execute(tool_call):
+            name, delay = tool_call
+            return wait_for_tool_result(tools.call(name, delay), name, timeout=0.2)
+
+        results = asyncio.run(execute_tool_calls(tool_calls, execute, concurrency=2))
+
+        assert results == ["fast result", "Tool stuck timed out after 0.2 seconds", "slow result"]
+        assert tools.finished == ["fast", "slow"]
+
+    def test_timeout_applies_to_sync_tools(self):
+        """Test that a blocking sync tool runs off the event loop, so that its call times out."""
+        released = threading.Event()
+
+        def blocking_tool(query: str, __user__: dict) -> str:
+            released.wait(timeout=5)
+            return f"{query} for {__user__['name']}"
+
+        tool = get_async_tool_function_and_apply_extra_params(blocking_tool, {"__user__": {"name": "user"}})
+
+        async def run():
+            try:
+                stuck = await wait_for_tool_result(tool(query="stuck"), "blocking_tool", timeout=0.05)
+            finally:
+                released.set()
+            done = await wait_for_tool_result(tool(query="done"), "blocking_tool", timeout=5)
+            return stuck, done
+
+        assert asyncio.run(run()) == ("Tool blocking_tool timed out after 0.05 seconds", "done for user")
@@ -0,0 +1,22 @@
+"""Admission control for chat completions.
+
+This module provides components for:
+- Global and per-user limits of the requests in flight
+- A bounded fair queue with a wait timeout and position reports
+"""
+
+from .controller import (
+    AdmissionController,
+    AdmissionError,
+    AdmissionStats,
+    AdmissionTicket,
+    chat_admission,
+)
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionError",
+    "AdmissionStats",
+    "AdmissionTicket",
+    "chat_admission",
+]
@@ -0,0 +1,220 @@
+"""Admission control for chat completions.
+
+Without a limit every chat completion request starts right away, so a
+burst from one user or API key can use up the upstream quotas, database
+connections and event loop time of everyone. Requests now take one of
+``max_in_flight`` slots, of which one user holds at most
+``max_in_flight_per_user``. Requests that do not get a slot wait in a
+bounded queue, for at most ``timeout`` seconds.
+
+The queue is served in order, but a waiting request of a user at their
+limit does not hold up the requests of other users behind it. Limits
+apply per worker process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from open_webui.env import (
+    CHAT_COMPLETION_MAX_IN_FLIGHT,
+    CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER,
+    CHAT_COMPLETION_MAX_QUEUED,
+    CHAT_COMPLETION_MAX_QUEUED_PER_USER,
+    CHAT_COMPLETION_QUEUE_TIMEOUT,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class AdmissionError(Exception):
+    """A request was not admitted, because the queue is full or it waited too long."""
+
+
+@dataclass
+class AdmissionStats:
+    """Counters of the admission controller, exported as metrics."""
+
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    # Total seconds requests waited in the queue before they were admitted
+    wait_time: float = 0.0
+
+
+class _Waiter:
+    def __init__(self, user_id: str) -> None:
+        self.user_id = user_id
+        self.admitted = False
+        self.wakeup: asyncio.Future | None = None
+
+    def wake(self) -> None:
+        if self.wakeup is not None and not self.wakeup.done():
+            self.wakeup.set_result(None)
+
+
+class AdmissionTicket:
+    """A slot taken by an admitted request.
+
+    The slot is returned by ``release``, or once the ticket is garbage
+    collected, e.g. with a streamed response that was never started.
+    """
+
+    def __init__(self, controller: AdmissionController, user_id: str, wait_time: float | None = None) -> None:
+        self.user_id = user_id
+        # Seconds waited in the queue, None if admitted right away
+        self.wait_time = wait_time
+        self._finalizer = weakref.finalize(self, controller._release, user_id)
+        self._finalizer.atexit = False
+
+    def release(self) -> None:
+        self._finalizer()
+
+    async def hold(self, iterator: AsyncIterator) -> AsyncIterator:
+        """Keep the slot until a streamed response ends."""
+        try:
+            async for item in iterator:
+                yield item
+        finally:
+            try:
+                # Not read to the end when the client disconnected, close the upstream request as well
+                if hasattr(iterator, "aclose"):
+                    await iterator.aclose()
+            finally:
+                self.release()
+
+
+class AdmissionController:
+    """Limits the requests in flight, globally and per user, with a fair queue."""
+
+    def __init__(
+        self,
+        max_in_flight: int | None = CHAT_COMPLETION_MAX_IN_FLIGHT,
+        max_in_flight_per_user: int | None = CHAT_COMPLETION_MAX_IN_FLIGHT_PER_USER,
+        max_queued: int | None = CHAT_COMPLETION_MAX_QUEUED,
+        max_queued_per_user: int | None = CHAT_COMPLETION_MAX_QUEUED_PER_USER,
+        timeout: float | None = CHAT_COMPLETION_QUEUE_TIMEOUT,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_user = max_in_flight_per_user
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self.timeout = timeout
+
+        self.in_flight = 0
+        self.stats = AdmissionStats()
+
+        self._in_flight_by_user: dict[str, int] = {}
+        self._queue: list[_Waiter] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _can_admit(self, user_id: str) -> bool:
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return False
+        if self.max_in_flight_per_user is not None:
+            return self._in_flight_by_user.get(user_id, 0) < self.max_in_flight_per_user
+        return True
+
+    def _take(self, user_id: str) -> None:
+        self.in_flight += 1
+        self._in_flight_by_user[user_id] = self._in_flight_by_user.get(user_id, 0) + 1
+        self.stats.admitted += 1
+
+    def _release(self, user_id: str) -> None:
+        self.in_flight -= 1
+        if self._in_flight_by_user[user_id] > 1:
+            self._in_flight_by_user[user_id] -= 1
+        else:
+            del self._in_flight_by_user[user_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Admit waiting requests in order, skipping the ones of users at their limit
+        admitted = False
+        for waiter in list(self._queue):
+            if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+                break
+            if self._can_admit(waiter.user_id):
+                self._queue.remove(waiter)
+                self._take(waiter.user_id)
+                waiter.admitted = True
+                waiter.wake()
+                admitted = True
+
+        if admitted:
+            # Positions in the queue changed
+            for waiter in self._queue:
+                waiter.wake()
+
+    async def acquire(
+        self,
+        user_id: str,
+        on_position: Callable[[int], Awaitable[None]] | None = None,
+    ) -> AdmissionTicket:
+        """Wait for a slot, reporting the position in the queue to ``on_position``.
+
+        Raises AdmissionError if the queue is full or the wait timed out.
+        """
+        if self._can_admit(user_id):
+            self._take(user_id)
+            return AdmissionTicket(self, user_id)
+
+        if (self.max_queued is not None and len(self._queue) >= self.max_queued) or (
+            self.max_queued_per_user is not None
+            and sum(waiter.user_id == user_id for waiter in self._queue) >= self.max_queued_per_user
+        ):
+            self.stats.rejected += 1
+            raise AdmissionError("Too many requests, please try again later")
+
+        waiter = _Waiter(user_id)
+        self._queue.append(waiter)
+        self.stats.queued += 1
+
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        deadline = None if self.timeout is None else loop.time() + self.timeout
+        position = None
+        try:
+            while not waiter.admitted:
+                if on_position is not None and self._queue.index(waiter) + 1 != position:
+                    position = self._queue.index(waiter) + 1
+                    try:
+                        await on_position(position)
+                    except Exception as e:
+                        log.debug(f"Error reporting the queue position: {e}")
+                    continue
+
+                timeout = None if deadline is None else deadline - loop.time()
+                if timeout is not None and timeout <= 0:
+                    self.stats.timed_out += 1
+                    raise AdmissionError("Timed out waiting for the other requests, please try again later")
+
+                waiter.wakeup = loop.create_future()
+                await asyncio.wait({waiter.wakeup}, timeout=timeout)
+        except BaseException:
+            if waiter.admitted:
+                # Admitted while being cancelled
+                self._release(user_id)
+            else:
+                self._queue.remove(waiter)
+                for other in self._queue:
+                    other.wake()
+            raise
+
+        wait_time = time.monotonic() - start
+        self.stats.wait_time += wait_time
+        return AdmissionTicket(self, user_id, wait_time)
+
+
+chat_admission = AdmissionController()
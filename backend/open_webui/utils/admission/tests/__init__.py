@@ -0,0 +1 @@
+"""Tests for admission module."""
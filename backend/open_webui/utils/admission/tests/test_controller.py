@@ -0,0 +1,162 @@
+"""Tests for the admission controller."""
+
+import asyncio
+import gc
+
+import pytest
+from open_webui.utils.admission import AdmissionController, AdmissionError
+
+
+class TestAdmissionController:
+    """Test suite for AdmissionController."""
+
+    def test_per_user_limit_does_not_block_other_users(self):
+        """Test that a user at their limit waits while other users behind them are admitted."""
+
+        async def run():
+            controller = AdmissionController(max_in_flight=2, max_in_flight_per_user=1)
+            first = await controller.acquire("a")
+            order = []
+
+            async def request(user_id):
+                ticket = await controller.acquire(user_id)
+                order.append(user_id)
+                return ticket
+
+            queued_a = asyncio.create_task(request("a"))
+            await asyncio.sleep(0)
+            # "b" is admitted right away, although "a" is waiting in front of it
+            ticket_b = await request("b")
+            assert controller.queue_depth == 1
+
+            first.release()
+            await queued_a
+            ticket_b.release()
+            return order, controller.in_flight
+
+        assert asyncio.run(run()) == (["b", "a"], 1)
+
+    def test_queue_is_served_in_order_and_reports_positions(self):
+        """Test that waiting requests are admitted first in, first out with their positions reported."""
+
+        async def run():
+            controller = AdmissionController(max_in_flight=1)
+            holder = await controller.acquire("x")
+            positions = {}
+            order = []
+
+            async def request(user_id):
+                async def on_position(position):
+                    positions.setdefault(user_id, []).append(position)
+
+                ticket = await controller.acquire(user_id, on_position=on_position)
+                order.append(user_id)
+                await asyncio.sleep(0.01)
+                ticket.release()
+                return ticket.wait_time
+
+            waiting = [asyncio.create_task(request(user_id)) for user_id in ["a", "b", "c"]]
+            await asyncio.sleep(0.01)
+            holder.release()
+            wait_times = await asyncio.gather(*waiting)
+            return order, positions, wait_times, controller.stats
+
+        order, positions, wait_times, stats = asyncio.run(run())
+        assert order == ["a", "b", "c"]
+        assert positions == {"a": [1], "b": [2, 1], "c": [3, 2, 1]}
+        assert all(wait_time > 0 for wait_time in wait_times)
+        assert (stats.admitted, stats.queued) == (4, 3)
+
+    def test_queue_bounds_and_timeout(self):
+        """Test that a full queue rejects requests and that waiting requests time out."""
+
+        async def run():
+            controller = AdmissionController(max_in_flight=1, max_queued=1, timeout=0.05)
+            holder = await controller.acquire("a")
+            waiting = asyncio.create_task(controller.acquire("b"))
+            await asyncio.sleep(0)
+
+            with pytest.raises(AdmissionError):
+                await controller.acquire("c")
+            with pytest.raises(AdmissionError):
+                await waiting
+            holder.release()
+            return controller.queue_depth, controller.stats
+
+        queue_depth, stats = asyncio.run(run())
+        assert queue_depth == 0
+        assert (stats.rejected, stats.timed_out) == (1, 1)
+
+    def test_cancelled_and_dropped_tickets_release_their_slot(self):
+        """Test that cancelled waiters leave the queue and unreleased tickets are released when dropped."""
+
+        async def run():
+            controller = AdmissionController(max_in_flight=1)
+            ticket = await controller.acquire("a")
+            waiting = asyncio.create_task(controller.acquire("b"))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            assert controller.queue_depth == 0
+
+            # A streamed response that was never started
+            stream = ticket.hold(iter_items())
+            del ticket, stream
+            gc.collect()
+            return controller.in_flight
+
+        async def iter_items():
+            yield "item"
+
+        assert asyncio.run(run()) == 0
+
+    def test_burst_of_one_user_does_not_queue_other_users(self):
+        """Test that other users are admitted ahead of a burst of one user, which is served in order."""
+
+        async def run():
+            controller = AdmissionController(max_in_flight=4, max_in_flight_per_user=2, timeout=None)
+            order = []
+
+            async def request(user_id, index):
+                ticket = await controller.acquire(user_id)
+                order.append((user_id, index))
+                return ticket
+
+            burst = [asyncio.create_task(request("burst", index)) for index in range(6)]
+            await asyncio.sleep(0)
+            assert (controller.in_flight, controller.queue_depth) == (2, 4)
+
+            # Other users take the free slots, then queue behind the burst
+            others = [await request(f"user{index}", 0) for index in range(2)]
+            late = asyncio.create_task(request("user2", 0))
+            await asyncio.sleep(0)
+            assert (controller.in_flight, controller.queue_depth) == (4, 5)
+
+            # The burst is at its limit, so a free slot goes to the last request in the queue
+            others[0].release()
+            others.append(await late)
+            assert (controller.in_flight, controller.queue_depth) == (4, 4)
+
+            for ticket in others[1:]:
+                ticket.release()
+            assert (controller.in_flight, controller.queue_depth) == (2, 4)
+
+            # Slots freed by the burst go to the burst, first in, first out
+            for task in burst:
+                (await task).release()
+            return order, controller.in_flight, controller.stats
+
+        order, in_flight, stats = asyncio.run(run())
+        assert order == [
+            ("burst", 0),
+            ("burst", 1),
+            ("user0", 0),
+            ("user1", 0),
+            ("user2", 0),
+            ("burst", 2),
+            ("burst", 3),
+            ("burst", 4),
+            ("burst", 5),
+        ]
+        assert in_flight == 0
+        assert (stats.admitted, stats.queued, stats.rejected) == (9, 5, 0)
@@ -16,6 +16,7 @@ from open_webui.socket.main import (
     sio,
 )
 from open_webui.utils.models import check_model_access, get_all_models
+from open_webui.utils.response_handling import ChunkStreamingResponse, SSEChunk, aclose_stream
 from starlette.responses import StreamingResponse
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -179,13 +180,31 @@ async def generate_chat_completion(
         form_data["model"] = selected_model_id
 
         if form_data.get("stream") == True:
+            response = await generate_chat_completion(request, form_data, user, bypass_filter=True)
+
+            if isinstance(response, ChunkStreamingResponse):
+
+                async def chunk_wrapper(chunks):
+                    try:
+                        yield SSEChunk(data={"selected_model_id": selected_model_id})
+                        async for chunk in chunks:
+                            yield chunk
+                    finally:
+                        await aclose_stream(chunks)
+
+                return ChunkStreamingResponse(
+                    chunk_wrapper(response.chunk_iterator),
+                    background=response.background,
+                )
 
             async def stream_wrapper(stream):
-                yield f"data: {json.dumps({'selected_model_id': selected_model_id})}\n\n"
-                async for chunk in stream:
-                    yield chunk
+                try:
+                    yield f"data: {json.dumps({'selected_model_id': selected_model_id})}\n\n"
+                    async for chunk in stream:
+                        yield chunk
+                finally:
+                    await aclose_stream(stream)
 
-            response = await generate_chat_completion(request, form_data, user, bypass_filter=True)
             return StreamingResponse(
                 stream_wrapper(response.body_iterator),
                 media_type="text/event-stream",
@@ -0,0 +1,25 @@
+"""Cache of deterministic chat completions.
+
+This module provides components for:
+- Canonical request hashing
+- A local LRU or Redis store with a TTL and size limits
+- Assembling streamed completions and replaying cached ones as a stream
+"""
+
+from .cache import (
+    CompletionCache,
+    CompletionCacheStats,
+    StreamedCompletion,
+    completion_cache,
+    completion_cache_key,
+    completion_chunks,
+)
+
+__all__ = [
+    "CompletionCache",
+    "CompletionCacheStats",
+    "StreamedCompletion",
+    "completion_cache",
+    "completion_cache_key",
+    "completion_chunks",
+]
@@ -0,0 +1,268 @@
+"""Cache of deterministic chat completions.
+
+Task model calls (titles, tags, queries, autocompletion) and API clients
+with ``temperature=0`` often send the same request many times. For the
+models listed in ``COMPLETION_CACHE_MODELS`` such requests are answered
+from the cache instead of going upstream. Requests are keyed by a hash of
+everything that affects the completion: the model, the messages, the
+tools and the sampling parameters.
+
+Completions are stored as a ``chat.completion`` object, however they were
+requested, so a streamed completion answers a non-streamed request and
+the other way around. Cache hits for streaming requests are replayed as
+chunks.
+
+Entries are kept in a local LRU of ``max_entries`` entries, or in Redis
+when shared between workers, where they are only bounded by their TTL and
+the memory policy of Redis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from open_webui.env import (
+    COMPLETION_CACHE_MAX_ENTRIES,
+    COMPLETION_CACHE_MAX_ENTRY_SIZE,
+    COMPLETION_CACHE_MODELS,
+    COMPLETION_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["OPENAI"])
+
+# Fields of a request that do not change its completion
+_IGNORED_FIELDS = {"stream", "stream_options"}
+
+
+def completion_cache_key(payload: dict) -> str:
+    """Hash of a chat completion request, equal for requests with the same completion."""
+    fields = {key: value for key, value in payload.items() if key not in _IGNORED_FIELDS}
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class StreamedCompletion:
+    """Assembles the chunks of a streamed chat completion into a ``chat.completion`` object."""
+
+    def __init__(self) -> None:
+        self.failed = False
+        self._completion: dict | None = None
+        self._choices: dict[int, dict] = {}
+        self._usage: dict | None = None
+
+    def add(self, chunk: Any) -> None:
+        if not isinstance(chunk, dict) or "error" in chunk:
+            self.failed = True
+            return
+
+        if self._completion is None:
+            self._completion = {
+                key: chunk[key] for key in ("id", "created", "model", "system_fingerprint") if key in chunk
+            }
+        if chunk.get("usage"):
+            self._usage = chunk["usage"]
+
+        for choice in chunk.get("choices") or []:
+            state = self._choices.setdefault(
+                choice.get("index", 0),
+                {"message": {"role": "assistant"}, "tool_calls": {}, "finish_reason": None},
+            )
+            message = state["message"]
+            for key, value in (choice.get("delta") or {}).items():
+                if key == "tool_calls":
+                    for tool_call in value or []:
+                        self._add_tool_call(state["tool_calls"], tool_call)
+                elif isinstance(value, str) and key != "role":
+                    message[key] = message.get(key, "") + value
+                elif value is not None:
+                    message[key] = value
+            if choice.get("finish_reason"):
+                state["finish_reason"] = choice["finish_reason"]
+
+    @staticmethod
+    def _add_tool_call(tool_calls: dict[int, dict], delta: dict) -> None:
+        # Deltas without an index start a new tool call
+        index = delta.get("index")
+        tool_call = tool_calls.setdefault(
+            len(tool_calls) if index is None else index,
+            {"id": "", "type": "function", "names": [], "arguments": []},
+        )
+        if delta.get("id"):
+            tool_call["id"] = delta["id"]
+        if delta.get("type"):
+            tool_call["type"] = delta["type"]
+        # Fragments are joined once the stream finished
+        function = delta.get("function") or {}
+        if function.get("name"):
+            tool_call["names"].append(function["name"])
+        if function.get("arguments"):
+            tool_call["arguments"].append(function["arguments"])
+
+    def completion(self) -> dict | None:
+        """The assembled completion, None if the stream failed or did not finish."""
+        if self.failed or self._completion is None or not self._choices:
+            return None
+        if any(state["finish_reason"] is None for state in self._choices.values()):
+            return None
+
+        choices = []
+        for index, state in sorted(self._choices.items()):
+            message = state["message"]
+            message.setdefault("content", None)
+            if state["tool_calls"]:
+                message["tool_calls"] = [
+                    {
+                        "id": tool_call["id"],
+                        "type": tool_call["type"],
+                        "function": {"name": "".join(tool_call["names"]), "arguments": "".join(tool_call["arguments"])},
+                    }
+                    for _, tool_call in sorted(state["tool_calls"].items())
+                ]
+            choices.append({"index": index, "message": message, "finish_reason": state["finish_reason"]})
+
+        return {
+            **self._completion,
+            "object": "chat.completion",
+            "choices": choices,
+            **({"usage": self._usage} if self._usage else {}),
+        }
+
+
+def completion_chunks(completion: dict) -> list[dict]:
+    """Chunks replaying a ``chat.completion`` object as a stream."""
+    base = {key: completion[key] for key in ("id", "created", "model", "system_fingerprint") if key in completion}
+    base["object"] = "chat.completion.chunk"
+
+    chunks = []
+    for choice in completion.get("choices", []):
+        delta = {key: value for key, value in (choice.get("message") or {}).items() if value is not None}
+        if "tool_calls" in delta:
+            delta["tool_calls"] = [{"index": index, **tool_call} for index, tool_call in enumerate(delta["tool_calls"])]
+        chunks.append({**base, "choices": [{"index": choice.get("index", 0), "delta": delta, "finish_reason": None}]})
+        chunks.append(
+            {
+                **base,
+                "choices": [
+                    {"index": choice.get("index", 0), "delta": {}, "finish_reason": choice.get("finish_reason")}
+                ],
+            }
+        )
+
+    if completion.get("usage"):
+        chunks.append({**base, "choices": [], "usage": completion["usage"]})
+    return chunks
+
+
+@dataclass
+class CompletionCacheStats:
+    """Counters of the completion cache, exported as metrics."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CompletionCache:
+    """Completions of deterministic requests, kept for ``ttl`` seconds.
+
+    Entries are stored in Redis once ``redis`` is set, or in a local LRU
+    otherwise. Redis errors are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[str] = COMPLETION_CACHE_MODELS,
+        ttl: int = COMPLETION_CACHE_TTL,
+        max_entries: int = COMPLETION_CACHE_MAX_ENTRIES,
+        max_entry_size: int = COMPLETION_CACHE_MAX_ENTRY_SIZE,
+        redis: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.models = set(models)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_entry_size = max_entry_size
+        self.redis = redis
+        self.clock = clock
+
+        self.stats = CompletionCacheStats()
+
+        # Serialized completions with their expiry time by key, least recently used first
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, model_ids: Iterable[str], payload: dict, metadata: dict | None = None) -> bool:
+        """Whether a request is for a cached model and expected to always get the same completion."""
+        if not self.models or not ("*" in self.models or any(model_id in self.models for model_id in model_ids)):
+            return False
+        return payload.get("temperature") == 0 or bool((metadata or {}).get("task"))
+
+    async def get(self, key: str) -> dict | None:
+        value = None
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self._redis_key(key))
+            except Exception as e:
+                log.warning(f"Error reading the completion cache: {e}")
+        else:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    value = entry[1]
+                else:
+                    del self._entries[key]
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, completion: dict) -> None:
+        value = json.dumps(completion, separators=(",", ":"), ensure_ascii=False)
+        if len(value.encode()) > self.max_entry_size:
+            return
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(self._redis_key(key), value, ex=self.ttl)
+            except Exception as e:
+                log.warning(f"Error writing the completion cache: {e}")
+                return
+        else:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        self.stats.stores += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:completion_cache:{key}"
+
+
+completion_cache = CompletionCache()
@@ -0,0 +1 @@
+"""Tests for completion_cache module."""
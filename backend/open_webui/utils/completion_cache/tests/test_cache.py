@@ -0,0 +1,220 @@
+"""Tests for the completion cache."""
+
+import asyncio
+
+from open_webui.utils.completion_cache import (
+    CompletionCache,
+    StreamedCompletion,
+    completion_cache_key,
+    completion_chunks,
+)
+
+
+def make_completion(content: str = "Hello") -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "object": "chat.completion",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+    }
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.values = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("Redis is down")
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("Redis is down")
+        self.values[key] = value
+        self.expiry[key] = ex
+
+
+class TestCompletionCache:
+    """Test suite for CompletionCache and the stream helpers."""
+
+    def test_key_is_canonical(self):
+        """Test that the key ignores field order and streaming, but not the sampling parameters."""
+        payload = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}], "temperature": 0}
+        reordered = {"temperature": 0, "messages": [{"content": "Hi", "role": "user"}], "model": "gpt-4o"}
+
+        assert completion_cache_key(payload) == completion_cache_key(reordered)
+        assert completion_cache_key(payload) == completion_cache_key({**payload, "stream_options": {}})
+        assert completion_cache_key(payload) != completion_cache_key({**payload, "temperature": 0.5})
+        assert completion_cache_key(payload) != completion_cache_key({**payload, "tools": [{"type": "function"}]})
+
+    def test_only_deterministic_requests_of_enabled_models_are_cacheable(self):
+        """Test the per-model enablement and the deterministic request check."""
+        cache = CompletionCache(models=["task-model"])
+
+        assert cache.is_cacheable(["task-model"], {"temperature": 0})
+        assert cache.is_cacheable(["task-model"], {}, {"task": "title_generation"})
+        assert not cache.is_cacheable(["task-model"], {"temperature": 0.7})
+        assert not cache.is_cacheable(["other-model"], {"temperature": 0})
+        assert CompletionCache(models=["*"]).is_cacheable(["other-model"], {"temperature": 0})
+        assert not CompletionCache(models=[]).is_cacheable(["task-model"], {"temperature": 0})
+
+    def test_lru_eviction_ttl_and_size_limit(self):
+        """Test that entries are evicted least recently used first, expire, and are bounded in size."""
+
+        async def run():
+            clock = FakeClock()
+            cache = CompletionCache(models=["*"], ttl=60, max_entries=2, max_entry_size=1000, clock=clock)
+            await cache.set("a", make_completion("a"))
+            await cache.set("b", make_completion("b"))
+            assert await cache.get("a") == make_completion("a")
+
+            # "b" is the least recently used entry
+            await cache.set("c", make_completion("c"))
+            assert await cache.get("b") is None
+
+            await cache.set("large", make_completion("x" * 2000))
+
+            clock.now = 61
+            expired = await cache.get("a")
+            return cache, expired
+
+        cache, expired = asyncio.run(run())
+        assert expired is None
+        assert cache.size == 1
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.stores, cache.stats.evictions) == (1, 2, 3, 1)
+        assert cache.stats.hit_rate == 1 / 3
+
+    def test_streamed_completion_round_trip(self):
+        """Test that a streamed completion is assembled and replayed as equivalent chunks."""
+        base = {"id": "chatcmpl-1", "created": 1700000000, "model": "gpt-4o", "object": "chat.completion.chunk"}
+        chunks = [
+            {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]},
+            {**base, "choices": [{"index": 0, "delta": {"content": "Let me check"}, "finish_reason": None}]},
+            {
+                **base,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {
+                            "tool_calls": [
+                                {"index": 0, "id": "call_1", "type": "function", "function": {"name": "weather"}}
+                            ]
+                        },
+                        "finish_reason": None,
+                    }
+                ],
+            },
+            {
+                **base,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"tool_calls": [{"index": 0, "function": {"arguments": '{"city": "Paris"}'}}]},
+                        "finish_reason": None,
+                    }
+                ],
+            },
+            {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]},
+            {**base, "choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 9, "total_tokens": 14}},
+        ]
+
+        streamed = StreamedCompletion()
+        for chunk in chunks:
+            streamed.add(chunk)
+        completion = streamed.completion()
+
+        assert completion["object"] == "chat.completion"
+        assert completion["choices"] == [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": "Let me check",
+                    "tool_calls": [
+                        {
+                            "id": "call_1",
+                            "type": "function",
+                            "function": {"name": "weather", "arguments": '{"city": "Paris"}'},
+                        }
+                    ],
+                },
+                "finish_reason": "tool_calls",
+            }
+        ]
+        assert completion["usage"]["total_tokens"] == 14
+
+        replayed = StreamedCompletion()
+        for chunk in completion_chunks(completion):
+            replayed.add(chunk)
+        assert replayed.completion() == completion
+
+    def test_streamed_tool_calls_without_index(self):
+        """Test that tool call deltas without an index are kept, with defaults, and ordered by index."""
+        base = {"id": "chatcmpl-1", "created": 1700000000, "model": "gpt-4o", "object": "chat.completion.chunk"}
+
+        def chunk(tool_calls: list[dict], finish_reason: str | None = None) -> dict:
+            return {
+                **base,
+                "choices": [{"index": 0, "delta": {"tool_calls": tool_calls}, "finish_reason": finish_reason}],
+            }
+
+        streamed = StreamedCompletion()
+        streamed.add(chunk([{"index": 1, "function": {"name": "weather", "arguments": '{"city": '}}]))
+        streamed.add(chunk([{"index": 0, "function": {"name": "search", "arguments": "{}"}}]))
+        streamed.add(chunk([{"index": 1, "id": "call_2", "type": "function", "function": {"arguments": '"Paris"}'}}]))
+        streamed.add(chunk([{"function": {"name": "time", "arguments": "{}"}}], finish_reason="tool_calls"))
+
+        assert streamed.completion()["choices"][0]["message"]["tool_calls"] == [
+            {"id": "", "type": "function", "function": {"name": "search", "arguments": "{}"}},
+            {"id": "call_2", "type": "function", "function": {"name": "weather", "arguments": '{"city": "Paris"}'}},
+            {"id": "", "type": "function", "function": {"name": "time", "arguments": "{}"}},
+        ]
+
+    def test_unfinished_or_failed_streams_are_not_cached(self):
+        """Test that only streams that finished without an error give a completion."""
+        chunk = {"id": "chatcmpl-1", "choices": [{"index": 0, "delta": {"content": "Hi"}, "finish_reason": None}]}
+
+        unfinished = StreamedCompletion()
+        unfinished.add(chunk)
+        assert unfinished.completion() is None
+
+        failed = StreamedCompletion()
+        failed.add(chunk)
+        failed.add({"error": {"message": "Upstream failed"}})
+        failed.add({"id": "chatcmpl-1", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        assert failed.completion() is None
+
+    def test_redis_store_and_errors(self):
+        """Test that entries are shared through Redis with a TTL, and Redis errors are cache misses."""
+
+        async def run():
+            redis = FakeRedis()
+            cache = CompletionCache(models=["*"], ttl=30, redis=redis)
+            await cache.set("key", make_completion())
+            other_worker = CompletionCache(models=["*"], redis=redis)
+            shared = await other_worker.get("key")
+
+            redis.fail = True
+            await cache.set("other", make_completion())
+            missed = await cache.get("key")
+            return redis, shared, missed, cache
+
+        redis, shared, missed, cache = asyncio.run(run())
+        assert shared == make_completion()
+        assert list(redis.expiry.values()) == [30]
+        assert missed is None
+        assert cache.size == 0
+        assert (cache.stats.stores, cache.stats.misses) == (1, 1)
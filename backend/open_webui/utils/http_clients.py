@@ -0,0 +1,150 @@
+"""Pooled HTTP clients for the OpenAI-compatible connections.
+
+Creating a client per request means a new connection pool, and a new
+TCP and TLS handshake, for every call to a connection. The clients here
+are shared between requests and keep idle connections alive for reuse.
+Per-request headers and cookies are passed with each request, so shared
+clients never store cookies of one user for the next request.
+"""
+
+import asyncio
+import logging
+import urllib.request
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+
+import aiohttp
+import httpx
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY,
+    AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS,
+    AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS,
+    AIOHTTP_CLIENT_TIMEOUT,
+    SRC_LOG_LEVELS,
+)
+from openai import AsyncOpenAI
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["OPENAI"])
+
+
+def cookie_header(cookies: dict | None) -> dict[str, str]:
+    """Build a Cookie header for cookies forwarded with a single request."""
+    if not cookies:
+        return {}
+    return {"Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+
+
+@dataclass
+class _PooledClient:
+    client: AsyncOpenAI
+    users: int = 0
+    retired: bool = False
+
+
+class UpstreamClients:
+    """Registry of shared clients for the upstream connections.
+
+    OpenAI clients are keyed by base URL, API key, auth type and the proxy
+    settings from the environment, so a changed connection gets a new
+    client. The aiohttp session is shared by all plain HTTP calls.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = AIOHTTP_CLIENT_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections: int | None = AIOHTTP_CLIENT_POOL_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float | None = AIOHTTP_CLIENT_POOL_KEEPALIVE_EXPIRY,
+        timeout: float | None = AIOHTTP_CLIENT_TIMEOUT,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+
+        self._clients: dict[tuple, _PooledClient] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _check_loop(self) -> None:
+        # Connections are bound to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._clients = {}
+            self._session = None
+            self._loop = loop
+
+    def _create_openai_client(self, url: str, key: str | None) -> AsyncOpenAI:
+        http_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            follow_redirects=True,
+            trust_env=True,
+        )
+        # Cookies set by upstream responses are never stored
+        http_client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return AsyncOpenAI(api_key=key, base_url=url, http_client=http_client)
+
+    @asynccontextmanager
+    async def openai(self, url: str, key: str | None, config: dict | None = None) -> AsyncIterator[AsyncOpenAI]:
+        """Use the shared OpenAI client of a connection.
+
+        The client is only closed once it was replaced and no request is
+        using it anymore.
+        """
+        self._check_loop()
+        cache_key = (
+            url,
+            key,
+            (config or {}).get("auth_type"),
+            tuple(sorted(urllib.request.getproxies().items())),
+        )
+
+        pooled = self._clients.get(cache_key)
+        if pooled is None:
+            log.debug(f"Creating pooled client for {url}")
+            pooled = self._clients[cache_key] = _PooledClient(self._create_openai_client(url, key))
+
+        pooled.users += 1
+        try:
+            yield pooled.client
+        finally:
+            pooled.users -= 1
+            if pooled.retired and pooled.users == 0:
+                await pooled.client.close()
+
+    def session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, pass timeouts and cookies per request."""
+        self._check_loop()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limits.max_connections or 0,
+                    keepalive_timeout=self.limits.keepalive_expiry,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trust_env=True,
+            )
+        return self._session
+
+    async def reset(self) -> None:
+        """Drop the OpenAI clients, e.g. after the connections changed."""
+        clients, self._clients = self._clients, {}
+        for pooled in clients.values():
+            pooled.retired = True
+            if pooled.users == 0:
+                await pooled.client.close()
+
+    async def close(self) -> None:
+        """Close all clients and the shared session."""
+        await self.reset()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+upstream_clients = UpstreamClients()
@@ -1,9 +1,38 @@
 import asyncio
 from contextlib import AsyncExitStack
+from contextvars import ContextVar
+from typing import Any, cast
 
 import anyio
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.message import SessionMessage
+from mcp.types import CancelledNotification, CancelledNotificationParams, ClientNotification, JSONRPCRequest, RequestId
+
+# Id of the last request sent by the current task
+sent_request_id: ContextVar[RequestId | None] = ContextVar("sent_request_id", default=None)
+
+
+class RequestIdRecorder:
+    """Send stream of a session that notes the id of each request in the task sending it."""
+
+    def __init__(self, stream: Any) -> None:
+        self.stream = stream
+
+    async def send(self, message: SessionMessage) -> None:
+        if isinstance(message.message.root, JSONRPCRequest):
+            sent_request_id.set(message.message.root.id)
+        await self.stream.send(message)
+
+    async def __aenter__(self) -> "RequestIdRecorder":
+        await self.stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc: object) -> bool | None:
+        return await self.stream.__aexit__(*exc)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
 
 
 class MCPClient:
@@ -19,7 +48,9 @@ class MCPClient:
                 transport = await exit_stack.enter_async_context(self._streams_context)
                 read_stream, write_stream, _ = transport
 
-                self._session_context = ClientSession(read_stream, write_stream)  # pylint: disable=W0201
+                self._session_context = ClientSession(  # pylint: disable=W0201
+                    read_stream, cast("Any", RequestIdRecorder(write_stream))
+                )
 
                 self.session = await exit_stack.enter_async_context(self._session_context)
                 with anyio.fail_after(10):
@@ -53,7 +84,26 @@ class MCPClient:
         if not self.session:
             raise RuntimeError("MCP client is not connected.")
 
-        result = await self.session.call_tool(function_name, function_args)
+        # The id the request is sent with, to tell the server when the chat is stopped
+        sent_request_id.set(None)
+        try:
+            result = await self.session.call_tool(function_name, function_args)
+        except asyncio.CancelledError:
+            request_id = sent_request_id.get()
+            if request_id is None:
+                # Cancelled before the request was sent
+                raise
+            try:
+                await self.session.send_notification(
+                    ClientNotification(
+                        CancelledNotification(
+                            params=CancelledNotificationParams(requestId=request_id, reason="Cancelled by the client")
+                        )
+                    )
+                )
+            except Exception:
+                pass
+            raise
         if not result:
             raise Exception("No result returned from MCP tool call.")
 
@@ -90,7 +140,9 @@ class MCPClient:
 
     async def disconnect(self):
         # Clean up and close the session
-        await self.exit_stack.aclose()
+        if self.exit_stack:
+            await self.exit_stack.aclose()
+            self.exit_stack = None
 
     async def __aenter__(self):
         await self.exit_stack.__aenter__()
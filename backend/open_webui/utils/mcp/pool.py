@@ -0,0 +1,256 @@
+"""Process-wide pool of initialized MCP client sessions.
+
+Connecting to an MCP server takes an HTTP handshake and an ``initialize``
+round trip, and listing its tools another round trip. Sessions are kept
+open between chats instead, keyed by server URL and the request headers,
+which carry the auth identity, so sessions are never shared between
+identities. Sessions unused for a while are pinged before they are
+reused and closed once they were idle for ``idle_timeout`` seconds, by
+``expire_idle_periodically()`` running in the background.
+
+The transport of a session runs in anyio task groups, which have to be
+exited by the task that entered them. Each session is therefore opened
+and closed by an owner task of its own, while chats only send requests
+on it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable
+
+import anyio
+from open_webui.env import (
+    MCP_SESSION_HEALTH_CHECK_INTERVAL,
+    MCP_SESSION_IDLE_TIMEOUT,
+    MCP_TOOL_SPECS_CACHE_TTL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def session_key(url: str, headers: dict | None) -> tuple[str, str]:
+    """Key of a session, the headers are hashed to not keep tokens in the key."""
+    identity = json.dumps(headers or {}, sort_keys=True, default=str)
+    return url, hashlib.sha256(identity.encode()).hexdigest()
+
+
+class _PooledSession:
+    def __init__(
+        self,
+        key: tuple[str, str],
+        url: str,
+        headers: dict | None,
+        now: float,
+        client_factory: Callable[[], MCPClient],
+    ) -> None:
+        self.key = key
+        self.url = url
+        self.headers = headers
+        self.client = client_factory()
+
+        self.users = 0
+        self.last_used = now
+        self.last_checked = now
+        self.tool_specs: list[dict] | None = None
+        self.tool_specs_at = 0.0
+
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing.is_set()
+
+    async def open(self) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            await ready
+        except BaseException:
+            # Nobody waits for the session anymore, let the owner task close it
+            self._closing.set()
+            raise
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            await self.client.connect(url=self.url, headers=self.headers)
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            return
+
+        if not ready.done():
+            ready.set_result(None)
+
+        try:
+            await self._closing.wait()
+        finally:
+            try:
+                await self.client.disconnect()
+            except BaseException as e:
+                log.debug(f"Error closing MCP session for {self.url}: {e}")
+
+    def close(self) -> None:
+        self._closing.set()
+
+    async def wait_closed(self) -> None:
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Shared MCP sessions, reused by all chats with the same server and identity.
+
+    ``acquire()`` returns a connected client that must be handed back with
+    ``release()`` once the chat is done with it. A client is shared by
+    concurrent chats, MCP sessions multiplex their requests. An
+    ``idle_timeout`` of 0 closes a session as soon as no chat uses it.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = MCP_SESSION_IDLE_TIMEOUT,
+        health_check_interval: float = MCP_SESSION_HEALTH_CHECK_INTERVAL,
+        tool_specs_ttl: float = MCP_TOOL_SPECS_CACHE_TTL,
+        health_check_timeout: float = 5,
+        clock: Callable[[], float] = time.monotonic,
+        client_factory: Callable[[], MCPClient] = MCPClient,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.tool_specs_ttl = tool_specs_ttl
+        self.health_check_timeout = health_check_timeout
+        self.clock = clock
+        self.client_factory = client_factory
+
+        self._sessions: dict[tuple[str, str], _PooledSession] = {}
+        self._opening: dict[tuple[str, str], asyncio.Task] = {}
+        self._clients: dict[int, _PooledSession] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _check_loop(self) -> None:
+        # Sessions are bound to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._sessions = {}
+            self._opening = {}
+            self._clients = {}
+            self._loop = loop
+
+    async def acquire(self, url: str, headers: dict | None = None) -> MCPClient:
+        """Get a connected client for a server, connecting only if no usable session is pooled."""
+        self._check_loop()
+        self._expire_idle()
+
+        key = session_key(url, headers)
+        pooled = self._sessions.get(key)
+        if pooled is not None and not await self._is_healthy(pooled):
+            self._discard(pooled)
+            pooled = None
+
+        if pooled is None:
+            opening = self._opening.get(key)
+            if opening is None:
+                opening = self._opening[key] = asyncio.ensure_future(self._open(key, url, headers))
+                opening.add_done_callback(lambda _: self._opening.pop(key, None))
+            # Concurrent chats wait for the same handshake
+            pooled = await asyncio.shield(opening)
+
+        pooled.users += 1
+        pooled.last_used = self.clock()
+        return pooled.client
+
+    async def release(self, client: MCPClient) -> None:
+        """Hand a client back after the chat is done with it."""
+        pooled = self._clients.get(id(client))
+        if pooled is None or pooled.client is not client:
+            await client.disconnect()
+            return
+
+        pooled.users = max(pooled.users - 1, 0)
+        pooled.last_used = self.clock()
+        if pooled.users == 0 and (
+            self.idle_timeout <= 0 or self._sessions.get(pooled.key) is not pooled or not pooled.alive
+        ):
+            self._discard(pooled)
+
+    async def list_tool_specs(self, client: MCPClient) -> list[dict]:
+        """List the tools of a pooled client, reusing the last list for ``tool_specs_ttl`` seconds."""
+        pooled = self._clients.get(id(client))
+        if pooled is None or pooled.client is not client:
+            return await client.list_tool_specs()
+
+        now = self.clock()
+        if pooled.tool_specs is None or now - pooled.tool_specs_at >= self.tool_specs_ttl:
+            pooled.tool_specs = await client.list_tool_specs()
+            pooled.tool_specs_at = now
+        return pooled.tool_specs
+
+    async def expire_idle_periodically(self, interval: float | None = None) -> None:
+        """Close idle and dead sessions every ``interval`` seconds, also while no chat acquires one."""
+        if interval is None:
+            interval = min(max(self.idle_timeout, 1), 60)
+        while True:
+            await asyncio.sleep(interval)
+            self._expire_idle()
+
+    async def close(self) -> None:
+        """Close all pooled sessions."""
+        sessions = list(self._clients.values())
+        self._sessions = {}
+        self._clients = {}
+        for pooled in sessions:
+            pooled.close()
+        await asyncio.gather(*(pooled.wait_closed() for pooled in sessions))
+
+    async def _open(self, key: tuple[str, str], url: str, headers: dict | None) -> _PooledSession:
+        log.debug(f"Opening MCP session for {url}")
+        pooled = _PooledSession(key, url, headers, self.clock(), self.client_factory)
+        await pooled.open()
+
+        self._sessions[key] = pooled
+        self._clients[id(pooled.client)] = pooled
+        return pooled
+
+    async def _is_healthy(self, pooled: _PooledSession) -> bool:
+        if not pooled.alive:
+            return False
+
+        now = self.clock()
+        if now - max(pooled.last_used, pooled.last_checked) < self.health_check_interval:
+            return True
+
+        try:
+            with anyio.fail_after(self.health_check_timeout):
+                await pooled.client.session.send_ping()
+        except Exception as e:
+            log.debug(f"MCP session for {pooled.url} failed the health check: {e}")
+            return False
+
+        pooled.last_checked = self.clock()
+        return True
+
+    def _expire_idle(self) -> None:
+        now = self.clock()
+        for pooled in list(self._clients.values()):
+            if pooled.users == 0 and (now - pooled.last_used >= self.idle_timeout or not pooled.alive):
+                self._discard(pooled)
+
+    def _discard(self, pooled: _PooledSession) -> None:
+        if self._sessions.get(pooled.key) is pooled:
+            del self._sessions[pooled.key]
+        if pooled.users == 0:
+            self._clients.pop(id(pooled.client), None)
+            pooled.close()
+
+
+mcp_session_pool = MCPSessionPool()
@@ -15,10 +15,15 @@ from open_webui.config import (
 from open_webui.constants import TASKS
 from open_webui.env import (
     CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES,
+    CHAT_RESPONSE_STREAM_APPEND_DELTAS,
     CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
+    CHAT_RESPONSE_TOOL_CALL_CONCURRENCY,
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
     ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION,
     ENABLE_REALTIME_CHAT_SAVE,
     GLOBAL_LOG_LEVEL,
+    REALTIME_CHAT_SAVE_INTERVAL,
+    REALTIME_CHAT_SAVE_MAX_CHARS,
     SRC_LOG_LEVELS,
 )
 from open_webui.models.chats import Chats
@@ -33,6 +38,7 @@ from open_webui.routers.images import (
 )
 from open_webui.routers.tasks import (
     generate_chat_tags,
+    generate_combined_tasks,
     generate_follow_ups,
     generate_image_prompt,
     generate_queries,
@@ -50,6 +56,7 @@ from open_webui.utils.files import (
     get_image_url_from_base64,
 )
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import mcp_session_pool
 from open_webui.utils.misc import (
     add_or_update_system_message,
     add_or_update_user_message,
@@ -66,22 +73,32 @@ from open_webui.utils.misc import (
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.response_handling import (
     ContentBlockManager,
+    IncrementalMessageBuilder,
+    IncrementalSerializer,
+    MessagePersister,
     ReasoningConfig,
     ReasoningHandler,
     TagDefinition,
+    ToolCallAccumulator,
+    aclose_response,
+    aclose_stream,
+    iter_sse_data,
 )
 from open_webui.utils.response_handling import (
     serialize_content_blocks as serialize_content_blocks_new,
 )
-from open_webui.utils.response_handling.serialization import (
-    convert_content_blocks_to_messages as convert_content_blocks_to_messages_new,
-)
 from open_webui.utils.task import (
     get_task_model_id,
+    parse_combined_task_response,
     rag_template,
     tools_function_calling_generation_template,
 )
-from open_webui.utils.tools import get_tools, get_updated_tool_function
+from open_webui.utils.tools import (
+    execute_tool_calls,
+    get_tools,
+    get_updated_tool_function,
+    wait_for_tool_result,
+)
 from open_webui.utils.webhook import post_webhook
 from starlette.responses import JSONResponse, StreamingResponse
 
@@ -235,6 +252,10 @@ def process_tool_result(
     return tool_result, tool_result_files, tool_result_embeds
 
 
+def get_tool_call_concurrency(metadata: dict) -> int:
+    return int(metadata.get("params", {}).get("tool_call_concurrency") or CHAT_RESPONSE_TOOL_CALL_CONCURRENCY)
+
+
 async def chat_completion_tools_handler(
     request: Request, body: dict, extra_params: dict, user: UserModel, models, tools
 ) -> tuple[dict, dict]:
@@ -318,13 +339,11 @@ async def chat_completion_tools_handler(
             result = json.loads(content)
 
             async def tool_call_handler(tool_call):
-                nonlocal skip_files
-
                 log.debug(f"{tool_call=}")
 
                 tool_function_name = tool_call.get("name", None)
                 if tool_function_name not in tools:
-                    return body, {}
+                    return None
 
                 tool_function_params = tool_call.get("parameters", {})
 
@@ -342,21 +361,29 @@ async def chat_completion_tools_handler(
                     tool_function_params = {k: v for k, v in tool_function_params.items() if k in allowed_params}
 
                     if tool.get("direct", False):
-                        tool_result = await event_caller(
-                            {
-                                "type": "execute:tool",
-                                "data": {
-                                    "id": str(uuid4()),
-                                    "name": tool_function_name,
-                                    "params": tool_function_params,
-                                    "server": tool.get("server", {}),
-                                    "session_id": metadata.get("session_id", None),
-                                },
-                            }
+                        tool_result = await wait_for_tool_result(
+                            event_caller(
+                                {
+                                    "type": "execute:tool",
+                                    "data": {
+                                        "id": str(uuid4()),
+                                        "name": tool_function_name,
+                                        "params": tool_function_params,
+                                        "server": tool.get("server", {}),
+                                        "session_id": metadata.get("session_id", None),
+                                    },
+                                }
+                            ),
+                            tool_function_name,
+                            CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
                         )
                     else:
                         tool_function = tool["callable"]
-                        tool_result = await tool_function(**tool_function_params)
+                        tool_result = await wait_for_tool_result(
+                            tool_function(**tool_function_params),
+                            tool_function_name,
+                            CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
+                        )
 
                 except Exception as e:
                     tool_result = str(e)
@@ -398,6 +425,11 @@ async def chat_completion_tools_handler(
                     tool_result_embeds,
                 )
 
+                return tool_function_name, tool_function_params, tool_result
+
+            def add_tool_result(tool_function_name, tool_function_params, tool_result):
+                nonlocal skip_files
+
                 if tool_result:
                     tool = tools[tool_function_name]
                     tool_id = tool.get("tool_id", "")
@@ -431,11 +463,17 @@ async def chat_completion_tools_handler(
                         skip_files = True
 
             # check if "tool_calls" in result
-            if result.get("tool_calls"):
-                for tool_call in result.get("tool_calls"):
-                    await tool_call_handler(tool_call)
-            else:
-                await tool_call_handler(result)
+            tool_calls = result.get("tool_calls") or [result]
+
+            # Tool calls run concurrently, their results are added in the order of the calls
+            tool_call_results = await execute_tool_calls(
+                tool_calls,
+                tool_call_handler,
+                get_tool_call_concurrency(metadata),
+            )
+            for tool_call_result in tool_call_results:
+                if tool_call_result:
+                    add_tool_result(*tool_call_result)
 
         except Exception as e:
             log.debug(f"Error: {e}")
@@ -992,113 +1030,132 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     mcp_clients = {}
     mcp_tools_dict = {}
 
-    if tool_ids:
-        for tool_id in tool_ids:
-            if tool_id.startswith("server:mcp:"):
+    async def load_mcp_tools(tool_id: str) -> tuple[str, MCPClient, dict] | None:
+        server_id = tool_id[len("server:mcp:") :]
+        try:
+            mcp_server_connection = None
+            for server_connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
+                if server_connection.get("info", {}).get("id") == server_id:
+                    mcp_server_connection = server_connection
+                    break
+
+            if not mcp_server_connection:
+                log.error(f"MCP server with id {server_id} not found")
+                return None
+
+            auth_type = mcp_server_connection.get("auth_type", "")
+            headers = {}
+            if auth_type == "bearer":
+                headers["Authorization"] = f"Bearer {mcp_server_connection.get('key', '')}"
+            elif auth_type == "none":
+                # No authentication
+                pass
+            elif auth_type == "session":
+                headers["Authorization"] = f"Bearer {request.state.token.credentials}"
+            elif auth_type == "system_oauth":
+                oauth_token = extra_params.get("__oauth_token__", None)
+                if oauth_token:
+                    headers["Authorization"] = f"Bearer {oauth_token.get('access_token', '')}"
+            elif auth_type == "oauth_2.1":
                 try:
-                    server_id = tool_id[len("server:mcp:") :]
-
-                    mcp_server_connection = None
-                    for server_connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
-                        if server_connection.get("info", {}).get("id") == server_id:
-                            mcp_server_connection = server_connection
-                            break
+                    splits = server_id.split(":")
+                    server_id = splits[-1] if len(splits) > 1 else server_id
 
-                    if not mcp_server_connection:
-                        log.error(f"MCP server with id {server_id} not found")
-                        continue
+                    oauth_token = await request.app.state.oauth_client_manager.get_oauth_token(
+                        user.id, f"mcp:{server_id}"
+                    )
 
-                    auth_type = mcp_server_connection.get("auth_type", "")
-                    headers = {}
-                    if auth_type == "bearer":
-                        headers["Authorization"] = f"Bearer {mcp_server_connection.get('key', '')}"
-                    elif auth_type == "none":
-                        # No authentication
-                        pass
-                    elif auth_type == "session":
-                        headers["Authorization"] = f"Bearer {request.state.token.credentials}"
-                    elif auth_type == "system_oauth":
-                        oauth_token = extra_params.get("__oauth_token__", None)
-                        if oauth_token:
-                            headers["Authorization"] = f"Bearer {oauth_token.get('access_token', '')}"
-                    elif auth_type == "oauth_2.1":
-                        try:
-                            splits = server_id.split(":")
-                            server_id = splits[-1] if len(splits) > 1 else server_id
+                    if oauth_token:
+                        headers["Authorization"] = f"Bearer {oauth_token.get('access_token', '')}"
+                except Exception as e:
+                    log.error(f"Error getting OAuth token: {e}")
+                    oauth_token = None
+
+            connection_headers = mcp_server_connection.get("headers", None)
+            if connection_headers and isinstance(connection_headers, dict):
+                for key, value in connection_headers.items():
+                    headers[key] = value
+
+            # Sessions are pooled per server and auth identity, a handshake only happens on a cold start
+            mcp_client = await mcp_session_pool.acquire(
+                url=mcp_server_connection.get("url", ""),
+                headers=headers if headers else None,
+            )
+            try:
+                function_name_filter_value = mcp_server_connection.get("config", {}).get(
+                    "function_name_filter_list", ""
+                )
+                # Handle both string (legacy) and list (current) formats
+                if isinstance(function_name_filter_value, list):
+                    function_name_filter_list = function_name_filter_value
+                elif isinstance(function_name_filter_value, str):
+                    function_name_filter_list = (
+                        function_name_filter_value.split(",") if function_name_filter_value else []
+                    )
+                else:
+                    function_name_filter_list = []
 
-                            oauth_token = await request.app.state.oauth_client_manager.get_oauth_token(
-                                user.id, f"mcp:{server_id}"
-                            )
+                tool_specs = await mcp_session_pool.list_tool_specs(mcp_client)
+            except BaseException:
+                await mcp_session_pool.release(mcp_client)
+                raise
 
-                            if oauth_token:
-                                headers["Authorization"] = f"Bearer {oauth_token.get('access_token', '')}"
-                        except Exception as e:
-                            log.error(f"Error getting OAuth token: {e}")
-                            oauth_token = None
-
-                    connection_headers = mcp_server_connection.get("headers", None)
-                    if connection_headers and isinstance(connection_headers, dict):
-                        for key, value in connection_headers.items():
-                            headers[key] = value
-
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
-                    )
+            server_tools = {}
+            for tool_spec in tool_specs:
 
-                    function_name_filter_value = mcp_server_connection.get("config", {}).get(
-                        "function_name_filter_list", ""
-                    )
-                    # Handle both string (legacy) and list (current) formats
-                    if isinstance(function_name_filter_value, list):
-                        function_name_filter_list = function_name_filter_value
-                    elif isinstance(function_name_filter_value, str):
-                        function_name_filter_list = (
-                            function_name_filter_value.split(",") if function_name_filter_value else []
+                def make_tool_function(client, function_name):
+                    async def tool_function(**kwargs):
+                        return await client.call_tool(
+                            function_name,
+                            function_args=kwargs,
                         )
-                    else:
-                        function_name_filter_list = []
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
-                    for tool_spec in tool_specs:
+                    return tool_function
 
-                        def make_tool_function(client, function_name):
-                            async def tool_function(**kwargs):
-                                return await client.call_tool(
-                                    function_name,
-                                    function_args=kwargs,
-                                )
+                if function_name_filter_list:
+                    if not is_string_allowed(tool_spec["name"], function_name_filter_list):
+                        # Skip this function
+                        continue
 
-                            return tool_function
+                tool_function = make_tool_function(mcp_client, tool_spec["name"])
 
-                        if function_name_filter_list:
-                            if not is_string_allowed(tool_spec["name"], function_name_filter_list):
-                                # Skip this function
-                                continue
+                server_tools[f"{server_id}_{tool_spec['name']}"] = {
+                    "spec": {
+                        **tool_spec,
+                        "name": f"{server_id}_{tool_spec['name']}",
+                    },
+                    "callable": tool_function,
+                    "type": "mcp",
+                    "client": mcp_client,
+                    "direct": False,
+                }
 
-                        tool_function = make_tool_function(mcp_clients[server_id], tool_spec["name"])
+            return server_id, mcp_client, server_tools
+        except Exception as e:
+            log.debug(e)
+            if event_emitter:
+                await event_emitter(
+                    {
+                        "type": "chat:message:error",
+                        "data": {"error": {"content": f"Failed to connect to MCP server '{server_id}'"}},
+                    }
+                )
+            return None
 
-                        mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
-                            "spec": {
-                                **tool_spec,
-                                "name": f"{server_id}_{tool_spec['name']}",
-                            },
-                            "callable": tool_function,
-                            "type": "mcp",
-                            "client": mcp_clients[server_id],
-                            "direct": False,
-                        }
-                except Exception as e:
-                    log.debug(e)
-                    if event_emitter:
-                        await event_emitter(
-                            {
-                                "type": "chat:message:error",
-                                "data": {"error": {"content": f"Failed to connect to MCP server '{server_id}'"}},
-                            }
-                        )
-                    continue
+    if tool_ids:
+        # Servers that need a new session connect concurrently
+        mcp_results = await asyncio.gather(
+            *(load_mcp_tools(tool_id) for tool_id in tool_ids if tool_id.startswith("server:mcp:"))
+        )
+        for mcp_result in mcp_results:
+            if mcp_result is None:
+                continue
+
+            server_id, mcp_client, server_tools = mcp_result
+            if server_id in mcp_clients:
+                await mcp_session_pool.release(mcp_clients[server_id])
+            mcp_clients[server_id] = mcp_client
+            mcp_tools_dict.update(server_tools)
 
         tools_dict = await get_tools(
             request,
@@ -1263,34 +1320,72 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
 
         if message and "model" in message:
             if tasks and messages:
+                is_temp_chat = metadata.get("chat_id", "").startswith("local:")
+
+                # Title, tags and follow-ups can be generated with a single task model call,
+                # results that are missing from its response are generated separately
+                combined_results = {}
+                if request.app.state.config.ENABLE_COMBINED_TASK_GENERATION:
+                    combined_tasks = []
+                    if tasks.get(TASKS.FOLLOW_UP_GENERATION) and request.app.state.config.ENABLE_FOLLOW_UP_GENERATION:
+                        combined_tasks.append("follow_ups")
+                    if not is_temp_chat:
+                        if tasks.get(TASKS.TITLE_GENERATION) and request.app.state.config.ENABLE_TITLE_GENERATION:
+                            combined_tasks.append("title")
+                        if tasks.get(TASKS.TAGS_GENERATION) and request.app.state.config.ENABLE_TAGS_GENERATION:
+                            combined_tasks.append("tags")
+
+                    if len(combined_tasks) > 1:
+                        res = await generate_combined_tasks(
+                            request,
+                            {
+                                "model": message["model"],
+                                "messages": messages,
+                                "tasks": combined_tasks,
+                                "message_id": metadata["message_id"],
+                                "chat_id": metadata["chat_id"],
+                            },
+                            user,
+                        )
+                        combined_results = parse_combined_task_response(res, combined_tasks)
+                        if len(combined_results) < len(combined_tasks):
+                            log.debug(f"Combined task response is missing {combined_tasks}, generating separately")
+
                 if tasks.get(TASKS.FOLLOW_UP_GENERATION):
-                    res = await generate_follow_ups(
-                        request,
-                        {
-                            "model": message["model"],
-                            "messages": messages,
-                            "message_id": metadata["message_id"],
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
-                    )
+                    follow_ups = combined_results.get("follow_ups")
+                    if follow_ups is None:
+                        res = await generate_follow_ups(
+                            request,
+                            {
+                                "model": message["model"],
+                                "messages": messages,
+                                "message_id": metadata["message_id"],
+                                "chat_id": metadata["chat_id"],
+                            },
+                            user,
+                        )
 
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            response_message = res.get("choices", [])[0].get("message", {})
+                        if res and isinstance(res, dict):
+                            if len(res.get("choices", [])) == 1:
+                                response_message = res.get("choices", [])[0].get("message", {})
 
-                            follow_ups_string = response_message.get("content") or response_message.get(
-                                "reasoning_content", ""
-                            )
-                        else:
-                            follow_ups_string = ""
+                                follow_ups_string = response_message.get("content") or response_message.get(
+                                    "reasoning_content", ""
+                                )
+                            else:
+                                follow_ups_string = ""
 
-                        follow_ups_string = follow_ups_string[
-                            follow_ups_string.find("{") : follow_ups_string.rfind("}") + 1
-                        ]
+                            follow_ups_string = follow_ups_string[
+                                follow_ups_string.find("{") : follow_ups_string.rfind("}") + 1
+                            ]
 
+                            try:
+                                follow_ups = json.loads(follow_ups_string).get("follow_ups", [])
+                            except Exception:
+                                pass
+
+                    if follow_ups is not None:
                         try:
-                            follow_ups = json.loads(follow_ups_string).get("follow_ups", [])
                             await event_emitter(
                                 {
                                     "type": "chat:message:follow_ups",
@@ -1300,7 +1395,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                                 }
                             )
 
-                            if not metadata.get("chat_id", "").startswith("local:"):
+                            if not is_temp_chat:
                                 Chats.upsert_message_to_chat_by_id_and_message_id(
                                     metadata["chat_id"],
                                     metadata["message_id"],
@@ -1312,9 +1407,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                         except Exception:
                             pass
 
-                if not metadata.get("chat_id", "").startswith(
-                    "local:"
-                ):  # Only update titles and tags for non-temp chats
+                if not is_temp_chat:  # Only update titles and tags for non-temp chats
                     if TASKS.TITLE_GENERATION in tasks:
                         user_message = get_last_user_message(messages)
                         if user_message and len(user_message) > 100:
@@ -1322,40 +1415,43 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
 
                         title = None
                         if tasks[TASKS.TITLE_GENERATION]:
-                            res = await generate_title(
-                                request,
-                                {
-                                    "model": message["model"],
-                                    "messages": messages,
-                                    "chat_id": metadata["chat_id"],
-                                },
-                                user,
-                            )
+                            title = combined_results.get("title")
+                            if title is None:
+                                res = await generate_title(
+                                    request,
+                                    {
+                                        "model": message["model"],
+                                        "messages": messages,
+                                        "chat_id": metadata["chat_id"],
+                                    },
+                                    user,
+                                )
 
-                            if res and isinstance(res, dict):
-                                if len(res.get("choices", [])) == 1:
-                                    response_message = res.get("choices", [])[0].get("message", {})
+                                if res and isinstance(res, dict):
+                                    if len(res.get("choices", [])) == 1:
+                                        response_message = res.get("choices", [])[0].get("message", {})
 
-                                    title_string = (
-                                        response_message.get("content")
-                                        or response_message.get(
-                                            "reasoning_content",
+                                        title_string = (
+                                            response_message.get("content")
+                                            or response_message.get(
+                                                "reasoning_content",
+                                            )
+                                            or message.get("content", user_message)
                                         )
-                                        or message.get("content", user_message)
-                                    )
-                                else:
-                                    title_string = ""
+                                    else:
+                                        title_string = ""
 
-                                title_string = title_string[title_string.find("{") : title_string.rfind("}") + 1]
+                                    title_string = title_string[title_string.find("{") : title_string.rfind("}") + 1]
 
-                                try:
-                                    title = json.loads(title_string).get("title", user_message)
-                                except Exception:
-                                    title = ""
+                                    try:
+                                        title = json.loads(title_string).get("title", user_message)
+                                    except Exception:
+                                        title = ""
 
-                                if not title:
-                                    title = messages[0].get("content", user_message)
+                                    if not title:
+                                        title = messages[0].get("content", user_message)
 
+                            if title is not None:
                                 Chats.update_chat_title_by_id(metadata["chat_id"], title)
 
                                 await event_emitter(
@@ -1378,30 +1474,37 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                             )
 
                     if tasks.get(TASKS.TAGS_GENERATION):
-                        res = await generate_chat_tags(
-                            request,
-                            {
-                                "model": message["model"],
-                                "messages": messages,
-                                "chat_id": metadata["chat_id"],
-                            },
-                            user,
-                        )
+                        tags = combined_results.get("tags")
+                        if tags is None:
+                            res = await generate_chat_tags(
+                                request,
+                                {
+                                    "model": message["model"],
+                                    "messages": messages,
+                                    "chat_id": metadata["chat_id"],
+                                },
+                                user,
+                            )
 
-                        if res and isinstance(res, dict):
-                            if len(res.get("choices", [])) == 1:
-                                response_message = res.get("choices", [])[0].get("message", {})
+                            if res and isinstance(res, dict):
+                                if len(res.get("choices", [])) == 1:
+                                    response_message = res.get("choices", [])[0].get("message", {})
 
-                                tags_string = response_message.get("content") or response_message.get(
-                                    "reasoning_content", ""
-                                )
-                            else:
-                                tags_string = ""
+                                    tags_string = response_message.get("content") or response_message.get(
+                                        "reasoning_content", ""
+                                    )
+                                else:
+                                    tags_string = ""
 
-                            tags_string = tags_string[tags_string.find("{") : tags_string.rfind("}") + 1]
+                                tags_string = tags_string[tags_string.find("{") : tags_string.rfind("}") + 1]
+
+                                try:
+                                    tags = json.loads(tags_string).get("tags", [])
+                                except Exception:
+                                    pass
 
+                        if tags is not None:
                             try:
-                                tags = json.loads(tags_string).get("tags", [])
                                 Chats.update_chat_tags_by_id(metadata["chat_id"], tags, user)
 
                                 await event_emitter(
@@ -1626,8 +1729,23 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                 ),
                 block_manager,
             )
+            content_serializer = IncrementalSerializer(block_manager)
             content_blocks = block_manager.to_list()
 
+            message_persister = None
+            if ENABLE_REALTIME_CHAT_SAVE:
+                message_persister = MessagePersister(
+                    Chats,
+                    metadata["chat_id"],
+                    metadata["message_id"],
+                    lambda: {
+                        "content": content_serializer.serialize(),
+                        "content_blocks": block_manager.to_list(),
+                    },
+                    interval=REALTIME_CHAT_SAVE_INTERVAL,
+                    max_chars=REALTIME_CHAT_SAVE_MAX_CHARS,
+                )
+
             try:
                 for event in events:
                     await event_emitter(
@@ -1652,7 +1770,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                     nonlocal block_manager
                     nonlocal reasoning_handler
 
-                    response_tool_calls = []
+                    tool_call_accumulator = ToolCallAccumulator()
 
                     delta_count = 0
                     delta_chunk_size = max(
@@ -1660,192 +1778,174 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                         int(metadata.get("params", {}).get("stream_delta_chunk_size") or 1),
                     )
                     last_delta_data = None
+                    # Content changes are only serialized when the pending deltas are flushed,
+                    # None means there is no pending content change
+                    pending_content_blocks = None
 
-                    async def flush_pending_delta_data(threshold: int = 0):
-                        nonlocal delta_count
-                        nonlocal last_delta_data
+                    async def emit_pending_content():
+                        nonlocal pending_content_blocks
 
-                        if delta_count >= threshold and last_delta_data:
-                            await event_emitter(
-                                {
-                                    "type": "chat:completion",
-                                    "data": last_delta_data,
-                                }
-                            )
-                            delta_count = 0
-                            last_delta_data = None
+                        include_content_blocks = pending_content_blocks
+                        pending_content_blocks = None
 
-                    async for line in response.body_iterator:
-                        line = line.decode("utf-8", "replace") if isinstance(line, bytes) else line
-                        data = line
-
-                        # Skip empty lines
-                        if not data.strip():
-                            continue
+                        if CHAT_RESPONSE_STREAM_APPEND_DELTAS:
+                            content_delta = content_serializer.consume_delta()
+                            if content_delta is not None:
+                                if content_delta:
+                                    await event_emitter(
+                                        {
+                                            "type": "chat:message:delta",
+                                            "data": {"content": content_delta},
+                                        }
+                                    )
+                                return
 
-                        # "data:" is the prefix for each event
-                        if not data.startswith("data:"):
-                            continue
+                        data = {"content": content_serializer.serialize()}
+                        if include_content_blocks:
+                            data["content_blocks"] = block_manager.to_list()
 
-                        # Remove the prefix
-                        data = data[len("data:") :].strip()
+                        await event_emitter(
+                            {
+                                "type": "chat:completion",
+                                "data": data,
+                            }
+                        )
 
-                        try:
-                            data = json.loads(data)
+                    async def flush_pending_delta_data(threshold: int = 0):
+                        nonlocal delta_count
+                        nonlocal last_delta_data
 
-                            if data:
-                                if "event" in data and not getattr(request.state, "direct", False):
-                                    await event_emitter(data.get("event", {}))
+                        if delta_count >= threshold and (last_delta_data or pending_content_blocks is not None):
+                            if pending_content_blocks is not None:
+                                await emit_pending_content()
+                            if last_delta_data:
+                                await event_emitter(
+                                    {
+                                        "type": "chat:completion",
+                                        "data": last_delta_data,
+                                    }
+                                )
+                            delta_count = 0
+                            last_delta_data = None
 
-                                if "selected_model_id" in data:
-                                    model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                                        metadata["chat_id"],
-                                        metadata["message_id"],
-                                        {
-                                            "selectedModelId": model_id,
-                                        },
-                                    )
-                                    await event_emitter(
-                                        {
-                                            "type": "chat:completion",
-                                            "data": data,
-                                        }
-                                    )
-                                else:
-                                    choices = data.get("choices", [])
+                    try:
+                        async for data in iter_sse_data(response):
+                            try:
+                                if data:
+                                    if "event" in data and not getattr(request.state, "direct", False):
+                                        await event_emitter(data.get("event", {}))
 
-                                    # 17421
-                                    usage = data.get("usage", {}) or {}
-                                    usage.update(data.get("timings", {}))  # llama.cpp
-                                    if usage:
+                                    if "selected_model_id" in data:
+                                        model_id = data["selected_model_id"]
+                                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            metadata["chat_id"],
+                                            metadata["message_id"],
+                                            {
+                                                "selectedModelId": model_id,
+                                            },
+                                        )
                                         await event_emitter(
                                             {
                                                 "type": "chat:completion",
-                                                "data": {
-                                                    "usage": usage,
-                                                },
+                                                "data": data,
                                             }
                                         )
+                                    else:
+                                        choices = data.get("choices", [])
 
-                                    if not choices:
-                                        error = data.get("error", {})
-                                        if error:
+                                        # 17421
+                                        usage = data.get("usage", {}) or {}
+                                        usage.update(data.get("timings", {}))  # llama.cpp
+                                        if usage:
                                             await event_emitter(
                                                 {
                                                     "type": "chat:completion",
                                                     "data": {
-                                                        "error": error,
+                                                        "usage": usage,
                                                     },
                                                 }
                                             )
-                                        continue
-
-                                    delta = choices[0].get("delta", {})
-                                    delta_tool_calls = delta.get("tool_calls", None)
-
-                                    if delta_tool_calls:
-                                        for delta_tool_call in delta_tool_calls:
-                                            tool_call_index = delta_tool_call.get("index")
-
-                                            if tool_call_index is not None:
-                                                # Check if the tool call already exists
-                                                current_response_tool_call = None
-                                                for response_tool_call in response_tool_calls:
-                                                    if response_tool_call.get("index") == tool_call_index:
-                                                        current_response_tool_call = response_tool_call
-                                                        break
-
-                                                if current_response_tool_call is None:
-                                                    # Add the new tool call
-                                                    delta_tool_call.setdefault("function", {})
-                                                    delta_tool_call["function"].setdefault("name", "")
-                                                    delta_tool_call["function"].setdefault("arguments", "")
-                                                    response_tool_calls.append(delta_tool_call)
-                                                else:
-                                                    # Update the existing tool call
-                                                    delta_name = delta_tool_call.get("function", {}).get("name")
-                                                    delta_arguments = delta_tool_call.get("function", {}).get(
-                                                        "arguments"
-                                                    )
-
-                                                    if delta_name:
-                                                        current_response_tool_call["function"]["name"] += delta_name
-
-                                                    if delta_arguments:
-                                                        current_response_tool_call["function"]["arguments"] += (
-                                                            delta_arguments
-                                                        )
-
-                                    image_urls = get_image_urls(delta.get("images", []), request, metadata, user)
-                                    if image_urls:
-                                        message_files = Chats.add_message_files_by_id_and_message_id(
-                                            metadata["chat_id"],
-                                            metadata["message_id"],
-                                            [{"type": "image", "url": url} for url in image_urls],
-                                        )
-
-                                        await event_emitter(
-                                            {
-                                                "type": "files",
-                                                "data": {"files": message_files},
-                                            }
-                                        )
-
-                                    value = delta.get("content")
 
-                                    reasoning_content = (
-                                        delta.get("reasoning_content")
-                                        or delta.get("reasoning")
-                                        or delta.get("thinking")
-                                    )
-                                    if reasoning_content:
-                                        reasoning_handler.handle_api_reasoning(reasoning_content)
-                                        content_blocks = block_manager.to_list()
-                                        data = {"content": serialize_content_blocks_new(content_blocks)}
-
-                                    if value:
-                                        if ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION:
-                                            value = convert_markdown_base64_images(request, value, metadata, user)
-
-                                        content = f"{content}{value}"
-                                        reasoning_handler.handle_text_content(value)
-                                        content_blocks = block_manager.to_list()
-
-                                        if ENABLE_REALTIME_CHAT_SAVE:
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                        if not choices:
+                                            error = data.get("error", {})
+                                            if error:
+                                                await event_emitter(
+                                                    {
+                                                        "type": "chat:completion",
+                                                        "data": {
+                                                            "error": error,
+                                                        },
+                                                    }
+                                                )
+                                            continue
+
+                                        delta = choices[0].get("delta", {})
+                                        delta_tool_calls = delta.get("tool_calls", None)
+
+                                        if delta_tool_calls:
+                                            tool_call_accumulator.add(delta_tool_calls)
+
+                                        image_urls = get_image_urls(delta.get("images", []), request, metadata, user)
+                                        if image_urls:
+                                            message_files = Chats.add_message_files_by_id_and_message_id(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
+                                                [{"type": "image", "url": url} for url in image_urls],
+                                            )
+
+                                            await event_emitter(
                                                 {
-                                                    "content": serialize_content_blocks_new(content_blocks),
-                                                    "content_blocks": content_blocks,
-                                                },
+                                                    "type": "files",
+                                                    "data": {"files": message_files},
+                                                }
                                             )
-                                        else:
-                                            data = {
-                                                "content": serialize_content_blocks_new(content_blocks),
-                                                "content_blocks": content_blocks,
-                                            }
 
-                                if delta:
-                                    delta_count += 1
-                                    last_delta_data = data
-                                    if delta_count >= delta_chunk_size:
-                                        await flush_pending_delta_data(delta_chunk_size)
-                                else:
-                                    await event_emitter(
-                                        {
-                                            "type": "chat:completion",
-                                            "data": data,
-                                        }
-                                    )
-                        except Exception as e:
-                            done = "data: [DONE]" in line
-                            if done:
-                                pass
-                            else:
+                                        value = delta.get("content")
+
+                                        reasoning_content = (
+                                            delta.get("reasoning_content")
+                                            or delta.get("reasoning")
+                                            or delta.get("thinking")
+                                        )
+                                        if reasoning_content:
+                                            reasoning_handler.handle_api_reasoning(reasoning_content)
+                                            pending_content_blocks = bool(pending_content_blocks)
+                                            data = None
+
+                                            if message_persister:
+                                                message_persister.update(len(reasoning_content))
+
+                                        if value:
+                                            if ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION:
+                                                value = convert_markdown_base64_images(request, value, metadata, user)
+
+                                            content = f"{content}{value}"
+                                            reasoning_handler.handle_text_content(value)
+
+                                            if message_persister:
+                                                message_persister.update(len(value))
+                                            else:
+                                                pending_content_blocks = True
+                                                data = None
+
+                                    if delta:
+                                        delta_count += 1
+                                        last_delta_data = data
+                                        if delta_count >= delta_chunk_size:
+                                            await flush_pending_delta_data(delta_chunk_size)
+                                    else:
+                                        await event_emitter(
+                                            {
+                                                "type": "chat:completion",
+                                                "data": data,
+                                            }
+                                        )
+                            except Exception as e:
                                 log.debug(f"Error: {e}")
                                 continue
+                    finally:
+                        # Also when cancelled while handling a chunk, so the upstream request ends right away
+                        await aclose_response(response)
                     await flush_pending_delta_data()
 
                     reasoning_handler.finalize()
@@ -1854,6 +1954,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                     if not content_blocks:
                         content_blocks = [{"type": "text", "content": ""}]
 
+                    response_tool_calls = tool_call_accumulator.finalize()
                     if response_tool_calls:
                         # Validate and fix incomplete JSON in tool calls before processing
                         for tool_call in response_tool_calls:
@@ -1885,6 +1986,8 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                 await stream_body_handler(response, form_data)
 
                 tool_call_retries = 0
+                # Messages of the follow-up requests, extended with the new messages of every tool round
+                message_builder = IncrementalMessageBuilder(form_data["messages"], raw=True)
 
                 while len(tool_calls) > 0 and tool_call_retries < CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES:
                     tool_call_retries += 1
@@ -1898,7 +2001,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                         {
                             "type": "chat:completion",
                             "data": {
-                                "content": serialize_content_blocks_new(content_blocks),
+                                "content": content_serializer.serialize(),
                                 "content_blocks": content_blocks,
                             },
                         }
@@ -1906,9 +2009,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
 
                     tools = metadata.get("tools", {})
 
-                    results = []
-
-                    for tool_call in response_tool_calls:
+                    async def execute_tool_call(tool_call):
                         tool_call_id = tool_call.get("id", "")
                         tool_function_name = tool_call.get("function", {}).get("name", "")
                         tool_args = tool_call.get("function", {}).get("arguments", "{}")
@@ -1957,17 +2058,21 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                                 }
 
                                 if direct_tool:
-                                    tool_result = await event_caller(
-                                        {
-                                            "type": "execute:tool",
-                                            "data": {
-                                                "id": str(uuid4()),
-                                                "name": tool_function_name,
-                                                "params": tool_function_params,
-                                                "server": tool.get("server", {}),
-                                                "session_id": metadata.get("session_id", None),
-                                            },
-                                        }
+                                    tool_result = await wait_for_tool_result(
+                                        event_caller(
+                                            {
+                                                "type": "execute:tool",
+                                                "data": {
+                                                    "id": str(uuid4()),
+                                                    "name": tool_function_name,
+                                                    "params": tool_function_params,
+                                                    "server": tool.get("server", {}),
+                                                    "session_id": metadata.get("session_id", None),
+                                                },
+                                            }
+                                        ),
+                                        tool_function_name,
+                                        CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
                                     )
 
                                 else:
@@ -1979,7 +2084,11 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                                         },
                                     )
 
-                                    tool_result = await tool_function(**tool_function_params)
+                                    tool_result = await wait_for_tool_result(
+                                        tool_function(**tool_function_params),
+                                        tool_function_name,
+                                        CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
+                                    )
 
                             except Exception as e:
                                 tool_result = str(e)
@@ -1994,14 +2103,19 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                             user,
                         )
 
-                        results.append(
-                            {
-                                "tool_call_id": tool_call_id,
-                                "content": tool_result or "",
-                                **({"files": tool_result_files} if tool_result_files else {}),
-                                **({"embeds": tool_result_embeds} if tool_result_embeds else {}),
-                            }
-                        )
+                        return {
+                            "tool_call_id": tool_call_id,
+                            "content": tool_result or "",
+                            **({"files": tool_result_files} if tool_result_files else {}),
+                            **({"embeds": tool_result_embeds} if tool_result_embeds else {}),
+                        }
+
+                    # Independent tool calls of the same turn run concurrently, results keep the call order
+                    results = await execute_tool_calls(
+                        response_tool_calls,
+                        execute_tool_call,
+                        get_tool_call_concurrency(metadata),
+                    )
 
                     tool_calls_block.results = results
                     block_manager.ensure_text_block()
@@ -2011,7 +2125,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                         {
                             "type": "chat:completion",
                             "data": {
-                                "content": serialize_content_blocks_new(content_blocks),
+                                "content": content_serializer.serialize(),
                                 "content_blocks": content_blocks,
                             },
                         }
@@ -2022,10 +2136,7 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                             **form_data,
                             "model": model_id,
                             "stream": True,
-                            "messages": [
-                                *form_data["messages"],
-                                *convert_content_blocks_to_messages_new(content_blocks, True),
-                            ],
+                            "messages": message_builder.build(content_blocks),
                         }
 
                         res = await generate_chat_completion(
@@ -2049,7 +2160,11 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                     "title": title,
                 }
 
-                if not ENABLE_REALTIME_CHAT_SAVE:
+                if message_persister:
+                    # Also saves the tool results, which are not saved as they arrive
+                    message_persister.update()
+                    message_persister.flush()
+                else:
                     Chats.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
@@ -2088,6 +2203,8 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                 await event_emitter({"type": "chat:tasks:cancel"})
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
+                    # Blocks are no longer converted on every delta, pick up what was streamed so far
+                    content_blocks = block_manager.to_list() or content_blocks
                     Chats.upsert_message_to_chat_by_id_and_message_id(
                         metadata["chat_id"],
                         metadata["message_id"],
@@ -2096,6 +2213,10 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
                             "content_blocks": content_blocks,
                         },
                     )
+            finally:
+                # Coalesced realtime saves still pending when the stream failed or was cancelled
+                if message_persister:
+                    message_persister.flush()
 
             if response.background is not None:
                 await response.background()
@@ -2107,13 +2228,16 @@ async def process_chat_response(request, response, form_data, user, metadata, mo
         def wrap_item(item):
             return f"data: {item}\n\n"
 
-        for event in events:
-            if event:
-                yield wrap_item(json.dumps(event))
-
-        async for data in original_generator:
-            if data:
-                yield data
+        try:
+            for event in events:
+                if event:
+                    yield wrap_item(json.dumps(event))
+
+            async for data in original_generator:
+                if data:
+                    yield data
+        finally:
+            await aclose_stream(original_generator)
 
     return StreamingResponse(
         stream_wrapper(response.body_iterator, events),
@@ -1,13 +1,21 @@
+import asyncio
 import logging
 import sys
 import time
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 from fastapi import Request
 from open_webui.config import (
     BYPASS_ADMIN_ACCESS_CONTROL,
     DEFAULT_ARENA_MODEL,
 )
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL, SRC_LOG_LEVELS
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    GLOBAL_LOG_LEVEL,
+    SRC_LOG_LEVELS,
+)
 from open_webui.models.groups import Groups
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel
@@ -19,101 +27,243 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
-async def fetch_openai_models(request: Request, user: UserModel = None):
-    openai_response = await openai.get_all_models(request, user=user)
+class ModelRegistry:
+    """Index of the available models with stale-while-revalidate refreshes.
+
+    Upstream model lists are fetched once and then refreshed in the
+    background after ``refresh_interval`` seconds, while the last known
+    lists keep being served. The merged list including custom and arena
+    models is rebuilt from them on demand and dropped by ``invalidate``.
+
+    Once ``redis`` is set, invalidations are counted in a Redis hash so that
+    the other workers drop their models as well, checked at most every
+    ``poll_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: int | None = None,
+        redis_key_prefix: str = "open-webui",
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        # Async Redis client, set on startup when Redis is configured
+        self.redis: Any = None
+        self._version_key = f"{redis_key_prefix}:models:version"
+
+        # Upstream models by id and by the index of their connection
+        self.openai_models: dict[str, dict] = {}
+        self.models_by_url_idx: dict[int, list[dict]] = {}
+        # Last model list received from each connection by base URL, served while it is unreachable
+        self.model_lists: dict[str, Any] = {}
+        # All models by id, None until rebuilt
+        self.models: dict[str, dict] | None = None
+
+        self._fetched_at: float | None = None
+        self._generation = 0
+        self._refresh_task: asyncio.Task | None = None
+        # Invalidation counts by kind ("models", "connections") this worker is up to date with
+        self._versions: dict[str, int] | None = None
+        self._synced_at = float("-inf")
+
+    def set_openai_models(self, openai_models: dict[str, dict]) -> None:
+        models_by_url_idx = {}
+        for model in openai_models.values():
+            for url_idx in model.get("urlIdxs", [model.get("urlIdx")]):
+                models_by_url_idx.setdefault(url_idx, []).append(model)
+
+        self.openai_models = openai_models
+        self.models_by_url_idx = models_by_url_idx
+        self.models = None
+        self._fetched_at = time.monotonic()
+
+    async def invalidate(self, connections: bool = False) -> None:
+        """Rebuild the merged models on next use, in every worker.
+
+        With ``connections`` the upstream lists are fetched again before
+        they are used, as the model to connection mapping may be outdated.
+        """
+        self._invalidate(connections)
+        if self.redis is None:
+            return
+
+        kind = "connections" if connections else "models"
+        try:
+            version = int(await self.redis.hincrby(self._version_key, kind, 1))
+        except Exception as e:
+            log.warning(f"Error sharing the model registry invalidation: {e}")
+            return
+
+        # Unless another worker invalidated in between, this worker is already up to date
+        if self._versions is not None and self._versions.get(kind, 0) == version - 1:
+            self._versions[kind] = version
+
+    async def sync(self) -> None:
+        """Apply the invalidations of other workers since the last check."""
+        if self.redis is None or time.monotonic() - self._synced_at < self.poll_interval:
+            return
+        self._synced_at = time.monotonic()
+
+        try:
+            versions = {kind: int(version) for kind, version in (await self.redis.hgetall(self._version_key)).items()}
+        except Exception as e:
+            log.warning(f"Error reading the model registry version: {e}")
+            return
+
+        if self._versions is not None:
+            if versions.get("connections", 0) != self._versions.get("connections", 0):
+                self._invalidate(connections=True)
+            elif versions.get("models", 0) != self._versions.get("models", 0):
+                self._invalidate()
+        self._versions = versions
+
+    def _invalidate(self, connections: bool = False) -> None:
+        self.models = None
+        if connections:
+            self._generation += 1
+            self._fetched_at = None
+            self.openai_models = {}
+            self.models_by_url_idx = {}
+
+    async def get_openai_models(
+        self,
+        fetch: Callable[[], Awaitable[dict[str, dict]]],
+        refresh: bool = False,
+        revalidate: bool = True,
+    ) -> dict[str, dict]:
+        """Get the upstream models, fetching them only when there are none yet or on ``refresh``."""
+        await self.sync()
+        for _ in range(2):
+            if self._fetched_at is not None and not refresh:
+                break
+            generation = self._generation
+            # Shared by concurrent callers, a cancelled request does not cancel the fetch
+            await asyncio.shield(self._start_refresh(fetch))
+            # Fetched for connections that were changed meanwhile, fetch once more
+            if generation == self._generation:
+                break
+            refresh = False
+        else:
+            return self.openai_models
+
+        if (
+            revalidate
+            and self.refresh_interval is not None
+            and time.monotonic() - self._fetched_at >= self.refresh_interval
+        ):
+            self._start_refresh(fetch)
+
+        return self.openai_models
+
+    def _start_refresh(self, fetch: Callable[[], Awaitable[dict[str, dict]]]) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(fetch))
+        return self._refresh_task
+
+    async def _refresh(self, fetch: Callable[[], Awaitable[dict[str, dict]]]) -> None:
+        generation = self._generation
+        try:
+            openai_models = await fetch()
+        except Exception as e:
+            # Keep serving the last known models
+            log.exception(f"Error refreshing models: {e}")
+            if self._fetched_at is not None:
+                self._fetched_at = time.monotonic()
+            return
+
+        if generation == self._generation:
+            self.set_openai_models(openai_models)
+
+    def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+
+async def fetch_openai_models(request: Request, refresh: bool = False, user: UserModel = None):
+    openai_response = await openai.get_all_models(request, refresh=refresh, user=user)
     return openai_response["data"]
 
 
-async def get_all_base_models(request: Request, user: UserModel = None):
+async def get_all_base_models(request: Request, refresh: bool = False, user: UserModel = None):
     if request.app.state.config.ENABLE_OPENAI_API:
-        openai_models = await fetch_openai_models(request, user)
+        openai_models = await fetch_openai_models(request, refresh=refresh, user=user)
     else:
         openai_models = []
 
     return openai_models
 
 
-async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
-    ):
-        base_models = request.app.state.BASE_MODELS
+def get_arena_models(request: Request) -> list[dict]:
+    if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
+        arena_models = request.app.state.config.EVALUATION_ARENA_MODELS
     else:
-        base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
+        # Add default arena model
+        arena_models = [DEFAULT_ARENA_MODEL]
 
-    # deep copy the base models to avoid modifying the original list
-    models = [model.copy() for model in base_models]
+    return [
+        {
+            "id": model["id"],
+            "name": model["name"],
+            "info": {
+                "meta": model["meta"],
+            },
+            "object": "model",
+            "created": int(time.time()),
+            "owned_by": "arena",
+            "arena": True,
+        }
+        for model in arena_models
+    ]
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
 
-    # Add arena models
-    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
+def merge_custom_models(models: list[dict], custom_models: list) -> list[dict]:
+    """Apply custom models to base models and add the ones based on a base model."""
+    models_by_id = {}
+    # First position of a model by id and by id without tag, to find the base of a custom model
+    positions_by_id = {}
+    positions_by_prefix = {}
+    for position, model in enumerate(models):
+        models_by_id.setdefault(model["id"], []).append(model)
+        positions_by_id.setdefault(model["id"], position)
+        positions_by_prefix.setdefault(model["id"].split(":")[0], position)
 
-    custom_models = Models.get_all_models()
+    removed = set()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"]:
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        if "info" in model:
-                            if "params" in model["info"]:
-                                # Remove params to avoid exposing sensitive info
-                                del model["info"]["params"]
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (custom_model.id not in [model["id"] for model in models]):
+            if not custom_model.is_active:
+                for model in models_by_id.pop(custom_model.id, []):
+                    removed.add(id(model))
+                continue
+
+            for model in models_by_id.get(custom_model.id, []):
+                model["name"] = custom_model.name
+                model["info"] = custom_model.model_dump()
+
+                if "info" in model:
+                    if "params" in model["info"]:
+                        # Remove params to avoid exposing sensitive info
+                        del model["info"]["params"]
+
+        elif custom_model.is_active and custom_model.id not in models_by_id:
             # Custom model based on a base model
             owned_by = "openai"
             pipe = None
 
-            for m in models:
-                if custom_model.base_model_id == m["id"] or custom_model.base_model_id == m["id"].split(":")[0]:
-                    owned_by = m.get("owned_by", "unknown")
-                    if "pipe" in m:
-                        pipe = m["pipe"]
-                    break
+            candidates = [
+                position
+                for position in (
+                    positions_by_id.get(custom_model.base_model_id),
+                    positions_by_prefix.get(custom_model.base_model_id),
+                )
+                if position is not None and id(models[position]) not in removed
+            ]
+            if candidates:
+                m = models[min(candidates)]
+                owned_by = m.get("owned_by", "unknown")
+                if "pipe" in m:
+                    pipe = m["pipe"]
 
             model = {
                 "id": f"{custom_model.id}",
@@ -133,11 +283,49 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             model["info"] = info
 
             models.append(model)
+            models_by_id[model["id"]] = [model]
+            positions_by_id.setdefault(model["id"], len(models) - 1)
+            positions_by_prefix.setdefault(model["id"].split(":")[0], len(models) - 1)
 
+    return [model for model in models if id(model) not in removed]
+
+
+def build_models(request, base_models: list[dict]) -> dict[str, dict]:
+    """All models by id: the base models with the arena and custom models applied."""
+    # Copy the base models to avoid modifying the original list
+    models = [model.copy() for model in base_models]
+
+    # Add arena models
+    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
+        models = models + get_arena_models(request)
+
+    models = merge_custom_models(models, Models.get_all_models())
     log.debug(f"get_all_models() returned {len(models)} models")
+    return {model["id"]: model for model in models}
 
-    request.app.state.MODELS = {model["id"]: model for model in models}
-    return models
+
+async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    registry: ModelRegistry = request.app.state.MODEL_REGISTRY
+    await registry.sync()
+
+    base_models = await get_all_base_models(request, refresh=refresh, user=user)
+    request.app.state.BASE_MODELS = base_models
+
+    # If there are no models, return an empty list
+    if len(base_models) == 0:
+        return []
+
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        # Built from the lists fetched for this user, which are not shared
+        models = build_models(request, base_models)
+    else:
+        if registry.models is None or refresh:
+            registry.models = build_models(request, base_models)
+        models = registry.models
+
+    request.app.state.MODELS = models
+    # Copies, so that callers adjusting the returned models do not change the registry
+    return [model.copy() for model in models.values()]
 
 
 def check_model_access(user, model):
@@ -4,9 +4,17 @@ This module provides components for:
 - Content block management (text, reasoning, tool calls)
 - Streaming tag parsing with buffering for fragmented chunks
 - Unified reasoning handling (API + tag-based)
-- Content serialization for display
+- Content serialization for display and follow-up requests
+- Server-sent event chunks passed through without re-encoding
+- Write-behind persistence of streaming messages
+- Time-windowed coalescing of streaming socket events
+- Accumulation of streamed tool call deltas
 """
 
+from .coalescing import (
+    EventCoalescer,
+    is_coalescible,
+)
 from .content_blocks import (
     BlockType,
     ContentBlock,
@@ -14,14 +22,29 @@ from .content_blocks import (
     ReasoningBlock,
     ToolCallsBlock,
 )
+from .persistence import (
+    MessagePersister,
+    PersistenceStats,
+    persistence_stats,
+)
 from .reasoning_handler import (
     DEFAULT_REASONING_TAGS,
     ReasoningConfig,
     ReasoningHandler,
 )
 from .serialization import (
+    IncrementalMessageBuilder,
+    IncrementalSerializer,
     serialize_content_blocks,
 )
+from .sse import (
+    ChunkStreamingResponse,
+    SSEChunk,
+    aclose_response,
+    aclose_stream,
+    iter_sse_chunks,
+    iter_sse_data,
+)
 from .stream_processor import (
     StreamConfig,
     StreamContext,
@@ -32,21 +55,36 @@ from .tag_parser import (
     StreamingTagParser,
     TagDefinition,
 )
+from .tool_calls import ToolCallAccumulator
 
 __all__ = [
     "DEFAULT_REASONING_TAGS",
     "BlockType",
+    "ChunkStreamingResponse",
     "ContentBlock",
     "ContentBlockManager",
+    "EventCoalescer",
+    "IncrementalMessageBuilder",
+    "IncrementalSerializer",
+    "MessagePersister",
     "ParseResult",
+    "PersistenceStats",
     "ReasoningBlock",
     "ReasoningConfig",
     "ReasoningHandler",
+    "SSEChunk",
     "StreamConfig",
     "StreamContext",
     "StreamProcessor",
     "StreamingTagParser",
     "TagDefinition",
+    "ToolCallAccumulator",
     "ToolCallsBlock",
+    "aclose_response",
+    "aclose_stream",
+    "is_coalescible",
+    "iter_sse_chunks",
+    "iter_sse_data",
+    "persistence_stats",
     "serialize_content_blocks",
 ]
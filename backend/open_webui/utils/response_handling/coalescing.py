@@ -0,0 +1,103 @@
+"""Time-windowed coalescing of streaming socket events.
+
+Every delta of a streaming response used to become its own socket.io
+emit, and with the Redis manager its own pub/sub publish. Consecutive
+content updates are merged instead and emitted at most once per time
+window or number of updates. Any other event, such as a tool call, a
+usage update, or the completion, flushes the pending update first, so
+the order of events is kept. The raw upstream chunks emitted while
+realtime chat saving is on are never merged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Content updates that are merged: deltas are appended, snapshots replace each other
+COALESCED_EVENT_TYPES = ("chat:message:delta", "chat:completion")
+# The fields of the content snapshots of a streaming message
+SNAPSHOT_KEYS = frozenset({"content", "content_blocks"})
+
+
+def is_coalescible(event: Any) -> bool:
+    """Whether an event only updates the content of the streaming message."""
+    if not isinstance(event, dict) or event.get("type") not in COALESCED_EVENT_TYPES:
+        return False
+
+    data = event.get("data")
+    if not isinstance(data, dict) or not isinstance(data.get("content", ""), str):
+        return False
+    if event["type"] == "chat:message:delta":
+        return data.keys() == {"content"}
+    return bool(data) and data.keys() <= SNAPSHOT_KEYS
+
+
+class EventCoalescer:
+    """Merges consecutive content events passed to it before emitting them.
+
+    A pending update is emitted ``window`` seconds after its first event,
+    after ``max_events`` merged events, or before the next event that
+    cannot be merged with it. A window of 0 emits every event as it is.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[dict], Awaitable[Any]],
+        window: float = 0.03,
+        max_events: int = 50,
+    ) -> None:
+        self.emit = emit
+        self.window = window
+        self.max_events = max_events
+
+        self._pending: dict | None = None
+        self._pending_events = 0
+        self._timer: asyncio.Task | None = None
+        # Emits of the timer and of the caller must not overtake each other
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, event: dict) -> None:
+        if self.window <= 0 or not is_coalescible(event):
+            await self.flush()
+            await self._emit(event)
+            return
+
+        if self._pending is not None and self._pending["type"] != event["type"]:
+            await self.flush()
+
+        if self._pending is None:
+            self._pending = {"type": event["type"], "data": dict(event["data"])}
+            self._pending_events = 1
+            self._timer = asyncio.create_task(self._flush_later())
+        else:
+            if event["type"] == "chat:message:delta":
+                self._pending["data"]["content"] += event["data"]["content"]
+            else:
+                # The latest value of each field, as a client applying every snapshot would end up with
+                self._pending["data"].update(event["data"])
+            self._pending_events += 1
+
+        if self.max_events and self._pending_events >= self.max_events:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Emit the pending update, if any."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        event, self._pending = self._pending, None
+        self._pending_events = 0
+        if event is not None:
+            await self._emit(event)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    async def _emit(self, event: dict) -> None:
+        async with self._lock:
+            await self.emit(event)
@@ -0,0 +1,126 @@
+"""Write-behind persistence of streaming messages.
+
+Saving a message rewrites the whole chat, so saving it for every delta
+costs O(tokens x chat size). Updates are coalesced instead and written
+at most once per time window or amount of new content.
+
+Durability: until a pending update is written, it only exists in memory.
+If the process dies, at most the content streamed during the last
+``interval`` seconds or the last ``max_chars`` characters is lost.
+An interval of 0 writes every update as it happens.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class PersistenceStats:
+    """Counters of message updates and the writes they caused."""
+
+    updates: int = 0
+    writes: int = 0
+
+    @property
+    def writes_avoided(self) -> int:
+        return max(self.updates - self.writes, 0)
+
+
+# Totals over all streamed messages of this process
+persistence_stats = PersistenceStats()
+
+
+class MessagePersister:
+    """Coalesces the saves of one streaming message.
+
+    ``update()`` records that the message changed. The message returned by
+    ``snapshot`` is written once ``interval`` seconds passed or ``max_chars``
+    characters were added since the last write. A pending update is also
+    written when the interval ends without further updates, and on
+    ``flush()``, which must be called when the stream completes, fails or
+    is cancelled.
+    """
+
+    def __init__(
+        self,
+        storage: Any,
+        chat_id: str,
+        message_id: str,
+        snapshot: Callable[[], dict[str, Any]],
+        interval: float = 0.5,
+        max_chars: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.storage = storage
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.snapshot = snapshot
+        self.interval = interval
+        self.max_chars = max_chars
+        self.clock = clock
+
+        self.stats = PersistenceStats()
+
+        self._pending = False
+        self._pending_chars = 0
+        self._last_write: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    def update(self, chars: int = 0) -> None:
+        """Record a change of the message, adding ``chars`` characters."""
+        self.stats.updates += 1
+        persistence_stats.updates += 1
+
+        self._pending = True
+        self._pending_chars += chars
+
+        now = self.clock()
+        if (
+            self._last_write is None
+            or now - self._last_write >= self.interval
+            or (self.max_chars and self._pending_chars >= self.max_chars)
+        ):
+            self._write()
+        elif self._timer is None:
+            self._schedule(self._last_write + self.interval - now)
+
+    def flush(self) -> None:
+        """Write the pending update, if any."""
+        if self._pending:
+            self._write()
+
+    def _schedule(self, delay: float) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._timer = loop.call_later(delay, self.flush)
+
+    def _write(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._pending = False
+        self._pending_chars = 0
+        self._last_write = self.clock()
+
+        self.stats.writes += 1
+        persistence_stats.writes += 1
+
+        try:
+            self.storage.upsert_message_to_chat_by_id_and_message_id(
+                self.chat_id,
+                self.message_id,
+                self.snapshot(),
+            )
+        except Exception as e:
+            log.exception(f"Error saving message {self.message_id}: {e}")
@@ -106,33 +106,34 @@ class ReasoningHandler:
             self.blocks.append_text(text)
             return text
 
-        result = self._tag_parser.parse_chunk(text)
-
-        if result.emit_text:
-            self.blocks.append_text(result.emit_text)
-
-        if result.tag_started:
-            tag_type = result.tag_started.content_type
-            if tag_type == "solution":
-                self.blocks.ensure_text_block()
-            else:
-                self.blocks.start_reasoning(
-                    start_tag=result.tag_started.start_tag,
-                    end_tag=result.tag_started.end_tag,
-                    attributes=result.attributes,
-                    source="tag",
-                )
-
-        if result.tag_content:
-            current = self.blocks.current_block
-            if current and hasattr(current, "content"):
-                current.content += result.tag_content
-
-        if result.tag_ended:
-            if self.blocks.is_in_reasoning():
-                self.blocks.end_reasoning()
-
-        return result.emit_text
+        emitted = ""
+        for result in self._tag_parser.parse(text):
+            if result.emit_text:
+                self.blocks.append_text(result.emit_text)
+                emitted += result.emit_text
+
+            if result.tag_started:
+                tag_type = result.tag_started.content_type
+                if tag_type == "solution":
+                    self.blocks.ensure_text_block()
+                else:
+                    self.blocks.start_reasoning(
+                        start_tag=result.tag_started.start_tag,
+                        end_tag=result.tag_started.end_tag,
+                        attributes=result.attributes,
+                        source="tag",
+                    )
+
+            if result.tag_content:
+                current = self.blocks.current_block
+                if current and hasattr(current, "content"):
+                    current.content += result.tag_content
+
+            if result.tag_ended:
+                if self.blocks.is_in_reasoning():
+                    self.blocks.end_reasoning()
+
+        return emitted
 
     def finalize(self) -> None:
         """Finalize any pending reasoning blocks."""
@@ -10,6 +10,8 @@ import html
 import json
 from typing import Any
 
+from .content_blocks import AnyBlock, BlockType, ContentBlock, ContentBlockManager, ReasoningBlock
+
 
 def serialize_content_blocks(content_blocks: list[dict[str, Any]], raw: bool = False) -> str:
     """Serialize content blocks to display string.
@@ -22,72 +24,205 @@ def serialize_content_blocks(content_blocks: list[dict[str, Any]], raw: bool = F
         Formatted string for display
 
     """
-    content = ""
+    return "".join(_serialize_block(block, raw) for block in content_blocks).strip()
 
-    for block in content_blocks:
-        block_type = block.get("type", "text")
 
-        if block_type == "text":
-            block_content = block.get("content", "").strip()
-            if block_content:
-                content = f"{content}{block_content}\n"
+def _serialize_block(block: dict[str, Any], raw: bool = False) -> str:
+    """Serialize a single content block.
 
-        elif block_type == "tool_calls":
-            tool_calls = block.get("content", [])
-            results = block.get("results", [])
+    Every non-empty block serializes to a string ending in a newline, so the
+    output of a block never depends on the blocks before it.
+    """
+    block_type = block.get("type", "text")
 
-            if content and not content.endswith("\n"):
-                content += "\n"
+    if block_type in ("text", "solution"):
+        block_content = block.get("content", "").strip()
+        return f"{block_content}\n" if block_content else ""
 
-            if not raw:
-                content += _serialize_tool_calls(tool_calls, results)
+    if block_type == "tool_calls":
+        if raw:
+            return ""
+        return _serialize_tool_calls(block.get("content", []), block.get("results", []))
 
-        elif block_type == "reasoning":
-            reasoning_content = html.escape(
-                "\n".join(
-                    (f"> {line}" if not line.startswith(">") else line)
-                    for line in block.get("content", "").splitlines()
-                )
-            )
+    if block_type == "reasoning":
+        if raw:
+            return f"{block.get('start_tag', '')}{block['content']}{block.get('end_tag', '')}\n"
+        return _serialize_reasoning(_quote_reasoning(block.get("content", "")), block.get("duration"))
 
-            duration = block.get("duration")
-            start_tag = block.get("start_tag", "")
-            end_tag = block.get("end_tag", "")
-
-            if content and not content.endswith("\n"):
-                content += "\n"
-
-            if duration is not None:
-                if raw:
-                    content = f"{content}{start_tag}{block['content']}{end_tag}\n"
-                else:
-                    content = (
-                        f'{content}<details type="reasoning" done="true" '
-                        f'duration="{duration}">\n'
-                        f"<summary>Thought for {duration} seconds</summary>\n"
-                        f"{reasoning_content}\n</details>\n"
-                    )
-            else:
-                if raw:
-                    content = f"{content}{start_tag}{block['content']}{end_tag}\n"
-                else:
-                    content = (
-                        f'{content}<details type="reasoning" done="false">\n'
-                        f"<summary>Thinking\u2026</summary>\n"
-                        f"{reasoning_content}\n</details>\n"
-                    )
+    block_content = str(block.get("content", "")).strip()
+    return f"{block_type}: {block_content}\n" if block_content else ""
 
-        elif block_type == "solution":
-            block_content = block.get("content", "").strip()
-            if block_content:
-                content = f"{content}{block_content}\n"
 
-        else:
-            block_content = str(block.get("content", "")).strip()
-            if block_content:
-                content = f"{content}{block_type}: {block_content}\n"
+def _quote_reasoning(content: str) -> str:
+    """Quote and escape reasoning content line by line."""
+    return html.escape("\n".join((f"> {line}" if not line.startswith(">") else line) for line in content.splitlines()))
 
-    return content.strip()
+
+def _serialize_reasoning(reasoning_content: str, duration: int | None) -> str:
+    """Wrap quoted reasoning content in a details element."""
+    if duration is not None:
+        return (
+            f'<details type="reasoning" done="true" duration="{duration}">\n'
+            f"<summary>Thought for {duration} seconds</summary>\n"
+            f"{reasoning_content}\n</details>\n"
+        )
+    return (
+        f'<details type="reasoning" done="false">\n<summary>Thinking\u2026</summary>\n{reasoning_content}\n</details>\n'
+    )
+
+
+class IncrementalSerializer:
+    """Serialize the blocks of a ContentBlockManager while they are streamed.
+
+    Produces the same output as ``serialize_content_blocks(manager.to_list())``
+    without re-serializing the whole response for every delta. Only the
+    current block is ever mutated while streaming, so the serialized form of
+    every block before it is cached as a prefix, and the current text or
+    reasoning block is tracked incrementally from the characters appended
+    since the previous call.
+    """
+
+    def __init__(self, block_manager: ContentBlockManager, raw: bool = False) -> None:
+        self.blocks = block_manager
+        self.raw = raw
+
+        # Serialized form of every block before the current one
+        self._finalized: list[tuple[AnyBlock, str]] = []
+        self._prefix = ""
+
+        # Current text block: visible (stripped) span of its content
+        self._text_block: ContentBlock | None = None
+        self._text_scanned = 0
+        self._text_start: int | None = None
+        self._text_end = 0
+
+        # Current reasoning block: quoted lines up to the last newline
+        self._reasoning_block: ReasoningBlock | None = None
+        self._reasoning_scanned = 0
+        self._reasoning_quoted = ""
+        self._reasoning_has_lines = False
+
+        # State at the last consume_delta() call
+        self._emitted: tuple[int, AnyBlock | None, int] | None = None
+
+    def serialize(self) -> str:
+        """Serialize all blocks to a display string."""
+        blocks = self.blocks.blocks
+        self._sync_prefix(blocks)
+        current = self._serialize(blocks[-1]) if blocks else ""
+        return f"{self._prefix}{current}".strip()
+
+    def consume_delta(self) -> str | None:
+        """Return the text appended to the serialized content since the last call.
+
+        Returns None when the content changed in any other way (a new block,
+        reasoning, tool calls) and a full snapshot has to be sent instead. The
+        very first call always returns None.
+        """
+        blocks = self.blocks.blocks
+        self._sync_prefix(blocks)
+
+        current = blocks[-1] if blocks else None
+        end = 0
+        if isinstance(current, ContentBlock) and current.type == BlockType.TEXT:
+            self._scan_text(current)
+            end = self._text_end
+
+        previous = self._emitted
+        self._emitted = (len(blocks), current, end)
+
+        if previous is None or previous[:2] != (len(blocks), current):
+            return None
+        if not (isinstance(current, ContentBlock) and current.type == BlockType.TEXT):
+            return None
+
+        previous_end = previous[2]
+        if previous_end == end:
+            return ""
+        if previous_end:
+            return current.content[previous_end:end]
+        # The previous snapshot had its trailing newline stripped along with the empty text block
+        if self._prefix:
+            return None
+        return current.content[self._text_start : end]
+
+    def _sync_prefix(self, blocks: list[AnyBlock]) -> None:
+        finalized = len(blocks) - 1
+
+        valid = 0
+        while valid < min(finalized, len(self._finalized)) and self._finalized[valid][0] is blocks[valid]:
+            valid += 1
+
+        if valid < len(self._finalized):
+            del self._finalized[valid:]
+            self._prefix = "".join(segment for _, segment in self._finalized)
+
+        for block in blocks[valid:finalized]:
+            segment = self._serialize(block)
+            self._finalized.append((block, segment))
+            self._prefix += segment
+
+    def _serialize(self, block: AnyBlock) -> str:
+        if isinstance(block, ContentBlock) and block.type == BlockType.TEXT:
+            self._scan_text(block)
+            if self._text_start is None or self._text_end <= self._text_start:
+                return ""
+            return f"{block.content[self._text_start : self._text_end]}\n"
+
+        if isinstance(block, ReasoningBlock) and not self.raw:
+            return _serialize_reasoning(self._scan_reasoning(block), block.duration)
+
+        return _serialize_block(block.to_dict(), self.raw)
+
+    def _scan_text(self, block: ContentBlock) -> None:
+        # Text is only ever appended, so only the new characters need to be looked at
+        if block is not self._text_block or len(block.content) < self._text_scanned:
+            self._text_block = block
+            self._text_scanned = 0
+            self._text_start = None
+            self._text_end = 0
+
+        appended = block.content[self._text_scanned :]
+        if not appended:
+            return
+
+        if self._text_start is None:
+            stripped = appended.lstrip()
+            if stripped:
+                self._text_start = self._text_scanned + len(appended) - len(stripped)
+
+        if self._text_start is not None:
+            visible = appended.rstrip()
+            if visible:
+                self._text_end = self._text_scanned + len(visible)
+
+        self._text_scanned = len(block.content)
+
+    def _scan_reasoning(self, block: ReasoningBlock) -> str:
+        if block is not self._reasoning_block or len(block.content) < self._reasoning_scanned:
+            self._reasoning_block = block
+            self._reasoning_scanned = 0
+            self._reasoning_quoted = ""
+            self._reasoning_has_lines = False
+
+        content = block.content
+
+        # Lines are quoted once they are complete; only the trailing partial line is redone
+        newline = content.rfind("\n", self._reasoning_scanned)
+        if newline != -1:
+            lines = content[self._reasoning_scanned : newline + 1]
+            if lines.splitlines():
+                quoted = _quote_reasoning(lines)
+                self._reasoning_quoted = f"{self._reasoning_quoted}\n{quoted}" if self._reasoning_has_lines else quoted
+                self._reasoning_has_lines = True
+            self._reasoning_scanned = newline + 1
+
+        tail = content[self._reasoning_scanned :]
+        if not tail.splitlines():
+            return self._reasoning_quoted
+
+        quoted_tail = _quote_reasoning(tail)
+        return f"{self._reasoning_quoted}\n{quoted_tail}" if self._reasoning_has_lines else quoted_tail
 
 
 def _serialize_tool_calls(tool_calls: list[dict[str, Any]], results: list[dict[str, Any]]) -> str:
@@ -191,3 +326,33 @@ def convert_content_blocks_to_messages(content_blocks: list[dict[str, Any]], raw
             )
 
     return messages
+
+
+class IncrementalMessageBuilder:
+    """Build the messages of the follow-up requests of a tool calling loop.
+
+    Produces the same messages as ``[*messages, *convert_content_blocks_to_messages(blocks, raw)]``
+    for the growing content blocks of a response. The blocks up to a tool
+    calls block with its results do not change anymore, so their messages
+    are appended once and only the blocks after the last tool calls block
+    are converted again for the next request.
+    """
+
+    def __init__(self, messages: list[dict[str, Any]], raw: bool = False) -> None:
+        self.raw = raw
+        self._messages = list(messages)
+        # Number of blocks whose messages are in the list
+        self._converted = 0
+
+    def build(self, content_blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        end = self._converted
+        for position in range(len(content_blocks) - 1, self._converted - 1, -1):
+            if content_blocks[position].get("type") == "tool_calls":
+                end = position + 1
+                break
+
+        if end > self._converted:
+            self._messages.extend(convert_content_blocks_to_messages(content_blocks[self._converted : end], self.raw))
+            self._converted = end
+
+        return [*self._messages, *convert_content_blocks_to_messages(content_blocks[end:], self.raw)]
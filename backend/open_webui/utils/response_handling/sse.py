@@ -0,0 +1,150 @@
+"""Server-sent event chunks passed between routers and the middleware.
+
+Upstream chunks are kept as the raw JSON payload of their SSE data line
+and only parsed when the middleware looks at them. Encoding back to SSE
+happens once, when a response is actually sent to the client.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+from starlette.responses import StreamingResponse
+
+SSE_DONE = "[DONE]"
+
+
+class SSEChunk:
+    """The data payload of a server-sent event, parsed on first access."""
+
+    __slots__ = ("_data", "_raw")
+
+    def __init__(self, raw: str | None = None, data: Any = None) -> None:
+        self._raw = raw
+        self._data = data
+
+    @classmethod
+    def done(cls) -> SSEChunk:
+        return cls(SSE_DONE)
+
+    @property
+    def is_done(self) -> bool:
+        return self._raw == SSE_DONE
+
+    @property
+    def raw(self) -> str:
+        if self._raw is None:
+            self._raw = json.dumps(self._data)
+        return self._raw
+
+    @property
+    def data(self) -> Any:
+        if self._data is None and self._raw is not None:
+            self._data = json.loads(self._raw)
+        return self._data
+
+    def encode(self) -> str:
+        return f"data: {self.raw}\n\n"
+
+
+async def iter_sse_chunks(lines: AsyncIterable[str]) -> AsyncIterator[SSEChunk]:
+    """Group the lines of an SSE stream into chunks without parsing their payloads."""
+    data_lines: list[str] = []
+
+    async for line in lines:
+        if not line:
+            # A blank line dispatches the event
+            if data_lines:
+                yield SSEChunk("\n".join(data_lines))
+                data_lines = []
+            continue
+
+        if line.startswith("data:"):
+            data_lines.append(line[len("data:") :].strip())
+
+    if data_lines:
+        yield SSEChunk("\n".join(data_lines))
+
+
+class ChunkStreamingResponse(StreamingResponse):
+    """Streaming response whose body is a sequence of SSE chunks.
+
+    Code in the same process reads the chunks from ``chunk_iterator``. The
+    SSE encoding only happens when the response is sent to the client
+    through ``body_iterator``. Both share one underlying stream, so only
+    one of them may be consumed.
+    """
+
+    def __init__(self, chunks: AsyncIterator[SSEChunk], **kwargs: Any) -> None:
+        kwargs.setdefault("media_type", "text/event-stream")
+        self.chunk_iterator = chunks
+        super().__init__(self._encode(chunks), **kwargs)
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Starlette stops reading when the client disconnects, but leaves the body open
+            await aclose_stream(self.body_iterator)
+
+    @staticmethod
+    async def _encode(chunks: AsyncIterator[SSEChunk]) -> AsyncIterator[str]:
+        try:
+            async for chunk in chunks:
+                yield chunk.encode()
+        finally:
+            await aclose_stream(chunks)
+
+
+async def aclose_stream(stream: Any) -> None:
+    """Close an async generator that may not have been read to the end.
+
+    A generator that is left suspended only runs its cleanup when it is
+    garbage collected, so the upstream request behind it stays open until
+    then.
+    """
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def aclose_response(response: Any) -> None:
+    """Close the body of a streaming response that may not have been read to the end."""
+    await aclose_stream(getattr(response, "chunk_iterator", None))
+    await aclose_stream(getattr(response, "body_iterator", None))
+
+
+async def iter_sse_data(response: Any) -> AsyncIterator[Any]:
+    """Yield the parsed data of every chunk of a streaming chat completion.
+
+    Chunks of a ChunkStreamingResponse are used as they are. Other
+    responses are decoded from their SSE body, and lines that are not
+    valid JSON data lines are skipped.
+    """
+    if isinstance(response, ChunkStreamingResponse):
+        async for chunk in response.chunk_iterator:
+            if chunk.is_done:
+                continue
+            try:
+                data = chunk.data
+            except json.JSONDecodeError:
+                continue
+            yield data
+        return
+
+    async for line in response.body_iterator:
+        line = line.decode("utf-8", "replace") if isinstance(line, bytes) else line
+
+        if not line.strip() or not line.startswith("data:"):
+            continue
+
+        data = line[len("data:") :].strip()
+        if data.startswith(SSE_DONE):
+            continue
+
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            continue
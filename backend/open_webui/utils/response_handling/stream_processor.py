@@ -14,7 +14,8 @@ from typing import Any
 
 from .content_blocks import ContentBlockManager, ToolCallsBlock
 from .reasoning_handler import ReasoningConfig, ReasoningHandler
-from .serialization import serialize_content_blocks
+from .serialization import IncrementalSerializer
+from .tool_calls import ToolCallAccumulator
 
 log = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class StreamConfig:
     """Configuration for stream processing."""
 
     delta_chunk_size: int = 1
+    append_deltas: bool = False
     enable_realtime_save: bool = False
     reasoning_config: ReasoningConfig = field(default_factory=ReasoningConfig)
 
@@ -62,10 +64,11 @@ class StreamProcessor:
 
         self.blocks = ContentBlockManager()
         self.reasoning = ReasoningHandler(config.reasoning_config, self.blocks)
+        self.serializer = IncrementalSerializer(self.blocks)
 
         self._delta_count = 0
-        self._last_delta_data: dict[str, Any] | None = None
-        self._current_tool_calls: list[dict[str, Any]] = []
+        self._delta_pending = False
+        self._current_tool_calls = ToolCallAccumulator()
         self._accumulated_tool_calls: list[list[dict[str, Any]]] = []
 
     async def process_stream(self, response_iterator: AsyncIterator[bytes | str]) -> None:
@@ -78,8 +81,8 @@ class StreamProcessor:
         self.reasoning.finalize()
 
         if self._current_tool_calls:
-            self._accumulated_tool_calls.append(self._current_tool_calls)
-            self._current_tool_calls = []
+            self._accumulated_tool_calls.append(self._current_tool_calls.finalize())
+            self._current_tool_calls = ToolCallAccumulator()
 
     async def _process_line(self, line: bytes | str) -> None:
         """Process a single SSE line."""
@@ -146,44 +149,35 @@ class StreamProcessor:
 
     def _accumulate_tool_calls(self, delta_tool_calls: list[dict[str, Any]]) -> None:
         """Accumulate streaming tool call deltas."""
-        for delta_tc in delta_tool_calls:
-            index = delta_tc.get("index")
-            if index is None:
-                continue
-
-            existing = next(
-                (tc for tc in self._current_tool_calls if tc.get("index") == index),
-                None,
-            )
-
-            if existing is None:
-                delta_tc.setdefault("function", {})
-                delta_tc["function"].setdefault("name", "")
-                delta_tc["function"].setdefault("arguments", "")
-                self._current_tool_calls.append(delta_tc)
-            else:
-                if name := delta_tc.get("function", {}).get("name"):
-                    existing["function"]["name"] += name
-                if args := delta_tc.get("function", {}).get("arguments"):
-                    existing["function"]["arguments"] += args
+        self._current_tool_calls.add(delta_tool_calls)
 
     async def _queue_delta_emit(self) -> None:
-        """Queue a delta for emission with chunking."""
+        """Queue a delta for emission with chunking.
+
+        Content is only serialized when the pending deltas are flushed.
+        """
         self._delta_count += 1
-        self._last_delta_data = {
-            "content": serialize_content_blocks(self.blocks.to_list()),
-            "content_blocks": self.blocks.to_list(),
-        }
+        self._delta_pending = True
 
         if self._delta_count >= self.config.delta_chunk_size:
             await self._flush_deltas()
 
     async def _flush_deltas(self) -> None:
         """Flush pending delta emissions."""
-        if self._last_delta_data:
-            await self.emit({"type": "chat:completion", "data": self._last_delta_data})
-            self._delta_count = 0
-            self._last_delta_data = None
+        if not self._delta_pending:
+            return
+
+        self._delta_count = 0
+        self._delta_pending = False
+
+        if self.config.append_deltas:
+            delta = self.serializer.consume_delta()
+            if delta is not None:
+                if delta:
+                    await self.emit({"type": "chat:message:delta", "data": {"content": delta}})
+                return
+
+        await self.emit_current_state()
 
     async def _handle_model_selection(self, data: dict[str, Any]) -> None:
         """Handle model selection in response."""
@@ -202,8 +196,8 @@ class StreamProcessor:
     def get_pending_tool_calls(self) -> list[list[dict[str, Any]]]:
         """Get accumulated tool calls for processing."""
         if self._current_tool_calls:
-            self._accumulated_tool_calls.append(self._current_tool_calls)
-            self._current_tool_calls = []
+            self._accumulated_tool_calls.append(self._current_tool_calls.finalize())
+            self._current_tool_calls = ToolCallAccumulator()
         return self._accumulated_tool_calls
 
     def add_tool_calls_block(self, tool_calls: list[dict[str, Any]]) -> ToolCallsBlock:
@@ -219,7 +213,7 @@ class StreamProcessor:
 
     def get_content(self) -> str:
         """Get serialized content."""
-        return serialize_content_blocks(self.blocks.to_list())
+        return self.serializer.serialize()
 
     def get_content_blocks(self) -> list[dict[str, Any]]:
         """Get content blocks as dicts."""
@@ -4,8 +4,9 @@ Handles the case where tags arrive split across SSE chunks:
 - Chunk 1: "Hello <th"
 - Chunk 2: "ink>reasoning</think>world"
 
-The parser buffers potential partial tags at chunk boundaries and
-retries matching when more data arrives.
+Start and end tags are matched with precompiled Aho-Corasick automata
+whose state is carried across chunks, so every character is examined
+once and only the characters of a possible partial tag are held back.
 """
 
 from __future__ import annotations
@@ -13,6 +14,9 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 
+# Longest attribute section accepted in a start tag, e.g. <think type="deep">
+MAX_TAG_ATTRIBUTES_LENGTH = 128
+
 
 @dataclass
 class TagDefinition:
@@ -34,6 +38,70 @@ class ParseResult:
     attributes: dict[str, str] = field(default_factory=dict)
 
 
+class TagAutomaton:
+    """Aho-Corasick automaton over a set of tags.
+
+    With ``attributes`` set, tags shaped like ``<name>`` are added as the
+    head ``<name`` and only complete when followed by ``>`` or by
+    whitespace, attributes and ``>``, so ``<think>`` does not match
+    ``<thinking>``. All other tags are matched literally.
+    """
+
+    def __init__(self, tags: list[tuple[str, TagDefinition]], attributes: bool = False) -> None:
+        self.transitions: list[dict[str, int]] = [{}]
+        self.depth = [0]
+        # Longest tag ending at a state, directly or through its suffix links
+        self.exact: list[tuple[TagDefinition, int] | None] = [None]
+        self.angle: list[tuple[TagDefinition, int] | None] = [None]
+
+        children: list[dict[str, int]] = [{}]
+        for tag_string, tag in tags:
+            is_angle = attributes and len(tag_string) > 2 and tag_string.startswith("<") and tag_string.endswith(">")
+            head = tag_string[:-1] if is_angle else tag_string
+
+            state = 0
+            for char in head:
+                if char not in children[state]:
+                    children.append({})
+                    self.transitions.append({})
+                    self.depth.append(self.depth[state] + 1)
+                    self.exact.append(None)
+                    self.angle.append(None)
+                    children[state][char] = len(children) - 1
+                state = children[state][char]
+
+            outputs = self.angle if is_angle else self.exact
+            if outputs[state] is None:
+                outputs[state] = (tag, len(head))
+
+        alphabet = {char for edges in children for char in edges}
+        # Used to skip ahead while no tag is partially matched
+        first_chars = "".join(re.escape(char) for char in sorted(children[0]))
+        self.first_chars = re.compile(f"[{first_chars}]" if first_chars else "(?!)")
+
+        # Breadth-first over the trie to resolve failure links into a full transition table
+        fail = [0] * len(children)
+        queue = []
+        for char in alphabet:
+            child = children[0].get(char)
+            self.transitions[0][char] = child or 0
+            if child:
+                queue.append(child)
+
+        for state in queue:
+            link = fail[state]
+            self.exact[state] = self.exact[state] or self.exact[link]
+            self.angle[state] = self.angle[state] or self.angle[link]
+            for char in alphabet:
+                child = children[state].get(char)
+                if child:
+                    fail[child] = self.transitions[link][char] if self.depth[child] > 1 else 0
+                    self.transitions[state][char] = child
+                    queue.append(child)
+                else:
+                    self.transitions[state][char] = self.transitions[link][char]
+
+
 class StreamingTagParser:
     """Handles tag detection across streaming chunks.
 
@@ -50,51 +118,35 @@ class StreamingTagParser:
 
     def __init__(self, tag_definitions: list[TagDefinition]) -> None:
         self.tags = tag_definitions
+        self._start_automaton = TagAutomaton([(tag.start_tag, tag) for tag in self.tags], attributes=True)
+        self._end_automata = {tag.end_tag: TagAutomaton([(tag.end_tag, tag)]) for tag in self.tags if tag.end_tag}
+
         self._buffer = ""
         self._in_tag: TagDefinition | None = None
-        self._tag_content = ""
-
-        self._start_patterns: list[tuple[re.Pattern[str], TagDefinition]] = []
-        for tag in self.tags:
-            if tag.start_tag.startswith("<") and tag.start_tag.endswith(">"):
-                base = tag.start_tag[1:-1]
-                pattern = rf"<{re.escape(base)}(\s[^>]*)?>?"
-            else:
-                pattern = re.escape(tag.start_tag)
-            self._start_patterns.append((re.compile(pattern), tag))
-
-        self._max_prefix_len = max(len(t.start_tag) for t in self.tags) + 20
-
-    def _could_be_partial_tag(self, text: str) -> bool:
-        """Check if text ends with something that could be a partial tag."""
-        if not text:
-            return False
-
-        for tag in self.tags:
-            start = tag.start_tag
-            for i in range(1, len(start)):
-                if text.endswith(start[:i]):
-                    return True
-
-        last_lt = text.rfind("<")
-        if last_lt != -1:
-            after_lt = text[last_lt:]
-            if ">" not in after_lt:
-                return True
-
-        return False
-
-    def _find_buffer_split_point(self, text: str) -> int:
-        """Find where to split text for buffering potential partial tags."""
-        for i in range(min(self._max_prefix_len, len(text)), 0, -1):
-            suffix = text[-i:]
-            if self._could_be_partial_tag(suffix):
-                return len(text) - i
-        return len(text)
+        self._tag_content: list[str] = []
+
+        # Automaton state, and the start tag whose attributes are being read
+        self._state = 0
+        self._attributes_tag: tuple[TagDefinition, int] | None = None
+        self._attributes_length = 0
+
+    def parse(self, chunk: str) -> list[ParseResult]:
+        """Parse a streaming chunk into results in stream order.
+
+        Each result holds, in order, the text before a tag, the tag start,
+        the tag content and whether the tag ended. A new result starts after
+        every end tag, so text and tags following a closed tag in the same
+        chunk are kept. ``tag_content`` only contains content not returned
+        by a previous call.
+        """
+        return [result for result, _ in self._parse(chunk)]
 
     def parse_chunk(self, chunk: str) -> ParseResult:
         """Parse a streaming chunk, handling potential tag boundaries.
 
+        Only the first result of ``parse()`` is returned, and ``tag_content``
+        holds the whole tag content once the tag ended.
+
         Returns:
             ParseResult with:
             - emit_text: text safe to emit now
@@ -104,103 +156,157 @@ class StreamingTagParser:
             - attributes: attributes extracted from tag
 
         """
-        content = self._buffer + chunk
-        self._buffer = ""
-
-        if self._in_tag:
-            return self._parse_inside_tag(content)
-        return self._parse_outside_tag(content)
-
-    def _parse_outside_tag(self, content: str) -> ParseResult:
-        """Parse content when not inside a tag."""
-        result = ParseResult()
-
-        earliest_match = None
-        earliest_pos = len(content)
-        matched_tag = None
-
-        for pattern, tag in self._start_patterns:
-            match = pattern.search(content)
-            if match and match.start() < earliest_pos:
-                earliest_match = match
-                earliest_pos = match.start()
-                matched_tag = tag
-
-        if earliest_match and matched_tag:
-            result.emit_text = content[:earliest_pos]
+        results = self._parse(chunk)
+        if not results:
+            return ParseResult()
 
-            try:
-                attr_str = earliest_match.group(1)
-                if attr_str:
-                    result.attributes = self._extract_attributes(attr_str)
-            except IndexError:
-                pass
+        result, tag_content = results[0]
+        if tag_content is not None:
+            result.tag_content = tag_content
+        return result
 
-            result.tag_started = matched_tag
-            self._in_tag = matched_tag
+    def _parse(self, chunk: str) -> list[tuple[ParseResult, str | None]]:
+        # Held back characters are not rescanned, the automaton state already accounts for them
+        text = self._buffer + chunk
+        pos = len(self._buffer)
+        out = 0
 
-            after_tag = content[earliest_match.end() :]
+        results: list[tuple[ParseResult, str | None]] = []
+        result = ParseResult()
 
-            end_result = self._parse_inside_tag(after_tag)
-            if end_result.tag_ended:
+        while pos < len(text):
+            if self._in_tag:
+                automaton = self._end_automata.get(self._in_tag.end_tag)
+                if automaton is None:
+                    pos = len(text)
+                    break
+
+                end_tag = self._in_tag.end_tag
+                matched = False
+                if self._state == 0:
+                    # Nothing is partially matched, let str.find look for the whole end tag
+                    match_start = text.find(end_tag, pos)
+                    if match_start != -1:
+                        pos = match_start + len(end_tag)
+                        matched = True
+                    else:
+                        # Only the last characters can still be the beginning of the end tag
+                        pos = max(pos, len(text) - len(end_tag) + 1)
+
+                while not matched and pos < len(text):
+                    self._state = automaton.transitions[self._state].get(text[pos], 0)
+                    pos += 1
+                    matched = automaton.exact[self._state] is not None
+
+                if not matched:
+                    continue
+                match_start = pos - len(end_tag)
+
+                self._add_tag_content(result, text[out:match_start])
                 result.tag_ended = True
-                result.tag_content = end_result.tag_content
-                if end_result.emit_text:
-                    result.emit_text = result.emit_text or ""
+                results.append((result, "".join(self._tag_content)))
+                result = ParseResult()
+
                 self._in_tag = None
-            else:
-                self._tag_content = after_tag
-                split = self._find_end_tag_split(after_tag)
-                result.tag_content = after_tag[:split]
-                self._buffer = after_tag[split:]
+                self._tag_content = []
+                self._state = 0
+                out = pos
+                continue
+
+            if self._attributes_tag:
+                tag, head_length = self._attributes_tag
+                match_start = pos - self._attributes_length
+                limit = match_start + head_length + 1 + MAX_TAG_ATTRIBUTES_LENGTH
+
+                end = text.find(">", pos, limit)
+                lt = text.find("<", pos, end if end != -1 else limit)
+                if lt == -1 and end != -1:
+                    attributes = self._extract_attributes(text[match_start + head_length : end])
+                    pos = end + 1
+                    result, out = self._start_tag(text, out, match_start, pos, tag, attributes, result)
+                elif lt == -1 and len(text) < limit:
+                    self._attributes_length += len(text) - pos
+                    pos = len(text)
+                else:
+                    # Not a tag after all, rescan everything after its first character
+                    self._attributes_tag = None
+                    self._state = 0
+                    pos = match_start + 1
+                continue
+
+            automaton = self._start_automaton
+            if self._state == 0:
+                match = automaton.first_chars.search(text, pos)
+                if not match:
+                    pos = len(text)
+                    break
+                pos = match.start()
+
+            char = text[pos]
+            angle = automaton.angle[self._state]
+            if angle and (char == ">" or char.isspace()):
+                tag, head_length = angle
+                match_start = pos - head_length
+                pos += 1
+                if char == ">":
+                    result, out = self._start_tag(text, out, match_start, pos, tag, {}, result)
+                else:
+                    self._attributes_tag = angle
+                    self._attributes_length = head_length + 1
+                continue
+
+            self._state = automaton.transitions[self._state].get(char, 0)
+            pos += 1
+
+            exact = automaton.exact[self._state]
+            if exact:
+                tag, length = exact
+                result, out = self._start_tag(text, out, pos - length, pos, tag, {}, result)
+
+        # Hold back whatever could still turn out to be part of a tag
+        if self._attributes_tag:
+            held = len(text) - self._attributes_length
+        elif self._in_tag:
+            automaton = self._end_automata.get(self._in_tag.end_tag)
+            held = len(text) - (automaton.depth[self._state] if automaton else 0)
         else:
-            split = self._find_buffer_split_point(content)
-            result.emit_text = content[:split]
-            self._buffer = content[split:]
-
-        return result
-
-    def _parse_inside_tag(self, content: str) -> ParseResult:
-        """Parse content when inside a tag."""
-        result = ParseResult()
+            held = len(text) - self._start_automaton.depth[self._state]
 
-        if not self._in_tag:
-            result.emit_text = content
-            return result
-
-        end_tag = self._in_tag.end_tag
-        end_pos = content.find(end_tag)
-
-        if end_pos != -1:
-            result.tag_content = self._tag_content + content[:end_pos]
-            result.tag_ended = True
-            self._in_tag = None
-            self._tag_content = ""
-
-            after_end = content[end_pos + len(end_tag) :]
-            if after_end:
-                sub_result = self._parse_outside_tag(after_end)
-                result.emit_text = sub_result.emit_text
-                if sub_result.tag_started:
-                    pass
+        if self._in_tag:
+            self._add_tag_content(result, text[out:held])
         else:
-            split = self._find_end_tag_split(content)
-            result.tag_content = content[:split]
-            self._tag_content += content[:split]
-            self._buffer = content[split:]
-
-        return result
-
-    def _find_end_tag_split(self, text: str) -> int:
-        """Find split point when looking for end tag."""
-        if not self._in_tag:
-            return len(text)
-
-        end_tag = self._in_tag.end_tag
-        for i in range(1, len(end_tag)):
-            if text.endswith(end_tag[:i]):
-                return len(text) - i
-        return len(text)
+            result.emit_text += text[out:held]
+        self._buffer = text[held:]
+
+        if result.emit_text or result.tag_started or result.tag_content or not results:
+            results.append((result, None))
+        return results
+
+    def _start_tag(
+        self,
+        text: str,
+        out: int,
+        match_start: int,
+        match_end: int,
+        tag: TagDefinition,
+        attributes: dict[str, str],
+        result: ParseResult,
+    ) -> tuple[ParseResult, int]:
+        """Start a tag matched at text[match_start:match_end]."""
+        result.emit_text += text[out:match_start]
+        result.tag_started = tag
+        result.attributes = attributes
+
+        self._in_tag = tag
+        self._tag_content = []
+        self._state = 0
+        self._attributes_tag = None
+        return result, match_end
+
+    def _add_tag_content(self, result: ParseResult, content: str) -> None:
+        if content:
+            result.tag_content += content
+            self._tag_content.append(content)
 
     def _extract_attributes(self, attr_string: str) -> dict[str, str]:
         """Extract key="value" attributes from tag."""
@@ -215,13 +321,18 @@ class StreamingTagParser:
         """Flush any remaining buffered content."""
         content = self._buffer
         self._buffer = ""
+        self._state = 0
+        self._attributes_tag = None
         return content
 
     def reset(self) -> None:
         """Reset parser state."""
         self._buffer = ""
         self._in_tag = None
-        self._tag_content = ""
+        self._tag_content = []
+        self._state = 0
+        self._attributes_tag = None
+        self._attributes_length = 0
 
     def is_in_tag(self) -> bool:
         """Check if currently inside a tag."""
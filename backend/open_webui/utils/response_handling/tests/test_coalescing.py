@@ -0,0 +1,121 @@
+"""Tests for the socket event coalescer."""
+
+import asyncio
+
+from open_webui.utils.response_handling.coalescing import EventCoalescer, is_coalescible
+from open_webui.utils.response_handling.content_blocks import ContentBlockManager
+from open_webui.utils.response_handling.serialization import IncrementalSerializer
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+
+    async def __call__(self, event: dict) -> None:
+        self.events.append(event)
+
+
+def delta(content: str) -> dict:
+    return {"type": "chat:message:delta", "data": {"content": content}}
+
+
+def snapshot(content: str) -> dict:
+    return {"type": "chat:completion", "data": {"content": content}}
+
+
+class TestEventCoalescer:
+    """Test suite for EventCoalescer."""
+
+    def test_only_content_updates_are_coalescible(self):
+        """Test that events carrying more than the content and its blocks are never merged."""
+        assert is_coalescible(delta("a"))
+        assert is_coalescible(snapshot("a"))
+        assert is_coalescible({"type": "chat:completion", "data": {"content": "a", "content_blocks": []}})
+        assert not is_coalescible({"type": "chat:message:delta", "data": {"content": "a", "content_blocks": []}})
+        assert not is_coalescible({"type": "chat:completion", "data": {"content": "a", "done": True}})
+        assert not is_coalescible({"type": "chat:completion", "data": {"done": True}})
+        assert not is_coalescible({"type": "chat:completion", "data": {"choices": [{"delta": {"content": "a"}}]}})
+        assert not is_coalescible({"type": "status", "data": {"content": "a"}})
+
+    def test_merges_deltas_within_the_window(self):
+        """Test that deltas are appended and emitted once the window ends."""
+
+        async def run():
+            recorder = Recorder()
+            coalescer = EventCoalescer(recorder, window=0.05)
+            for token in ["a", "b", "c"]:
+                await coalescer(delta(token))
+            assert recorder.events == []
+
+            await asyncio.sleep(0.1)
+            return recorder.events
+
+        assert asyncio.run(run()) == [delta("abc")]
+
+    def test_other_events_flush_first(self):
+        """Test that block transitions and the completion keep their order."""
+
+        async def run():
+            recorder = Recorder()
+            coalescer = EventCoalescer(recorder, window=60)
+            await coalescer(snapshot("a"))
+            await coalescer(snapshot("ab"))
+            await coalescer({"type": "chat:completion", "data": {"usage": {"total_tokens": 2}}})
+            await coalescer(delta("c"))
+            await coalescer(snapshot("abc"))
+            await coalescer({"type": "chat:completion", "data": {"done": True}})
+            return recorder.events
+
+        assert asyncio.run(run()) == [
+            snapshot("ab"),
+            {"type": "chat:completion", "data": {"usage": {"total_tokens": 2}}},
+            delta("c"),
+            snapshot("abc"),
+            {"type": "chat:completion", "data": {"done": True}},
+        ]
+
+    def test_max_events_and_zero_window(self):
+        """Test that max_events bounds a merge and a window of 0 disables merging."""
+
+        async def run(window: float):
+            recorder = Recorder()
+            coalescer = EventCoalescer(recorder, window=window, max_events=2)
+            for token in ["a", "b", "c"]:
+                await coalescer(delta(token))
+            await coalescer.flush()
+            return recorder.events
+
+        assert asyncio.run(run(60)) == [delta("ab"), delta("c")]
+        assert asyncio.run(run(0)) == [delta("a"), delta("b"), delta("c")]
+
+    def test_merges_the_snapshots_of_the_middleware(self):
+        """Test that the snapshots the middleware streams by default are merged into the latest content and blocks."""
+
+        async def run():
+            recorder = Recorder()
+            coalescer = EventCoalescer(recorder, window=60)
+            manager = ContentBlockManager()
+            serializer = IncrementalSerializer(manager)
+            sent = []
+            for index, token in enumerate(["Hello", " world", ",", " again"]):
+                manager.append_text(token)
+                # As emit_pending_content, the blocks are only included when they changed
+                data = {"content": serializer.serialize()}
+                if index % 2 == 0:
+                    data["content_blocks"] = manager.to_list()
+                sent.append(data)
+                await coalescer({"type": "chat:completion", "data": data})
+            await coalescer({"type": "chat:completion", "data": {"done": True}})
+            return recorder.events, sent
+
+        events, sent = asyncio.run(run())
+        assert events == [
+            {
+                "type": "chat:completion",
+                "data": {"content": "Hello world, again", "content_blocks": sent[2]["content_blocks"]},
+            },
+            {"type": "chat:completion", "data": {"done": True}},
+        ]
+        # The emitted snapshot is a copy, the events passed in are left as they were
+        assert sent[0].keys() == {"content", "content_blocks"}
+        assert sent[0]["content"] == "Hello"
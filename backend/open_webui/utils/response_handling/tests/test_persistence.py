@@ -0,0 +1,117 @@
+"""Tests for the write-behind message persister."""
+
+import asyncio
+
+from open_webui.utils.response_handling.persistence import MessagePersister, persistence_stats
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.writes: list[dict] = []
+
+    def upsert_message_to_chat_by_id_and_message_id(self, chat_id: str, message_id: str, message: dict) -> None:
+        self.writes.append(message)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_persister(interval: float = 0.5, max_chars: int = 1000):
+    storage = FakeStorage()
+    clock = FakeClock()
+    content = []
+    persister = MessagePersister(
+        storage,
+        "chat",
+        "message",
+        lambda: {"content": "".join(content)},
+        interval=interval,
+        max_chars=max_chars,
+        clock=clock,
+    )
+    return persister, storage, clock, content
+
+
+def stream(persister, clock, content, tokens: list[str], seconds_per_token: float) -> None:
+    for token in tokens:
+        clock.now += seconds_per_token
+        content.append(token)
+        persister.update(len(token))
+
+
+class TestMessagePersister:
+    """Test suite for MessagePersister."""
+
+    def test_coalesces_updates_per_interval(self):
+        """Test that updates within the interval are written together."""
+        persister, storage, clock, content = make_persister(interval=0.5)
+
+        stream(persister, clock, content, ["token "] * 100, 0.02)
+        persister.flush()
+
+        # First update, then one write per 0.5s of streaming and the final flush
+        assert len(storage.writes) == 5
+        assert storage.writes[-1]["content"] == "token " * 100
+        assert persister.stats.updates == 100
+        assert persister.stats.writes_avoided == 95
+
+    def test_writes_after_max_chars(self):
+        """Test that enough new content is written before the interval ends."""
+        persister, storage, clock, content = make_persister(interval=60, max_chars=100)
+
+        stream(persister, clock, content, ["x" * 10] * 50, 0.001)
+
+        assert len(storage.writes) == 5
+        assert all(len(write["content"]) % 100 == 10 for write in storage.writes)
+
+    def test_zero_interval_writes_every_update(self):
+        """Test that an interval of 0 keeps writing every delta."""
+        persister, storage, clock, content = make_persister(interval=0)
+
+        stream(persister, clock, content, ["a", "b", "c"], 0.001)
+
+        assert [write["content"] for write in storage.writes] == ["a", "ab", "abc"]
+
+    def test_flush_only_writes_pending_updates(self):
+        """Test that flushing without pending updates does not write."""
+        persister, storage, clock, content = make_persister()
+
+        persister.flush()
+        stream(persister, clock, content, ["a"], 0.001)
+        persister.flush()
+
+        assert len(storage.writes) == 1
+
+    def test_pending_update_is_written_when_the_interval_ends(self):
+        """Test that a stalled stream still gets its last update written."""
+
+        async def run():
+            persister, storage, _, content = make_persister(interval=0.05)
+            persister.clock = asyncio.get_running_loop().time
+
+            for token in ["a", "b", "c"]:
+                content.append(token)
+                persister.update(1)
+            assert [write["content"] for write in storage.writes] == ["a"]
+
+            await asyncio.sleep(0.1)
+            return storage.writes
+
+        writes = asyncio.run(run())
+        assert [write["content"] for write in writes] == ["a", "abc"]
+
+    def test_global_stats(self):
+        """Test that writes avoided are counted over all messages."""
+        updates, writes = persistence_stats.updates, persistence_stats.writes
+
+        persister, _, clock, content = make_persister()
+        stream(persister, clock, content, ["token "] * 10, 0.01)
+        persister.flush()
+
+        assert persistence_stats.updates - updates == 10
+        assert persistence_stats.writes - writes == 2
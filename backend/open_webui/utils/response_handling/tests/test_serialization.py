@@ -0,0 +1,223 @@
+"""Tests and benchmarks for the incremental content serializer and message builder."""
+
+import asyncio
+import random
+import time
+
+from open_webui.utils.response_handling.content_blocks import ContentBlockManager
+from open_webui.utils.response_handling.reasoning_handler import ReasoningConfig, ReasoningHandler
+from open_webui.utils.response_handling.serialization import (
+    IncrementalMessageBuilder,
+    IncrementalSerializer,
+    convert_content_blocks_to_messages,
+    serialize_content_blocks,
+)
+from open_webui.utils.response_handling.stream_processor import (
+    StreamConfig,
+    StreamContext,
+    StreamProcessor,
+)
+from open_webui.utils.response_handling.tag_parser import TagDefinition
+
+TOKENS = ["Hello", " world", ",", " ", "\n", "\n\n", "  ", "<b>", "&", "> quoted", "\r\n", "token", "."]
+
+
+def make_handler() -> tuple[ContentBlockManager, ReasoningHandler]:
+    manager = ContentBlockManager()
+    handler = ReasoningHandler(
+        ReasoningConfig(tags=[TagDefinition("<think>", "</think>")]),
+        manager,
+    )
+    return manager, handler
+
+
+def random_stream(rng: random.Random, length: int):
+    """Yield (kind, value) deltas mixing text, tagged reasoning, API reasoning and tool calls."""
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.02:
+            yield "text", "<think>"
+        elif roll < 0.04:
+            yield "text", "</think>"
+        elif roll < 0.1:
+            yield "reasoning", rng.choice(TOKENS)
+        elif roll < 0.11:
+            yield "tool_calls", None
+        else:
+            yield "text", rng.choice(TOKENS)
+
+
+def apply_delta(manager: ContentBlockManager, handler: ReasoningHandler, kind: str, value) -> None:
+    if kind == "reasoning":
+        handler.handle_api_reasoning(value)
+    elif kind == "tool_calls":
+        block = manager.start_tool_calls([{"id": "call", "function": {"name": "tool", "arguments": "{}"}}])
+        block.results = [{"tool_call_id": "call", "content": "result"}]
+        manager.ensure_text_block()
+    else:
+        handler.handle_text_content(value)
+
+
+class TestIncrementalSerializer:
+    """Test suite for IncrementalSerializer."""
+
+    def test_matches_full_serialization(self):
+        """Test that every intermediate serialization matches serialize_content_blocks."""
+        for seed in range(20):
+            rng = random.Random(seed)
+            manager, handler = make_handler()
+            serializer = IncrementalSerializer(manager)
+            raw_serializer = IncrementalSerializer(manager, raw=True)
+
+            for kind, value in random_stream(rng, 300):
+                apply_delta(manager, handler, kind, value)
+                assert serializer.serialize() == serialize_content_blocks(manager.to_list())
+                assert raw_serializer.serialize() == serialize_content_blocks(manager.to_list(), raw=True)
+
+            handler.finalize()
+            assert serializer.serialize() == serialize_content_blocks(manager.to_list())
+
+    def test_initial_content_and_cleanup(self):
+        """Test initial content and blocks removed by cleanup invalidate the cache."""
+        manager = ContentBlockManager("  previous answer  ")
+        serializer = IncrementalSerializer(manager)
+        assert serializer.serialize() == "previous answer"
+
+        manager.start_reasoning("<think>", "</think>")
+        manager.current_block.content += "line one\nline two"
+        manager.end_reasoning()
+        manager.append_text("   ")
+        assert serializer.serialize() == serialize_content_blocks(manager.to_list())
+
+        manager.cleanup()
+        assert serializer.serialize() == serialize_content_blocks(manager.to_list())
+
+    def test_deltas_reconstruct_content(self):
+        """Test that applying deltas and snapshots on the client gives the serialized content."""
+        for seed in range(20):
+            rng = random.Random(seed)
+            manager, handler = make_handler()
+            serializer = IncrementalSerializer(manager)
+
+            client_content = ""
+            appended = 0
+            for kind, value in random_stream(rng, 300):
+                apply_delta(manager, handler, kind, value)
+                delta = serializer.consume_delta()
+                if delta is None:
+                    client_content = serializer.serialize()
+                else:
+                    client_content += delta
+                    appended += 1
+                assert client_content == serialize_content_blocks(manager.to_list())
+
+            assert appended > 0
+
+    def test_plain_text_is_sent_as_deltas(self):
+        """Test that only the first plain text delta needs a snapshot."""
+        manager, handler = make_handler()
+        serializer = IncrementalSerializer(manager)
+
+        handler.handle_text_content("Hello")
+        assert serializer.consume_delta() is None
+        handler.handle_text_content(" ")
+        assert serializer.consume_delta() == ""
+        handler.handle_text_content("world")
+        assert serializer.consume_delta() == " world"
+
+    def test_stream_processor_append_deltas(self):
+        """Test that the stream processor emits append-only events when enabled."""
+        events = []
+
+        async def emit(event):
+            events.append(event)
+
+        async def lines():
+            for token in ["Hello", " world", "!"]:
+                yield f'data: {{"choices": [{{"delta": {{"content": "{token}"}}}}]}}'
+            yield "data: [DONE]"
+
+        processor = StreamProcessor(
+            StreamConfig(append_deltas=True),
+            StreamContext("chat", "message", "model", {}, None, None),
+            emit,
+            None,
+        )
+        asyncio.run(processor.process_stream(lines()))
+
+        assert [event["type"] for event in events] == ["chat:completion", "chat:message:delta", "chat:message:delta"]
+        assert events[0]["data"]["content"] == "Hello"
+        assert "".join(event["data"]["content"] for event in events[1:]) == " world!"
+        assert processor.get_content() == "Hello world!"
+
+
+class TestIncrementalMessageBuilder:
+    """Test suite for IncrementalMessageBuilder."""
+
+    def test_matches_full_conversion(self):
+        """Test that the messages equal a full conversion after every tool round and at the end."""
+        messages = [{"role": "user", "content": "Hi"}]
+        for seed in range(5):
+            rng = random.Random(seed)
+            manager, handler = make_handler()
+            builder = IncrementalMessageBuilder(messages, raw=True)
+            for kind, value in random_stream(rng, 2_000):
+                apply_delta(manager, handler, kind, value)
+                if kind == "tool_calls":
+                    blocks = manager.to_list()
+                    assert builder.build(blocks) == [*messages, *convert_content_blocks_to_messages(blocks, True)]
+
+            blocks = manager.to_list()
+            assert builder.build(blocks) == [*messages, *convert_content_blocks_to_messages(blocks, True)]
+        assert messages == [{"role": "user", "content": "Hi"}]
+
+    def test_tool_rounds_benchmark(self):
+        """Benchmark preparing the follow-up request of every round of a 30 round agentic chat."""
+        rounds = 30
+        result = "row, " * 4_000
+
+        def run(make_prepare) -> list[float]:
+            manager, handler = make_handler()
+            prepare = make_prepare(manager)
+            timings = []
+            for index in range(rounds):
+                handler.handle_api_reasoning(f"Round {index}, looking up the next page. " * 20)
+                handler.handle_text_content(f"Checking page {index}.\n")
+                block = manager.start_tool_calls(
+                    [{"id": f"call_{index}", "function": {"name": "search", "arguments": f'{{"page": {index}}}'}}]
+                )
+                block.results = [{"tool_call_id": f"call_{index}", "content": result}]
+                manager.ensure_text_block()
+
+                started = time.perf_counter()
+                content, messages = prepare()
+                timings.append(time.perf_counter() - started)
+            assert content == serialize_content_blocks(manager.to_list())
+            assert messages[1:] == convert_content_blocks_to_messages(manager.to_list(), True)
+            return timings
+
+        def full(manager):
+            def prepare():
+                blocks = manager.to_list()
+                return serialize_content_blocks(blocks), [
+                    {"role": "user"},
+                    *convert_content_blocks_to_messages(blocks, True),
+                ]
+
+            return prepare
+
+        def incremental(manager):
+            serializer = IncrementalSerializer(manager)
+            builder = IncrementalMessageBuilder([{"role": "user"}], raw=True)
+            return lambda: (serializer.serialize(), builder.build(manager.to_list()))
+
+        full_timings = run(full)
+        incremental_timings = run(incremental)
+
+        print(
+            f"\n{rounds} tool rounds with {len(result)} character results, first/last round: "
+            f"full {full_timings[0] * 1e3:.2f}/{full_timings[-1] * 1e3:.2f}ms, "
+            f"incremental {incremental_timings[0] * 1e3:.2f}/{incremental_timings[-1] * 1e3:.2f}ms"
+        )
+        assert sum(incremental_timings) < sum(full_timings)
+        assert incremental_timings[-1] < full_timings[-1]
@@ -0,0 +1,84 @@
+"""Tests for the SSE chunk pass-through."""
+
+import asyncio
+import json
+
+from open_webui.utils.response_handling.sse import (
+    ChunkStreamingResponse,
+    SSEChunk,
+    iter_sse_chunks,
+    iter_sse_data,
+)
+from starlette.responses import StreamingResponse
+
+
+def make_chunk(index: int) -> dict:
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "system_fingerprint": "fp_0",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": f" token{index}"},
+                "logprobs": None,
+                "finish_reason": None,
+            }
+        ],
+    }
+
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+class TestSSEChunks:
+    """Test suite for the SSE chunk helpers."""
+
+    def test_iter_sse_chunks_groups_data_lines(self):
+        """Test that events are split on blank lines and non-data fields are ignored."""
+        lines = [": keep-alive", "", "event: message", 'data: {"a": 1}', "", "data: line one", "data: line two", ""]
+        lines += ["data: [DONE]"]
+
+        chunks = asyncio.run(collect(iter_sse_chunks(iterate(lines))))
+
+        assert [chunk.raw for chunk in chunks] == ['{"a": 1}', "line one\nline two", "[DONE]"]
+        assert chunks[0].data == {"a": 1}
+        assert chunks[-1].is_done
+
+    def test_chunks_are_parsed_and_encoded_lazily(self):
+        """Test that raw payloads are passed through and data is only encoded when needed."""
+        raw = SSEChunk('{"b": [1, 2]}')
+        assert raw.encode() == 'data: {"b": [1, 2]}\n\n'
+        assert raw.data == {"b": [1, 2]}
+
+        built = SSEChunk(data={"error": {"message": "failed"}})
+        assert built.data == {"error": {"message": "failed"}}
+        assert json.loads(built.raw) == built.data
+
+    def test_body_iterator_encodes_once_at_the_edge(self):
+        """Test that a ChunkStreamingResponse sent to a client is valid SSE."""
+        chunks = [SSEChunk(json.dumps(make_chunk(i))) for i in range(3)] + [SSEChunk.done()]
+        response = ChunkStreamingResponse(iterate(chunks))
+
+        body = asyncio.run(collect(response.body_iterator))
+
+        assert response.media_type == "text/event-stream"
+        assert body == [f"data: {chunk.raw}\n\n" for chunk in chunks]
+
+    def test_iter_sse_data_reads_both_response_types(self):
+        """Test that chunk and plain SSE responses give the same data."""
+        chunks = [SSEChunk(json.dumps(make_chunk(i))) for i in range(3)] + [SSEChunk.done()]
+        lines = [chunk.encode() for chunk in chunks] + ["data: not json\n\n", ": comment\n\n"]
+
+        from_chunks = asyncio.run(collect(iter_sse_data(ChunkStreamingResponse(iterate(chunks)))))
+        from_body = asyncio.run(collect(iter_sse_data(StreamingResponse(iterate(lines)))))
+
+        assert from_chunks == from_body == [make_chunk(i) for i in range(3)]
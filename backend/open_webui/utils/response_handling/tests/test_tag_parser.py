@@ -1,5 +1,7 @@
 """Tests for the StreamingTagParser."""
 
+import random
+
 from open_webui.utils.response_handling.tag_parser import (
     StreamingTagParser,
     TagDefinition,
@@ -223,3 +225,103 @@ class TestStreamingTagParser:
 
         assert "<" not in parser._buffer or parser._buffer == ""
         assert result.tag_started is None
+
+    def test_parse_keeps_everything_after_end_tag(self):
+        """Test that parse() returns text and tags following a closed tag."""
+        parser = StreamingTagParser([TagDefinition("<think>", "</think>")])
+
+        results = parser.parse("Hello <think>first</think> between <think>second</think> end")
+
+        assert [(r.emit_text, r.tag_content, r.tag_ended) for r in results] == [
+            ("Hello ", "first", True),
+            (" between ", "second", True),
+            (" end", "", False),
+        ]
+
+    def test_parse_returns_tag_content_once(self):
+        """Test that content streamed before the end tag is not returned again."""
+        parser = StreamingTagParser([TagDefinition("<think>", "</think>")])
+
+        contents = [r.tag_content for chunk in ["<think>reason", "ing</th", "ink>done"] for r in parser.parse(chunk)]
+
+        assert "".join(contents) == "reasoning"
+
+    def test_fragmented_attributes(self):
+        """Test a start tag whose attributes are split across chunks."""
+        parser = StreamingTagParser([TagDefinition("<think>", "</think>")])
+
+        assert parser.parse_chunk("Hi <think ty").emit_text == "Hi "
+        result = parser.parse_chunk('pe="deep">idea')
+
+        assert result.tag_started is not None
+        assert result.attributes == {"type": "deep"}
+        assert result.tag_content == "idea"
+
+    def test_tag_name_prefix_is_text(self):
+        """Test that a longer tag name or an unclosed tag is not a tag."""
+        parser = StreamingTagParser([TagDefinition("<think>", "</think>")])
+
+        result = parser.parse_chunk("<thinking> and <think about <b>it</b>")
+
+        assert result.tag_started is None
+        assert result.emit_text + parser.flush() == "<thinking> and <think about <b>it</b>"
+
+    def test_chunking_does_not_change_result(self):
+        """Test that any split of a stream into chunks gives the same output."""
+        tags = [
+            TagDefinition("<think>", "</think>"),
+            TagDefinition("<thinking>", "</thinking>"),
+            TagDefinition("<|begin_of_thought|>", "<|end_of_thought|>"),
+            TagDefinition("◁think▷", "◁/think▷"),
+            TagDefinition("<|begin_of_solution|>", "<|end_of_solution|>", "solution"),
+        ]
+        pieces = [
+            "a",
+            " ",
+            "<",
+            ">",
+            "<think>",
+            "</think>",
+            "<thinking>",
+            "</thinking>",
+            '<think x="1">',
+            "◁think▷",
+            "◁/think▷",
+            "<|begin_of_thought|>",
+            "<|end_of_thought|>",
+            "<|begin_of_solution|>",
+            "</th",
+            "<thi",
+        ]
+
+        def run(stream: str, sizes: list[int]) -> list[tuple]:
+            parser = StreamingTagParser(tags)
+            events = []
+            start = 0
+            for size in sizes + [len(stream)]:
+                for result in parser.parse(stream[start : start + size]):
+                    if result.emit_text:
+                        events.append(("text", result.emit_text))
+                    if result.tag_started:
+                        events.append(("start", result.tag_started.start_tag, result.attributes))
+                    if result.tag_content:
+                        events.append(("content", result.tag_content))
+                    if result.tag_ended:
+                        events.append(("end",))
+                start += size
+            events.append(("flush", parser.flush()))
+
+            merged = []
+            for event in events:
+                if merged and event[0] in ("text", "content") and merged[-1][0] == event[0]:
+                    merged[-1] = (event[0], merged[-1][1] + event[1])
+                else:
+                    merged.append(event)
+            return merged
+
+        for seed in range(200):
+            rng = random.Random(seed)
+            stream = "".join(rng.choice(pieces) for _ in range(40))
+            expected = run(stream, [])
+            sizes = [rng.randint(1, 6) for _ in range(len(stream))]
+            assert run(stream, sizes) == expected, stream
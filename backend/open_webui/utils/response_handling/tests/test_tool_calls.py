@@ -0,0 +1,136 @@
+"""Tests and a benchmark for the accumulation of streamed tool call deltas."""
+
+import asyncio
+import json
+import time
+
+from open_webui.utils.response_handling import StreamConfig, StreamContext, StreamProcessor, ToolCallAccumulator
+
+
+def tool_call_deltas(count: int, fragments: int, fragment_size: int) -> list[list[dict]]:
+    """Deltas of ``count`` parallel tool calls, interleaved, with arguments of ``fragments`` fragments each."""
+    arguments = {
+        index: json.dumps({"query": f"q{index}", "text": "x" * (fragments * fragment_size)}) for index in range(count)
+    }
+    chunks = [
+        [
+            {"index": index, "id": f"call_{index}", "type": "function", "function": {"name": "search", "arguments": ""}}
+            for index in range(count)
+        ]
+    ]
+    for start in range(0, max(len(value) for value in arguments.values()), fragment_size):
+        chunks.append(
+            [
+                {"index": index, "function": {"arguments": value[start : start + fragment_size]}}
+                for index, value in arguments.items()
+                if start < len(value)
+            ]
+        )
+    return chunks
+
+
+def accumulate_linearly(chunks: list[list[dict]]) -> list[dict]:
+    """The previous accumulation, searching the tool calls and concatenating the strings on every delta."""
+    tool_calls = []
+    for deltas in chunks:
+        for delta in deltas:
+            index = delta.get("index")
+            if index is None:
+                continue
+            existing = next((tool_call for tool_call in tool_calls if tool_call.get("index") == index), None)
+            if existing is None:
+                delta.setdefault("function", {})
+                delta["function"].setdefault("name", "")
+                delta["function"].setdefault("arguments", "")
+                tool_calls.append(delta)
+            else:
+                if name := delta.get("function", {}).get("name"):
+                    existing["function"]["name"] += name
+                if arguments := delta.get("function", {}).get("arguments"):
+                    existing["function"]["arguments"] += arguments
+    return tool_calls
+
+
+def accumulate(chunks: list[list[dict]]) -> list[dict]:
+    accumulator = ToolCallAccumulator()
+    for deltas in chunks:
+        accumulator.add(deltas)
+    return accumulator.finalize()
+
+
+class TestToolCallAccumulator:
+    """Test suite for ToolCallAccumulator."""
+
+    def test_assembles_interleaved_tool_calls(self):
+        """Test that fragments are matched by index and the calls keep their order of appearance."""
+        chunks = [
+            [{"index": 1, "id": "call_b", "type": "function", "function": {"name": "get_", "arguments": ""}}],
+            [{"index": 0, "id": "call_a", "type": "function", "function": {"name": "search"}}],
+            [{"index": 1, "function": {"name": "weather", "arguments": '{"city": '}}],
+            [{"index": 0, "function": {"arguments": '{"q": "news"}'}}, {"function": {"arguments": "ignored"}}],
+            [{"index": 1, "function": {"arguments": '"Paris"}'}}],
+        ]
+
+        assert accumulate(chunks) == [
+            {
+                "index": 1,
+                "id": "call_b",
+                "type": "function",
+                "function": {"name": "get_weather", "arguments": '{"city": "Paris"}'},
+            },
+            {
+                "index": 0,
+                "id": "call_a",
+                "type": "function",
+                "function": {"name": "search", "arguments": '{"q": "news"}'},
+            },
+        ]
+
+    def test_matches_linear_accumulation(self):
+        """Test that the result is the same as with the previous accumulation."""
+        assert accumulate(tool_call_deltas(8, 50, 7)) == accumulate_linearly(tool_call_deltas(8, 50, 7))
+
+    def test_stream_processor_collects_tool_calls(self):
+        """Test that the stream processor hands out the assembled tool calls of a stream."""
+
+        async def emit(event):
+            pass
+
+        async def lines():
+            for deltas in tool_call_deltas(3, 4, 5):
+                chunk = {"choices": [{"index": 0, "delta": {"tool_calls": deltas}}]}
+                yield f"data: {json.dumps(chunk)}"
+            yield "data: [DONE]"
+
+        processor = StreamProcessor(
+            StreamConfig(),
+            StreamContext(chat_id="local:1", message_id="1", model_id="model", metadata={}, user=None, request=None),
+            emit,
+            None,
+        )
+        asyncio.run(processor.process_stream(lines()))
+
+        (tool_calls,) = processor.get_pending_tool_calls()
+        assert [json.loads(tool_call["function"]["arguments"])["query"] for tool_call in tool_calls] == [
+            "q0",
+            "q1",
+            "q2",
+        ]
+
+    def test_parallel_large_arguments_benchmark(self):
+        """Benchmark many parallel tool calls with large JSON arguments streamed in small fragments."""
+        count, fragments, fragment_size = 64, 400, 8
+
+        timings = {}
+        for name, path in [("linear", accumulate_linearly), ("indexed", accumulate)]:
+            chunks = tool_call_deltas(count, fragments, fragment_size)
+            started = time.perf_counter()
+            tool_calls = path(chunks)
+            timings[name] = time.perf_counter() - started
+            assert len(tool_calls) == count
+
+        print(
+            f"\n{count} tool calls of {fragments * fragment_size} byte arguments: "
+            f"linear {timings['linear'] * 1e3:.1f}ms, indexed {timings['indexed'] * 1e3:.1f}ms"
+        )
+        assert timings["indexed"] < timings["linear"]
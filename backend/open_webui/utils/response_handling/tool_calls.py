@@ -0,0 +1,53 @@
+"""Accumulation of streamed tool call deltas.
+
+A streamed tool call arrives as deltas that share its ``index``: the first
+one carries the id, type and start of the function name, the following
+ones further fragments of the name and the JSON arguments. Deltas are
+matched to their tool call through a dict by index, and the fragments are
+collected in lists that are joined once when the stream ended, so large
+arguments split over many deltas are not copied again with every delta.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class ToolCallAccumulator:
+    """Tool calls of one streamed response, assembled from their deltas."""
+
+    def __init__(self) -> None:
+        # First delta of each tool call with its name and argument fragments, by index in order of appearance
+        self._tool_calls: dict[Any, tuple[dict[str, Any], list[str], list[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tool_calls)
+
+    def add(self, delta_tool_calls: list[dict[str, Any]]) -> None:
+        """Add the tool call deltas of one chunk, deltas without an index are ignored."""
+        for delta_tool_call in delta_tool_calls:
+            index = delta_tool_call.get("index")
+            if index is None:
+                continue
+
+            entry = self._tool_calls.get(index)
+            if entry is None:
+                entry = self._tool_calls[index] = (delta_tool_call, [], [])
+
+            function = delta_tool_call.get("function") or {}
+            if name := function.get("name"):
+                entry[1].append(name)
+            if arguments := function.get("arguments"):
+                entry[2].append(arguments)
+
+    def finalize(self) -> list[dict[str, Any]]:
+        """The assembled tool calls in order of appearance."""
+        tool_calls = []
+        for tool_call, names, arguments in self._tool_calls.values():
+            tool_call["function"] = {
+                **(tool_call.get("function") or {}),
+                "name": "".join(names),
+                "arguments": "".join(arguments),
+            }
+            tool_calls.append(tool_call)
+        return tool_calls
@@ -1,3 +1,4 @@
+import json
 import logging
 import math
 import re
@@ -226,6 +227,69 @@ def tags_generation_template(template: str, messages: list[dict], user: Any | No
     return template
 
 
+COMBINED_TASK_INSTRUCTIONS = {
+    "title": (
+        "A concise, 3-5 word title with an emoji summarizing the chat history, without quotation marks.",
+        '"title": "your concise title here"',
+    ),
+    "tags": (
+        "1-3 broad tags categorizing the main themes of the chat history, along with 1-3 more specific "
+        'subtopic tags. If the chat is too short or too diverse, use only ["General"].',
+        '"tags": ["tag1", "tag2", "tag3"]',
+    ),
+    "follow_ups": (
+        "3-5 concise follow-up questions the user might naturally ask the assistant next, written from the "
+        "user's point of view and not repeating what was already covered.",
+        '"follow_ups": ["Question 1?", "Question 2?", "Question 3?"]',
+    ),
+}
+
+
+def combined_task_generation_template(
+    template: str, messages: list[dict], tasks: list[str], user: Any | None = None
+) -> str:
+    tasks = [task for task in tasks if task in COMBINED_TASK_INSTRUCTIONS]
+    template = prompt_variables_template(
+        template,
+        {
+            "{{TASKS}}": "\n".join(f"- {task}: {COMBINED_TASK_INSTRUCTIONS[task][0]}" for task in tasks),
+            "{{OUTPUT}}": "{ " + ", ".join(COMBINED_TASK_INSTRUCTIONS[task][1] for task in tasks) + " }",
+        },
+    )
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(template, user)
+    return template
+
+
+def parse_combined_task_response(res: Any, tasks: list[str]) -> dict:
+    """Get the valid results of a combined task response, missing ones are generated separately."""
+    if not isinstance(res, dict) or len(res.get("choices", [])) != 1:
+        return {}
+
+    response_message = res["choices"][0].get("message", {})
+    content = response_message.get("content") or response_message.get("reasoning_content") or ""
+    try:
+        data = json.loads(content[content.find("{") : content.rfind("}") + 1])
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    results = {}
+    for task in tasks:
+        value = data.get(task)
+        if task == "title":
+            if isinstance(value, str) and value.strip():
+                results[task] = value.strip()
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            results[task] = value
+    return results
+
+
 def image_prompt_generation_template(template: str, messages: list[dict], user: Any | None = None) -> str:
     prompt = get_last_user_message(messages)
     template = replace_prompt_variable(template, prompt)
@@ -8,8 +8,14 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.chat.realtime_save.updates / writes / writes_avoided (counters)
+* webui.upstream.circuit_breaker.state / error_rate (gauges)
+* webui.chat.admission.in_flight / queue_depth (gauges)
+* webui.chat.admission.admitted / queued / rejected / timed_out / wait_time (counters)
+* webui.completion_cache.entries / hit_rate (gauges)
+* webui.completion_cache.hits / misses / stores / evictions (counters)
 
-Attributes used: http.method, http.route, http.status_code
+Attributes used: http.method, http.route, http.status_code, upstream.url
 
 If you wish to add more attributes (e.g. user-agent) you can, but beware of
 high-cardinality label sets.
@@ -31,6 +37,10 @@ from open_webui.env import (
 )
 from open_webui.models.users import Users
 from open_webui.socket.main import get_active_user_ids
+from open_webui.utils.admission import chat_admission
+from open_webui.utils.completion_cache import completion_cache
+from open_webui.utils.response_handling import persistence_stats
+from open_webui.utils.upstreams import upstream_health
 from opentelemetry import metrics
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
     OTLPMetricExporter,
@@ -47,6 +57,8 @@ from opentelemetry.sdk.resources import Resource
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
+_CIRCUIT_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
 
 def _build_meter_provider(resource: Resource) -> MeterProvider:
     """Return a configured MeterProvider."""
@@ -95,6 +107,19 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.chat.realtime_save.*",
+        ),
+        View(
+            instrument_name="webui.chat.admission.*",
+        ),
+        View(
+            instrument_name="webui.completion_cache.*",
+        ),
+        View(
+            instrument_name="webui.upstream.*",
+            attribute_keys=["upstream.url"],
+        ),
     ]
 
     provider = MeterProvider(
@@ -166,6 +191,121 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_realtime_save(attribute: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=getattr(persistence_stats, attribute))]
+
+        return callback
+
+    for attribute, description in [
+        ("updates", "Streamed message updates with realtime chat save"),
+        ("writes", "Message writes with realtime chat save"),
+        ("writes_avoided", "Message updates coalesced into a later write"),
+    ]:
+        meter.create_observable_counter(
+            name=f"webui.chat.realtime_save.{attribute}",
+            description=description,
+            unit="1",
+            callbacks=[observe_realtime_save(attribute)],
+        )
+
+    def observe_attribute(attribute: str, source):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=getattr(source, attribute))]
+
+        return callback
+
+    for attribute, description in [
+        ("in_flight", "Chat completions being processed"),
+        ("queue_depth", "Chat completions waiting for admission"),
+    ]:
+        meter.create_observable_gauge(
+            name=f"webui.chat.admission.{attribute}",
+            description=description,
+            unit="1",
+            callbacks=[observe_attribute(attribute, chat_admission)],
+        )
+
+    for attribute, description, unit in [
+        ("admitted", "Chat completions admitted", "1"),
+        ("queued", "Chat completions that waited in the queue", "1"),
+        ("rejected", "Chat completions rejected as the queue was full", "1"),
+        ("timed_out", "Chat completions that timed out in the queue", "1"),
+        ("wait_time", "Total time chat completions waited in the queue", "s"),
+    ]:
+        meter.create_observable_counter(
+            name=f"webui.chat.admission.{attribute}",
+            description=description,
+            unit=unit,
+            callbacks=[observe_attribute(attribute, chat_admission.stats)],
+        )
+
+    meter.create_observable_gauge(
+        name="webui.completion_cache.entries",
+        description="Completions in the local completion cache",
+        unit="1",
+        callbacks=[observe_attribute("size", completion_cache)],
+    )
+    meter.create_observable_gauge(
+        name="webui.completion_cache.hit_rate",
+        description="Share of completion cache lookups that were hits",
+        unit="1",
+        callbacks=[observe_attribute("hit_rate", completion_cache.stats)],
+    )
+
+    for attribute, description in [
+        ("hits", "Chat completions answered from the completion cache"),
+        ("misses", "Cacheable chat completions not found in the completion cache"),
+        ("stores", "Chat completions stored in the completion cache"),
+        ("evictions", "Completions evicted from the local completion cache"),
+    ]:
+        meter.create_observable_counter(
+            name=f"webui.completion_cache.{attribute}",
+            description=description,
+            unit="1",
+            callbacks=[observe_attribute(attribute, completion_cache.stats)],
+        )
+
+    def observe_upstream_breakers(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [
+            metrics.Observation(
+                value=_CIRCUIT_BREAKER_STATES[stats["state"]],
+                attributes={"upstream.url": str(url)},
+            )
+            for url, stats in upstream_health.get_stats().items()
+        ]
+
+    def observe_upstream_error_rates(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [
+            metrics.Observation(
+                value=stats["error_rate"],
+                attributes={"upstream.url": str(url)},
+            )
+            for url, stats in upstream_health.get_stats().items()
+        ]
+
+    meter.create_observable_gauge(
+        name="webui.upstream.circuit_breaker.state",
+        description="Circuit breaker state of each connection: 0 closed, 1 half-open, 2 open",
+        unit="1",
+        callbacks=[observe_upstream_breakers],
+    )
+
+    meter.create_observable_gauge(
+        name="webui.upstream.error_rate",
+        description="Moving average of the request error rate of each connection",
+        unit="1",
+        callbacks=[observe_upstream_error_rates],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):
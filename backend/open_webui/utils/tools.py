@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import json
 import logging
@@ -44,7 +45,8 @@ def get_async_tool_function_and_apply_extra_params(function: Callable, extra_par
     else:
 
         async def new_function(*args, **kwargs):
-            return partial_func(*args, **kwargs)
+            # In a worker thread, so that the call neither blocks the event loop nor escapes the tool call timeout
+            return await asyncio.to_thread(partial_func, *args, **kwargs)
 
     update_wrapper(new_function, function)
     new_function.__signature__ = new_sig  # type: ignore[attr-defined]
@@ -68,6 +70,34 @@ def get_updated_tool_function(function: Callable, extra_params: dict):
     return function
 
 
+async def execute_tool_calls(
+    tool_calls: list[Any],
+    execute: Callable[[Any], Awaitable[Any]],
+    concurrency: int | None = None,
+) -> list[Any]:
+    """Execute the tool calls of one assistant turn concurrently.
+
+    At most ``concurrency`` calls run at the same time, all of them when it
+    is not set. The results are returned in the order of the tool calls.
+    """
+    semaphore = asyncio.Semaphore(concurrency if concurrency and concurrency > 0 else max(len(tool_calls), 1))
+
+    async def execute_with_limit(tool_call: Any) -> Any:
+        async with semaphore:
+            return await execute(tool_call)
+
+    return await asyncio.gather(*(execute_with_limit(tool_call) for tool_call in tool_calls))
+
+
+async def wait_for_tool_result(result: Awaitable, name: str, timeout: float | None = None) -> Any:
+    """Await the result of a tool call, giving up after ``timeout`` seconds."""
+    try:
+        return await asyncio.wait_for(result, timeout)
+    except TimeoutError:
+        log.warning(f"Tool {name} timed out after {timeout} seconds")
+        return f"Tool {name} timed out after {timeout} seconds"
+
+
 async def get_tools(request: Request, tool_ids: list[str], user: UserModel, extra_params: dict) -> dict[str, dict]:
     return {}
 
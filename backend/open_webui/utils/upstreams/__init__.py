@@ -0,0 +1,27 @@
+"""Health tracking of and failover between the upstream connections.
+
+This module provides components for:
+- Latency, time to first token and error rate averages per connection
+- Circuit breakers for failing connections
+- Failover and hedged requests between the connections serving a model
+"""
+
+from .health import (
+    UpstreamHealth,
+    UpstreamStats,
+    upstream_health,
+)
+from .routing import (
+    call_with_failover,
+    is_retryable,
+    stream_with_failover,
+)
+
+__all__ = [
+    "UpstreamHealth",
+    "UpstreamStats",
+    "call_with_failover",
+    "is_retryable",
+    "stream_with_failover",
+    "upstream_health",
+]
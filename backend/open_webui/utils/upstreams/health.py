@@ -0,0 +1,146 @@
+"""Health and latency tracking of the upstream connections.
+
+Every request to a connection records its latency, its time to first
+token when streaming, and whether it failed. Latencies and the error rate
+are kept as exponentially weighted moving averages, so recent requests
+count the most. After ``failure_threshold`` failures in a row the circuit
+breaker of a connection opens and it is only used as a last resort. Once
+``cooldown`` seconds passed it is half-open: the next request is a trial,
+which closes the breaker if it succeeds and opens it again if it fails.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+
+from open_webui.env import (
+    OPENAI_API_CIRCUIT_BREAKER_COOLDOWN,
+    OPENAI_API_CIRCUIT_BREAKER_THRESHOLD,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["OPENAI"])
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class UpstreamStats:
+    """Moving averages and circuit breaker state of one connection."""
+
+    latency: float | None = None
+    ttft: float | None = None
+    error_rate: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+
+    @property
+    def score(self) -> float:
+        # Seconds until the response starts, weighted up by recent errors
+        latency = self.ttft if self.ttft is not None else self.latency
+        return (latency or 0.0) * (1 + 4 * self.error_rate)
+
+
+class UpstreamHealth:
+    """Tracks the health of upstream connections, keyed by their base URL."""
+
+    def __init__(
+        self,
+        failure_threshold: int = OPENAI_API_CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = OPENAI_API_CIRCUIT_BREAKER_COOLDOWN,
+        alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.clock = clock
+
+        self._stats: dict[Hashable, UpstreamStats] = {}
+
+    def _get(self, key: Hashable) -> UpstreamStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = UpstreamStats()
+        return stats
+
+    def _average(self, current: float | None, value: float) -> float:
+        return value if current is None else current + self.alpha * (value - current)
+
+    def state(self, key: Hashable) -> str:
+        stats = self._stats.get(key)
+        if stats is None or stats.opened_at is None:
+            return CLOSED
+        if self.clock() - stats.opened_at >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def is_available(self, key: Hashable) -> bool:
+        """Whether requests may be sent, i.e. the circuit breaker is not open."""
+        return self.state(key) != OPEN
+
+    def record_success(self, key: Hashable, latency: float | None = None, ttft: float | None = None) -> None:
+        stats = self._get(key)
+        stats.requests += 1
+        stats.consecutive_failures = 0
+        stats.error_rate = self._average(stats.error_rate, 0.0)
+        if latency is not None:
+            stats.latency = self._average(stats.latency, latency)
+        if ttft is not None:
+            stats.ttft = self._average(stats.ttft, ttft)
+
+        if stats.opened_at is not None:
+            log.info(f"Connection {key} recovered, closing its circuit breaker")
+            stats.opened_at = None
+
+    def record_failure(self, key: Hashable) -> None:
+        state = self.state(key)
+        stats = self._get(key)
+        stats.requests += 1
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.error_rate = self._average(stats.error_rate, 1.0)
+
+        if state == HALF_OPEN or (state == CLOSED and stats.consecutive_failures >= self.failure_threshold):
+            log.warning(
+                f"Connection {key} failed {stats.consecutive_failures} times in a row, "
+                f"opening its circuit breaker for {self.cooldown}s"
+            )
+            stats.opened_at = self.clock()
+
+    def rank(self, keys: Iterable[Hashable]) -> list[Hashable]:
+        """Order connections by expected time to first token, open circuit breakers last.
+
+        Connections without measurements keep their configured order.
+        """
+        return sorted(
+            dict.fromkeys(keys),
+            key=lambda key: (not self.is_available(key), self._get(key).score),
+        )
+
+    def get_stats(self) -> dict[Hashable, dict]:
+        return {
+            key: {
+                "state": self.state(key),
+                "latency": stats.latency,
+                "ttft": stats.ttft,
+                "error_rate": stats.error_rate,
+                "requests": stats.requests,
+                "failures": stats.failures,
+            }
+            for key, stats in self._stats.items()
+        }
+
+    def reset(self) -> None:
+        self._stats = {}
+
+
+upstream_health = UpstreamHealth()
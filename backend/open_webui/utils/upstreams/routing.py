@@ -0,0 +1,191 @@
+"""Failover between the connections serving a model.
+
+Requests go to the connection that is expected to answer first. If it
+cannot be reached, times out, or answers with a server error before the
+response started, the next connection is tried. Streaming requests can
+also be hedged: when no token arrived after ``hedge_delay`` seconds, the
+next connection is asked as well and the first one to answer is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import aclosing
+from typing import Any, TypeVar
+
+import aiohttp
+import httpx
+import openai
+from open_webui.env import SRC_LOG_LEVELS
+
+from .health import UpstreamHealth, upstream_health
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["OPENAI"])
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is caused by the connection, so another one may succeed."""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 429) or error.status_code >= 500
+    return isinstance(
+        error,
+        (
+            openai.APIConnectionError,
+            httpx.TransportError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            OSError,
+        ),
+    )
+
+
+async def call_with_failover(
+    keys: list[Hashable],
+    call: Callable[[Hashable], Awaitable[T]],
+    health: UpstreamHealth = upstream_health,
+) -> T:
+    """Call the connections in order of their health until one succeeds."""
+    error: BaseException | None = None
+    for key in health.rank(keys):
+        start = time.monotonic()
+        try:
+            result = await call(key)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            health.record_failure(key)
+            log.warning(f"Request to {key} failed, trying the next connection: {e}")
+            error = e
+            continue
+
+        health.record_success(key, latency=time.monotonic() - start)
+        return result
+
+    raise error
+
+
+class _StreamAttempt:
+    """Reads one upstream stream on a task of its own, so it can be raced and cancelled."""
+
+    def __init__(
+        self,
+        key: Hashable,
+        stream: Callable[[Hashable], AsyncIterator[Any]],
+        health: UpstreamHealth,
+    ) -> None:
+        self.key = key
+        self.health = health
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        # Resolved with the first item, or the error raised before it
+        self.started: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task = asyncio.create_task(self._run(stream))
+
+    async def _run(self, stream: Callable[[Hashable], AsyncIterator[Any]]) -> None:
+        start = time.monotonic()
+        ttft = None
+        try:
+            # Closed as well when cancelled while waiting for the reader, which ends the upstream request
+            async with aclosing(stream(self.key)) as items:
+                async for item in items:
+                    if ttft is None:
+                        ttft = time.monotonic() - start
+                        self.started.set_result(True)
+                    await self.queue.put(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_retryable(e):
+                self.health.record_failure(self.key)
+            if not self.started.done():
+                self.started.set_exception(e)
+            else:
+                await self.queue.put(e)
+            return
+
+        self.health.record_success(self.key, latency=time.monotonic() - start, ttft=ttft)
+        if not self.started.done():
+            self.started.set_result(True)
+        await self.queue.put(_DONE)
+
+    def cancel(self) -> None:
+        self.task.cancel()
+        if not self.started.done():
+            self.started.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while (item := await self.queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+async def stream_with_failover(
+    keys: list[Hashable],
+    stream: Callable[[Hashable], AsyncIterator[T]],
+    health: UpstreamHealth = upstream_health,
+    hedge_delay: float | None = None,
+) -> AsyncIterator[T]:
+    """Stream from the first connection to answer, in order of their health.
+
+    Errors after the stream started are raised, as the response cannot be
+    continued on another connection. Closing the stream, or cancelling the
+    task reading it, closes the upstream requests before it returns.
+    """
+    pending = health.rank(keys)
+    running: list[_StreamAttempt] = []
+    winner: _StreamAttempt | None = None
+    error: BaseException | None = None
+
+    try:
+        while winner is None:
+            if not running:
+                if not pending:
+                    raise error
+                running.append(_StreamAttempt(pending.pop(0), stream, health))
+
+            done, _ = await asyncio.wait(
+                [attempt.started for attempt in running],
+                timeout=hedge_delay if pending else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                log.info(f"No response from {running[-1].key} yet, also asking {pending[0]}")
+                running.append(_StreamAttempt(pending.pop(0), stream, health))
+                continue
+
+            for attempt in list(running):
+                if not attempt.started.done():
+                    continue
+                running.remove(attempt)
+                if attempt.started.exception() is None:
+                    winner = winner or attempt
+                    if attempt is not winner:
+                        attempt.cancel()
+                    continue
+
+                error = attempt.started.exception()
+                if not is_retryable(error):
+                    raise error
+                log.warning(f"Request to {attempt.key} failed, trying the next connection: {error}")
+
+        for attempt in running:
+            attempt.cancel()
+        running = [winner]
+
+        async for item in winner:
+            yield item
+    finally:
+        # Cancelled right away, as waiting below is interrupted if the reading task is cancelled again.
+        # Unlike gather, wait does not pass that cancellation on to the attempts while they close.
+        for attempt in running:
+            attempt.cancel()
+        if running:
+            await asyncio.wait([attempt.task for attempt in running])
@@ -0,0 +1,165 @@
+"""Tests that stopped and disconnected chats close their upstream requests, against a local slow upstream."""
+
+import asyncio
+import json
+
+import openai
+from aiohttp import web
+from open_webui.utils.response_handling import ChunkStreamingResponse, aclose_response, iter_sse_chunks, iter_sse_data
+from open_webui.utils.upstreams import UpstreamHealth, stream_with_failover
+
+# Seconds within which the upstream has to notice that its request was closed
+CLOSE_TIMEOUT = 1.0
+
+
+class SlowUpstream:
+    """Chat completions server streaming a chunk every ``interval`` seconds, noting when the client went away."""
+
+    def __init__(self, interval: float = 0.05, chunks: int = 1000) -> None:
+        self.interval = interval
+        self.chunks = chunks
+        self.sent = 0
+        self.url = ""
+        self.closed: asyncio.Event | None = None
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> "SlowUpstream":
+        self.closed = asyncio.Event()
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self._runner = web.AppRunner(app, shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._runner.cleanup()
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            for index in range(self.chunks):
+                if request.transport is None or request.transport.is_closing():
+                    break
+                chunk = {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion.chunk",
+                    "created": 1700000000,
+                    "model": "stand-in",
+                    "choices": [{"index": 0, "delta": {"content": f" token{index}"}, "finish_reason": None}],
+                }
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.sent += 1
+                await asyncio.sleep(self.interval)
+            else:
+                await response.write(b"data: [DONE]\n\n")
+                return response
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        self.closed.set()
+        return response
+
+    async def wait_closed(self) -> bool:
+        try:
+            await asyncio.wait_for(self.closed.wait(), CLOSE_TIMEOUT)
+        except TimeoutError:
+            return False
+        return True
+
+
+async def stream_chunks(url: str):
+    """Stream the raw chunks of a completion like the OpenAI router does."""
+    client = openai.AsyncOpenAI(api_key="key", base_url=url, max_retries=0)
+    async with client.chat.completions.with_streaming_response.create(
+        model="stand-in", messages=[], stream=True
+    ) as response:
+        async for chunk in iter_sse_chunks(response.iter_lines()):
+            yield chunk
+
+
+def completion(upstream: SlowUpstream) -> ChunkStreamingResponse:
+    return ChunkStreamingResponse(stream_with_failover([upstream.url], stream_chunks, UpstreamHealth()))
+
+
+class TestCancellation:
+    """Test suite for closing upstream requests of cancelled and abandoned streams."""
+
+    def test_stopping_the_reading_task_closes_the_upstream(self):
+        """Test that cancelling a task waiting for the next chunk closes the upstream request."""
+
+        async def run():
+            async with SlowUpstream() as upstream:
+                received = []
+                reading = asyncio.Event()
+
+                async def read():
+                    async for data in iter_sse_data(completion(upstream)):
+                        received.append(data)
+                        if len(received) == 3:
+                            reading.set()
+
+                task = asyncio.create_task(read())
+                await reading.wait()
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return await upstream.wait_closed()
+
+        assert asyncio.run(run())
+
+    def test_stopping_while_handling_a_chunk_closes_the_upstream(self):
+        """Test that the upstream is closed when the task is cancelled between chunks, e.g. while emitting one."""
+
+        async def run():
+            async with SlowUpstream(interval=0.001) as upstream:
+                handling = asyncio.Event()
+
+                async def handle():
+                    response = completion(upstream)
+                    try:
+                        async for _ in iter_sse_data(response):
+                            handling.set()
+                            await asyncio.sleep(60)
+                    finally:
+                        await aclose_response(response)
+
+                task = asyncio.create_task(handle())
+                await handling.wait()
+                # Let the upstream fill the read-ahead buffer so the stream is blocked on the reader
+                await asyncio.sleep(0.2)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return await upstream.wait_closed(), upstream.sent
+
+        closed, sent = asyncio.run(run())
+        assert closed
+        assert sent < 1000
+
+    def test_client_disconnect_closes_the_upstream(self):
+        """Test that a response sent to a client that disconnects closes its upstream request."""
+
+        async def run():
+            async with SlowUpstream() as upstream:
+                sent_to_client = []
+                disconnect = asyncio.Event()
+
+                async def receive():
+                    await disconnect.wait()
+                    return {"type": "http.disconnect"}
+
+                async def send(message):
+                    if message["type"] == "http.response.body" and message.get("body"):
+                        sent_to_client.append(message["body"])
+                        if len(sent_to_client) == 3:
+                            disconnect.set()
+
+                scope = {"type": "http", "asgi": {"spec_version": "2.3"}}
+                await completion(upstream)(scope, receive, send)
+                return await upstream.wait_closed(), len(sent_to_client)
+
+        closed, sent_to_client = asyncio.run(run())
+        assert closed
+        assert sent_to_client == 3
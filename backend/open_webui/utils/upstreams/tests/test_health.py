@@ -0,0 +1,49 @@
+"""Tests for the health tracking of upstream connections."""
+
+from open_webui.utils.upstreams import UpstreamHealth
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUpstreamHealth:
+    """Test suite for UpstreamHealth."""
+
+    def test_moving_averages(self):
+        """Test that latencies and the error rate are averaged with recent requests weighted most."""
+        health = UpstreamHealth(alpha=0.5)
+        health.record_success("a", latency=1.0, ttft=0.2)
+        health.record_success("a", latency=3.0, ttft=0.4)
+        health.record_failure("a")
+
+        stats = health.get_stats()["a"]
+        assert stats["latency"] == 2.0
+        assert abs(stats["ttft"] - 0.3) < 1e-9
+        assert stats["error_rate"] == 0.5
+        assert (stats["requests"], stats["failures"]) == (3, 1)
+
+    def test_circuit_breaker_states(self):
+        """Test that the breaker opens after consecutive failures and closes after a successful trial."""
+        clock = FakeClock()
+        health = UpstreamHealth(failure_threshold=2, cooldown=10, clock=clock)
+
+        health.record_failure("a")
+        assert health.state("a") == "closed"
+        health.record_failure("a")
+        assert health.state("a") == "open"
+        assert health.rank(["a", "b"]) == ["b", "a"]
+
+        clock.now = 10
+        assert health.state("a") == "half_open"
+        # A failed trial opens the breaker again right away
+        health.record_failure("a")
+        assert health.state("a") == "open"
+
+        clock.now = 20
+        health.record_success("a", latency=0.1)
+        assert health.state("a") == "closed"
@@ -0,0 +1,179 @@
+"""Tests for failover between connections, against local stand-in upstreams."""
+
+import asyncio
+import json
+
+import openai
+from aiohttp import web
+from open_webui.utils.upstreams import UpstreamHealth, call_with_failover, stream_with_failover
+
+
+class StandInUpstream:
+    """Minimal OpenAI-compatible chat completions and models server with a configurable delay and status."""
+
+    def __init__(self, name: str, delay: float = 0.0, status: int = 200) -> None:
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> "StandInUpstream":
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_get("/v1/models", self.models)
+        self._runner = web.AppRunner(app, shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._runner.cleanup()
+
+    def chunk(self, content: str) -> dict:
+        return {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "stand-in",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+
+    async def models(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.json_response({"error": {"message": f"{self.name} failed"}}, status=self.status)
+        return web.json_response({"object": "list", "data": [{"id": self.name, "object": "model"}]})
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        body = await request.json()
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.json_response({"error": {"message": f"{self.name} failed"}}, status=self.status)
+
+        if not body.get("stream"):
+            return web.json_response(
+                {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 1700000000,
+                    "model": "stand-in",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": self.name},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for content in [self.name, " done"]:
+            await response.write(f"data: {json.dumps(self.chunk(content))}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+def client(url: str) -> openai.AsyncOpenAI:
+    return openai.AsyncOpenAI(api_key="key", base_url=url, max_retries=0)
+
+
+async def complete(url: str) -> str:
+    # Closed right away, so that no connection outlives the event loop of its test
+    async with client(url) as upstream:
+        response = await upstream.chat.completions.create(model="stand-in", messages=[])
+    return response.choices[0].message.content
+
+
+async def stream(url: str):
+    async with client(url) as upstream:
+        chunks = await upstream.chat.completions.create(model="stand-in", messages=[], stream=True)
+        async for chunk in chunks:
+            yield chunk.choices[0].delta.content
+
+
+async def collect(iterator) -> str:
+    return "".join([item async for item in iterator])
+
+
+class TestFailover:
+    """Test suite for call_with_failover and stream_with_failover."""
+
+    def test_fails_over_and_opens_circuit_breaker(self):
+        """Test that server errors move requests to the next connection until the breaker opens."""
+
+        async def run():
+            health = UpstreamHealth(failure_threshold=2, cooldown=60)
+            async with StandInUpstream("a", status=503) as a, StandInUpstream("b") as b:
+                results = [await call_with_failover([a.url, b.url], complete, health) for _ in range(4)]
+                return results, a.requests, b.requests, health.state(a.url)
+
+        results, a_requests, b_requests, state = asyncio.run(run())
+        assert results == ["b"] * 4
+        # The failing connection is skipped once its circuit breaker opened
+        assert (a_requests, b_requests) == (2, 4)
+        assert state == "open"
+
+    def test_client_errors_are_not_retried(self):
+        """Test that errors caused by the request are raised without trying another connection."""
+
+        async def run():
+            health = UpstreamHealth()
+            async with StandInUpstream("a", status=400) as a, StandInUpstream("b") as b:
+                try:
+                    await call_with_failover([a.url, b.url], complete, health)
+                except openai.BadRequestError:
+                    return b.requests, health.get_stats()
+
+        b_requests, stats = asyncio.run(run())
+        assert b_requests == 0
+        assert all(entry["failures"] == 0 for entry in stats.values())
+
+    def test_routes_to_the_fastest_connection(self):
+        """Test that the connection with the lowest time to first token is preferred."""
+
+        async def run():
+            health = UpstreamHealth()
+            async with StandInUpstream("slow", delay=0.2) as slow, StandInUpstream("fast") as fast:
+                # Both are measured once, then the fast one is used first
+                await collect(stream_with_failover([slow.url], stream, health))
+                await collect(stream_with_failover([fast.url], stream, health))
+                content = await collect(stream_with_failover([slow.url, fast.url], stream, health))
+                return content, health.rank([slow.url, fast.url]) == [fast.url, slow.url]
+
+        assert asyncio.run(run()) == ("fast done", True)
+
+    def test_streams_fail_over_before_the_first_token(self):
+        """Test that a stream failing before it started continues on the next connection."""
+
+        async def run():
+            health = UpstreamHealth()
+            async with StandInUpstream("a", status=500) as a, StandInUpstream("b") as b:
+                content = await collect(stream_with_failover([a.url, b.url], stream, health))
+                return content, health.get_stats()[a.url]["failures"]
+
+        assert asyncio.run(run()) == ("b done", 1)
+
+    def test_hedged_stream_uses_the_first_to_answer(self):
+        """Test that a hedged request answers from the second connection when the first is stalled."""
+
+        async def run():
+            health = UpstreamHealth()
+            async with StandInUpstream("stalled", delay=5) as stalled, StandInUpstream("b") as b:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                content = await collect(stream_with_failover([stalled.url, b.url], stream, health, hedge_delay=0.1))
+                return content, loop.time() - start, stalled.requests, b.requests
+
+        content, elapsed, stalled_requests, b_requests = asyncio.run(run())
+        assert content == "b done"
+        assert elapsed < 1
+        assert (stalled_requests, b_requests) == (1, 1)